@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_crawler.py
+
+fixture_server.py 를 같은 프로세스에 띄워 놓고 HWP 크롤러를 오프라인으로 측정한다.
+
+측정 단계
+1) collect   : crawl_hwp_law_subcommittee.run(--collect-only) → 목록 pages/s, 링크 수
+2) download  : download_hwp_async.run()                     → files/s, MB/s, 재시도(503) 횟수
+3) refresh   : 같은 manifest 로 --refresh 재실행              → 304 비율, 소요 시간
+4) increment : 픽스처에 신규 회의록을 추가한 뒤 재수집         → 몇 페이지 만에 멈추는지
+- 메모리: 파이썬 프로세스 peak RSS / tracemalloc peak, 브라우저(자식 프로세스) peak RSS
+
+--no-browser 를 주면 Playwright 없이 manifest 를 픽스처 id 로 직접 채워
+2)~3) 다운로드 경로만 측정한다 (CI / Playwright 미설치 환경용).
+
+사용
+    python bench_crawler.py --items 300 --per-page 10 --file-size 262144
+    python bench_crawler.py --no-browser --items 2000 --concurrency 16 --fail-rate 0.02 --json bench_crawler.json
+"""
+from __future__ import annotations
+import sys
+import json
+import time
+import shutil
+import socket
+import resource
+import tempfile
+import argparse
+import tracemalloc
+from pathlib import Path
+
+from fixture_server import FixtureConfig, serve, HWP_PATH
+from hwp_manifest import Manifest
+import download_hwp_async
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _maxrss_mb(who) -> float:
+    rss = resource.getrusage(who).ru_maxrss
+    # Linux 는 KB, macOS 는 바이트 단위
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def seed_manifest(manifest_path: Path, base: str, cfg: FixtureConfig):
+    """--no-browser: 브라우저 수집 단계를 건너뛰고 픽스처의 모든 hwp 링크를 manifest 에 넣는다."""
+    manifest = Manifest(manifest_path)
+    for page in range(1, cfg.last_page + 1):
+        for mid in cfg.page_ids(page):
+            for hid in cfg.hwp_ids(mid):
+                manifest.add_link(f"{base}{HWP_PATH}?id={hid}", page=page)
+    manifest.save()
+    return len(manifest.items)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="HWP 크롤러 오프라인 처리량 벤치마크 (fixture_server 사용)")
+    ap.add_argument("--items", type=int, default=200, help="픽스처 회의록 수")
+    ap.add_argument("--per-page", type=int, default=10, help="목록 한 페이지당 건수")
+    ap.add_argument("--files-per-item", type=int, default=1, help="회의록당 HWP 파일 수")
+    ap.add_argument("--file-size", type=int, default=256 * 1024, help="HWP 파일 크기(바이트)")
+    ap.add_argument("--latency", type=float, default=0.0, help="픽스처 응답 지연(초)")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="hwp.do 503 주입 확률")
+    ap.add_argument("--new-items", type=int, default=5, help="increment 단계에서 추가할 신규 회의록 수")
+    ap.add_argument("--concurrency", type=int, default=8, help="다운로드 동시 요청 수")
+    ap.add_argument("--rate", type=float, default=0.0, help="다운로드 초당 최대 요청 수 (0=무제한)")
+    ap.add_argument("--delay", type=float, default=0.0, help="크롤러 클릭/페이지 이동 대기(초)")
+    ap.add_argument("--no-browser", action="store_true", help="Playwright 수집 단계 생략 (다운로드만 측정)")
+    ap.add_argument("--work-dir", type=str, default=None, help="다운로드 폴더 (기본: 임시 폴더, 종료 시 삭제)")
+    ap.add_argument("--json", type=str, default=None, help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    cfg = FixtureConfig(
+        items=args.items, per_page=args.per_page, files_per_item=args.files_per_item,
+        file_size=args.file_size, latency=args.latency, fail_rate=args.fail_rate,
+    )
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = serve(cfg, port=port)
+
+    work = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix="bench_hwp_"))
+    out_dir = work / "downloads"
+    manifest_path = work / "manifest.json"
+    report = {"config": vars(args), "fixture": {"pages": cfg.last_page, "files": cfg.items * cfg.files_per_item}}
+
+    tracemalloc.start()
+    try:
+        # 1) collect
+        if args.no_browser:
+            n, elapsed = _timed(seed_manifest, manifest_path, base, cfg)
+            report["collect"] = {"mode": "seeded", "links": n, "seconds": round(elapsed, 3)}
+        else:
+            import crawl_hwp_law_subcommittee as crawler
+            res, elapsed = _timed(
+                crawler.run, out_dir=out_dir, max_pages=cfg.last_page + 1, no_headless=False,
+                delay=args.delay, manifest_path=manifest_path, collect_only=True,
+                concurrency=args.concurrency, rate=args.rate, full=True, base=base,
+            )
+            report["collect"] = {
+                "mode": "browser", "pages": res["pages"], "links": res["new_links"],
+                "seconds": round(elapsed, 3), "pages_per_s": round(res["pages"] / elapsed, 2),
+            }
+
+        # 2) download
+        before = dict(cfg.counts)
+        stats, elapsed = _timed(download_hwp_async.run, manifest_path, out_dir,
+                                args.concurrency, args.rate, 60.0)
+        report["download"] = {
+            **stats, "seconds": round(elapsed, 3),
+            "files_per_s": round(stats["ok"] / elapsed, 2) if elapsed else None,
+            "mb_per_s": round(stats["bytes"] / 1e6 / elapsed, 2) if elapsed else None,
+            "retried_503": cfg.counts["hwp_503"] - before["hwp_503"],
+        }
+
+        # 3) refresh (조건부 요청)
+        stats, elapsed = _timed(download_hwp_async.run, manifest_path, out_dir,
+                                args.concurrency, args.rate, 60.0, refresh=True)
+        report["refresh"] = {**stats, "seconds": round(elapsed, 3),
+                             "checks_per_s": round((stats["ok"] + stats["unchanged"]) / elapsed, 2) if elapsed else None}
+
+        # 4) increment (신규 회의록이 목록 맨 앞에 생긴 상황)
+        if not args.no_browser and args.new_items > 0:
+            cfg.items += args.new_items
+            res, elapsed = _timed(
+                crawler.run, out_dir=out_dir, max_pages=cfg.last_page + 1, no_headless=False,
+                delay=args.delay, manifest_path=manifest_path, collect_only=True,
+                concurrency=args.concurrency, rate=args.rate, base=base,
+            )
+            report["increment"] = {"pages": res["pages"], "new_links": res["new_links"],
+                                   "seconds": round(elapsed, 3)}
+
+        _, py_peak = tracemalloc.get_traced_memory()
+        report["memory"] = {
+            "python_peak_rss_mb": round(_maxrss_mb(resource.RUSAGE_SELF), 1),
+            "python_tracemalloc_peak_mb": round(py_peak / 1e6, 1),
+            "browser_peak_rss_mb": None if args.no_browser else round(_maxrss_mb(resource.RUSAGE_CHILDREN), 1),
+        }
+        report["requests"] = dict(cfg.counts)
+    finally:
+        tracemalloc.stop()
+        server.shutdown()
+        if not args.work_dir:
+            shutil.rmtree(work, ignore_errors=True)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,29 +8,40 @@ crawl_hwp_law_subcommittee.py
 - 결과에서 모든 "상세내용 보기"를 펼친 뒤, 노출되는 모든 HWP 다운로드 링크
   (/assembly/viewer/minutes/download/hwp.do?id=...)를 일괄 다운로드
 
-전략
+전략 (2단계)
+[1단계: 링크 수집 - Playwright]
 1) /assembly/mnts/total/21.do 접속
 2) 좌측/상단의 '상임위원회' 링크 클릭 (href에 class_id_sch=2)
 3) 위원회 select에서 option[value="1525"] 선택 (법제사법위원회)
 4) 검색구분 select에서 option[value="sub_cmit"] 선택 (소위원회)
 5) '검색' 버튼(.btn.blue[type=submit]) 클릭
 6) 결과 페이지에서 ".btn_tit.cmit" (상세내용 보기) 버튼들을 모두 클릭하여 확장
-7) 확장된 영역 안의 hwp 링크들을 모두 수집 & 다운로드 (expect_download)
+7) 확장된 영역 안의 hwp 링크들을 모두 수집 → manifest.json 에 기록 (브라우저로는 받지 않음)
 8) 페이지네이션(다음/숫자) 반복 (기본 20페이지)
+   - 증분 모드(기본): 한 페이지의 링크가 모두 manifest 에 이미 있으면 그 뒤는 이전 실행에서 받은 것이므로 중단
+   - --full: 증분 중단 없이 --max-pages 까지 모두 순회
+[2단계: 다운로드 - download_hwp_async.py]
+9) manifest 의 링크를 커넥션 풀 + 요청 간격 제한 + 재시도 + sha256 으로 병렬 다운로드
 
 사용
     python crawl_hwp_law_subcommittee.py --out downloads_hwp --max-pages 20 --no-headless --delay 2.0
+    python crawl_hwp_law_subcommittee.py --collect-only          # 링크만 수집
+    python crawl_hwp_law_subcommittee.py --refresh               # 야간 갱신: 신규만 수집 + 기존 파일은 조건부 요청
+    python crawl_hwp_law_subcommittee.py --base http://127.0.0.1:8765   # 로컬 픽스처 서버(fixture_server.py) 대상
+    python download_hwp_async.py --manifest downloads_hwp/manifest.json --out downloads_hwp
 """
 from __future__ import annotations
 import re
-import os
 import time
 import argparse
 from pathlib import Path
 from typing import List
+from urllib.parse import urljoin
 
-from tqdm import tqdm
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout, Download
+from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+
+from hwp_manifest import Manifest
+import download_hwp_async
 
 BASE = "https://record.assembly.go.kr"
 START = f"{BASE}/assembly/mnts/total/21.do"
@@ -133,12 +144,8 @@ def expand_all_details(page, delay: float):
             break
 
 def absolute_url(current_url: str, href: str) -> str:
-    if href.startswith("http"):
-        return href
-    if href.startswith("/"):
-        return BASE + href
-    base = current_url.rsplit("/", 1)[0]
-    return base + "/" + href
+    # 현재 페이지 기준으로 절대경로화 (--base 로 다른 호스트를 가리켜도 그대로 동작)
+    return urljoin(current_url, href)
 
 def collect_hwp_links(page) -> List[str]:
     """
@@ -165,21 +172,6 @@ def collect_hwp_links(page) -> List[str]:
             seen.add(u)
     return uniq
 
-def save_download(page, url: str, out: Path, prefix: str = "") -> str:
-    # Playwright download 이벤트를 사용해 저장(세션/쿠키/POST 대응)
-    with page.expect_download(timeout=30000) as dl_info:
-        page.evaluate("(u)=>window.open(u,'_self')", url)
-    dl: Download = dl_info.value
-    suggested = dl.suggested_filename or os.path.basename(url.split("?")[0]) or "file.hwp"
-    fname = suggested
-    if prefix:
-        fname = f"{prefix}_{suggested}"
-    # 파일명 안전화
-    fname = re.sub(r"[\\/:*?\"<>|]", "_", fname)
-    fname = re.sub(r"\s+", " ", fname).strip()
-    dl.save_as(str(out / fname))
-    return fname
-
 def goto_next_page(page) -> bool:
     """
     페이지네이션:
@@ -212,19 +204,23 @@ def goto_next_page(page) -> bool:
         pass
     return False
 
-def run(out_dir: Path, max_pages: int, no_headless: bool, delay: float):
+def run(out_dir: Path, max_pages: int, no_headless: bool, delay: float,
+        manifest_path: Path, collect_only: bool, concurrency: int, rate: float,
+        full: bool = False, refresh: bool = False, base: str = BASE) -> dict:
+    """링크 수집(+다운로드). 벤치마크용으로 처리한 페이지 수/신규 링크 수/다운로드 통계를 반환."""
     out_dir = ensure_dir(out_dir)
+    start_url = base.rstrip("/") + START[len(BASE):]
+    manifest = Manifest(manifest_path)
     total = 0
 
     with sync_playwright() as pw:
         browser = pw.chromium.launch(headless=not no_headless)
-        ctx = browser.new_context(accept_downloads=True, locale="ko-KR")
+        ctx = browser.new_context(locale="ko-KR")
         page = ctx.new_page()
 
         # 1) 시작
-        page.goto(START, wait_until="domcontentloaded", timeout=45000)
+        page.goto(start_url, wait_until="domcontentloaded", timeout=45000)
 
-        # 2) '상임위원회' 앵커 클릭 (1번 힌트)
         # 2) '상임위원회' 링크 클릭
         clicked = click_anchor_contains(page, "class_id_sch=2")
         if clicked:
@@ -260,17 +256,16 @@ def run(out_dir: Path, max_pages: int, no_headless: bool, delay: float):
             except Exception:
                 pass
 
-            # 7) HWP 링크 수집 (7번 힌트: /assembly/viewer/minutes/download/hwp.do?id=...)
+            # 7) HWP 링크 수집 → manifest (7번 힌트: /assembly/viewer/minutes/download/hwp.do?id=...)
             links = collect_hwp_links(page)
+            added = sum(manifest.add_link(url, page=page_idx) for url in links)
+            total += added
+            print(f"[p{page_idx}] HWP 링크 {len(links)}개 (신규 {added}개)")
 
-            # 8) 다운로드
-            for url in tqdm(links, desc=f"[p{page_idx}] HWP"):
-                try:
-                    fname = save_download(page, url, out_dir)
-                    total += 1
-                    time.sleep(delay)
-                except Exception as e:
-                    print("[WARN] 다운로드 실패:", url, e)
+            # 증분: 목록은 최신순이므로 전부 아는 id 인 페이지부터는 이전 실행에서 이미 수집됨
+            if links and added == 0 and not full:
+                print(f"[p{page_idx}] 모두 기존 id → 페이징 중단 (전체 순회는 --full)")
+                break
 
             # 다음 페이지 이동
             moved = False
@@ -289,26 +284,51 @@ def run(out_dir: Path, max_pages: int, no_headless: bool, delay: float):
                 break
             page_idx += 1
 
+        # 다운로드 단계에서 같은 세션으로 요청하도록 쿠키 보관
+        manifest.cookies = {c["name"]: c["value"] for c in ctx.cookies()}
+        manifest.save()
         browser.close()
 
-    print(f"[DONE] 총 HWP 다운로드: {total}개  →  {out_dir.resolve()}")
-    if total == 0:
+    print(f"[DONE] 신규 HWP 링크: {total}개 (manifest 전체 {len(manifest.items)}개)  →  {manifest_path.resolve()}")
+    result = {"pages": page_idx, "new_links": total, "download": None}
+    if not manifest.items:
         print("※ 결과가 0개라면: 조건(대수/위원회/소위원회) 여부, '상세내용 보기'가 실제로 열리는지, 페이지네이션 유무를 점검하세요.")
         print("※ --no-headless 로 화면을 보면서 선택자에 변화가 없는지 확인하세요.")
+        return result
+
+    if not collect_only:
+        result["download"] = download_hwp_async.run(manifest_path, out_dir, concurrency=concurrency, rate=rate,
+                                                    timeout=60.0, refresh=refresh)
+    return result
 
 def main():
     ap = argparse.ArgumentParser(description="국회 회의록(법제사법위 소위원회) HWP 일괄 다운로드")
     ap.add_argument("--out", type=str, default="downloads_hwp", help="저장 폴더")
     ap.add_argument("--max-pages", type=int, default=20, help="순회할 최대 페이지 수")
     ap.add_argument("--no-headless", action="store_true", help="브라우저 창 표시(디버그용)")
-    ap.add_argument("--delay", type=float, default=0.6, help="클릭/다운 간 대기(초)")
+    ap.add_argument("--delay", type=float, default=0.6, help="클릭/페이지 이동 간 대기(초)")
+    ap.add_argument("--manifest", type=str, default=None, help="링크 manifest 경로 (기본: <out>/manifest.json)")
+    ap.add_argument("--collect-only", action="store_true", help="링크만 수집하고 다운로드는 하지 않음")
+    ap.add_argument("--concurrency", type=int, default=8, help="다운로드 동시 요청 수")
+    ap.add_argument("--rate", type=float, default=4.0, help="다운로드 초당 최대 요청 수")
+    ap.add_argument("--full", action="store_true", help="기존 id 를 만나도 멈추지 않고 --max-pages 까지 순회")
+    ap.add_argument("--refresh", action="store_true", help="이미 받은 파일도 ETag/Last-Modified 조건부 요청으로 확인")
+    ap.add_argument("--base", type=str, default=BASE, help="대상 호스트 (로컬 픽스처 서버: http://127.0.0.1:8765)")
     args = ap.parse_args()
 
+    out_dir = Path(args.out)
     run(
-        out_dir=Path(args.out),
+        out_dir=out_dir,
         max_pages=args.max_pages,
         no_headless=args.no_headless,
-        delay=args.delay
+        delay=args.delay,
+        manifest_path=Path(args.manifest) if args.manifest else out_dir / "manifest.json",
+        collect_only=args.collect_only,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        full=args.full,
+        refresh=args.refresh,
+        base=args.base,
     )
 
 if __name__ == "__main__":
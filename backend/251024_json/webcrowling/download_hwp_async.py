@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+download_hwp_async.py
+
+2단계 다운로더: manifest.json 에 수집된 hwp.do?id=... 링크를 비동기 HTTP 로 병렬 다운로드한다.
+(1단계 링크 수집은 crawl_hwp_law_subcommittee.py / download_hwp_minutes.py 가 담당)
+
+- 커넥션 풀(httpx.AsyncClient) + 동시 요청 수 제한(--concurrency)
+- 예의 있는 요청 간격(--rate: 초당 최대 요청 수)
+- 네트워크 오류 / 429 / 5xx 는 지수 백오프로 재시도(최대 4회)
+- 스트리밍 저장하면서 sha256 계산, Content-Length 와 크기가 다르면 재시도
+- 임시 파일은 <파일명>.<id>.part, 다른 항목이 이미 쓰는 파일명이면 <이름>__<id>.<확장자> 로 저장
+  (동시에 같은 이름으로 풀리는 항목끼리 덮어쓰지 않음)
+- 결과(status/path/size/sha256/ETag/Last-Modified)는 manifest 에 기록 → 다시 실행하면 done 항목은 건너뜀
+- --refresh: done 항목도 If-None-Match / If-Modified-Since 조건부 요청으로 확인
+  (304 면 그대로, 200 이면 내용이 바뀐 것이므로 덮어쓰고 sha256 갱신, 파일명이 바뀌었으면 이전 파일 삭제)
+
+사용
+    python download_hwp_async.py --manifest downloads_hwp/manifest.json --out downloads_hwp
+    python download_hwp_async.py --manifest downloads_hwp/manifest.json --out downloads_hwp --concurrency 8 --rate 4
+    python download_hwp_async.py --manifest downloads_hwp/manifest.json --out downloads_hwp --refresh   # 야간 갱신
+"""
+from __future__ import annotations
+import os
+import re
+import time
+import asyncio
+import hashlib
+import argparse
+from pathlib import Path
+from urllib.parse import unquote
+
+import httpx
+from tqdm import tqdm
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+from hwp_manifest import Manifest, sanitize_filename, STATUS_DONE
+
+USER_AGENT = "Mozilla/5.0 (K-LegiSight HWP downloader)"
+
+
+class RetryableHTTPError(Exception):
+    """429 / 5xx / 크기 불일치 등 다시 시도할 만한 응답."""
+
+
+NOT_MODIFIED = None  # fetch_one 이 304 를 받았을 때 돌려주는 값
+
+
+class RateLimiter:
+    """요청 시작 간격을 1/rate 초 이상으로 유지 (동시 요청 수와는 별개)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next = 0.0
+
+    async def wait(self):
+        if self.interval <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+                now = self._next
+            self._next = now + self.interval
+
+
+def filename_from_headers(resp: httpx.Response, item: dict) -> str:
+    """Content-Disposition 에서 파일명 추출 (filename*=UTF-8'' 우선), 없으면 <id>.hwp"""
+    cd = resp.headers.get("content-disposition", "")
+    m = re.search(r"filename\*\s*=\s*[^']*''([^;]+)", cd, re.I)
+    if m:
+        return unquote(m.group(1).strip().strip('"'))
+    m = re.search(r'filename\s*=\s*"?([^";]+)"?', cd, re.I)
+    if m:
+        raw = m.group(1).strip()
+        # 서버가 UTF-8 바이트를 latin-1 로 내려보내는 경우 복원
+        try:
+            raw = raw.encode("latin-1").decode("utf-8")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            pass
+        return unquote(raw)
+    if str(item["id"]).isdigit():
+        return f"{item['id']}.hwp"
+    return os.path.basename(item["url"].split("?")[0]) or "file.hwp"
+
+
+def target_name(item: dict, suggested: str) -> str:
+    prefix = item.get("prefix") or ""
+    return sanitize_filename(f"{prefix}_{suggested}" if prefix else suggested)
+
+
+def claim_path(dest: Path, item: dict, claims: dict | None) -> Path:
+    """다른 항목이 이미 쓰는 파일명이면 <이름>__<id><확장자> 로 바꾸고, 경로를 이 항목 것으로 기록."""
+    if claims is None:
+        return dest
+    alt = dest.with_name(f"{dest.stem}__{sanitize_filename(str(item['id']))}{dest.suffix}")
+    # 이전에 <이름>__<id> 로 받은 항목은 계속 그 이름을 쓴다 (refresh 마다 파일명이 바뀌지 않게)
+    if claims.get(str(alt)) == item["id"] or claims.get(str(dest), item["id"]) != item["id"]:
+        dest = alt
+    claims[str(dest)] = item["id"]
+    return dest
+
+
+def remove_replaced(old_path: str | None, new_path: str, item: dict, claims: dict):
+    """refresh 로 받은 파일의 이름이 바뀌었으면 이전 파일 삭제 (다른 항목이 쓰는 경로면 그대로 둔다)."""
+    if not old_path or old_path == new_path or claims.get(old_path, item["id"]) != item["id"]:
+        return
+    claims.pop(old_path, None)
+    Path(old_path).unlink(missing_ok=True)
+
+
+@retry(stop=stop_after_attempt(4), wait=wait_exponential(multiplier=1, min=1, max=30),
+       retry=retry_if_exception_type((httpx.TransportError, RetryableHTTPError)), reraise=True)
+async def fetch_one(client: httpx.AsyncClient, limiter: RateLimiter, item: dict, out_dir: Path,
+                    conditional: bool = False, claims: dict | None = None):
+    """
+    한 건 다운로드 → (저장 경로, 크기, sha256, ETag, Last-Modified)
+    conditional=True 이고 서버가 304 를 주면 NOT_MODIFIED 반환.
+    claims: {저장 경로: 항목 id} — 같은 파일명으로 풀리는 다른 항목과 겹치지 않게 한다.
+    """
+    await limiter.wait()
+    item["attempts"] = (item.get("attempts") or 0) + 1
+    headers = {}
+    if conditional:
+        if item.get("etag"):
+            headers["If-None-Match"] = item["etag"]
+        if item.get("last_modified"):
+            headers["If-Modified-Since"] = item["last_modified"]
+    async with client.stream("GET", item["url"], headers=headers) as resp:
+        if resp.status_code == 304:
+            return NOT_MODIFIED
+        if resp.status_code == 429 or resp.status_code >= 500:
+            raise RetryableHTTPError(f"HTTP {resp.status_code}")
+        resp.raise_for_status()
+
+        fname = target_name(item, filename_from_headers(resp, item))
+        dest = claim_path(out_dir / fname, item, claims)
+        part = dest.with_name(f"{dest.name}.{sanitize_filename(str(item['id']))}.part")
+
+        h = hashlib.sha256()
+        size = 0
+        with open(part, "wb") as f:
+            async for chunk in resp.aiter_bytes(64 * 1024):
+                f.write(chunk)
+                h.update(chunk)
+                size += len(chunk)
+
+        expected = resp.headers.get("content-length")
+        if expected is not None and resp.headers.get("content-encoding") is None and int(expected) != size:
+            part.unlink(missing_ok=True)
+            raise RetryableHTTPError(f"크기 불일치: {size} != {expected}")
+
+        etag = resp.headers.get("etag")
+        last_modified = resp.headers.get("last-modified")
+
+    os.replace(part, dest)
+    return str(dest), size, h.hexdigest(), etag, last_modified
+
+
+def _already_done(item: dict) -> bool:
+    """done 이고 파일이 그대로 남아 있으면 다시 받지 않는다."""
+    if item.get("status") != STATUS_DONE or not item.get("path"):
+        return False
+    p = Path(item["path"])
+    return p.exists() and p.stat().st_size == item.get("size")
+
+
+def _can_revalidate(item: dict) -> bool:
+    return _already_done(item) and bool(item.get("etag") or item.get("last_modified"))
+
+
+async def download_all(manifest: Manifest, out_dir: Path, concurrency: int = 8,
+                       rate: float = 4.0, timeout: float = 60.0, save_every: int = 20,
+                       refresh: bool = False) -> dict:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if refresh:
+        # 검증자(ETag/Last-Modified)가 있는 done 항목은 조건부로, 나머지는 일반 요청
+        todo = [it for it in manifest.items.values() if not _already_done(it) or _can_revalidate(it)]
+    else:
+        todo = [it for it in manifest.items.values() if not _already_done(it)]
+    stats = {"ok": 0, "unchanged": 0, "failed": 0, "skipped": len(manifest.items) - len(todo), "bytes": 0}
+    if not todo:
+        return stats
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    sem = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    done_since_save = 0
+    claims = {it["path"]: it["id"] for it in manifest.items.values() if it.get("path")}
+
+    async with httpx.AsyncClient(
+        limits=limits,
+        timeout=httpx.Timeout(timeout),
+        headers={"User-Agent": USER_AGENT},
+        cookies=manifest.cookies,
+        follow_redirects=True,
+    ) as client:
+
+        async def worker(item):
+            nonlocal done_since_save
+            async with sem:
+                try:
+                    old_path = item.get("path")
+                    result = await fetch_one(client, limiter, item, out_dir,
+                                             conditional=_can_revalidate(item), claims=claims)
+                    if result is NOT_MODIFIED:
+                        manifest.mark_unchanged(item["id"])
+                        stats["unchanged"] += 1
+                    else:
+                        path, size, digest, etag, last_modified = result
+                        remove_replaced(old_path, path, item, claims)
+                        manifest.mark_done(item["id"], path, size, digest, etag, last_modified)
+                        stats["ok"] += 1
+                        stats["bytes"] += size
+                except Exception as e:
+                    manifest.mark_failed(item["id"], f"{type(e).__name__}: {e}")
+                    stats["failed"] += 1
+                done_since_save += 1
+                if done_since_save >= save_every:
+                    manifest.save()
+                    done_since_save = 0
+                pbar.update(1)
+
+        with tqdm(total=len(todo), desc="HWP 다운로드") as pbar:
+            await asyncio.gather(*(worker(it) for it in todo))
+
+    manifest.save()
+    return stats
+
+
+def run(manifest_path: Path, out_dir: Path, concurrency: int, rate: float, timeout: float,
+        refresh: bool = False) -> dict:
+    manifest = Manifest(manifest_path)
+    t0 = time.perf_counter()
+    stats = asyncio.run(download_all(manifest, out_dir, concurrency=concurrency, rate=rate,
+                                     timeout=timeout, refresh=refresh))
+    elapsed = time.perf_counter() - t0
+    print(f"[DONE] 성공 {stats['ok']} / 변경없음(304) {stats['unchanged']} / 실패 {stats['failed']} / 건너뜀 {stats['skipped']}  "
+          f"({stats['bytes'] / 1e6:.1f} MB, {elapsed:.1f}s)  →  {out_dir.resolve()}")
+    print(f"       manifest 상태: {manifest.counts()}")
+    if stats["failed"]:
+        print("※ 실패 항목은 manifest 에 failed 로 남아 있으며, 다시 실행하면 재시도합니다.")
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description="manifest 의 HWP 링크를 비동기 HTTP 로 일괄 다운로드")
+    ap.add_argument("--manifest", type=str, default="downloads_hwp/manifest.json", help="manifest 경로")
+    ap.add_argument("--out", type=str, default="downloads_hwp", help="저장 폴더")
+    ap.add_argument("--concurrency", type=int, default=8, help="동시 다운로드 수")
+    ap.add_argument("--rate", type=float, default=4.0, help="초당 최대 요청 수 (0 이면 제한 없음)")
+    ap.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃(초)")
+    ap.add_argument("--refresh", action="store_true", help="이미 받은 파일도 ETag/Last-Modified 조건부 요청으로 변경 여부 확인")
+    args = ap.parse_args()
+
+    run(Path(args.manifest), Path(args.out), args.concurrency, args.rate, args.timeout, refresh=args.refresh)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,14 @@
 download_hwp_minutes.py
 - 대상: https://record.assembly.go.kr/assembly/mnts/total/21.do
 - 목표: 제21대, 상임위원회, '법제사법위원회', 검색구분 '소위원회' 결과에서 HWP 파일 일괄 다운로드
-- 방법: Playwright(Chromium)로 목록 → 상세 진입 → .hwp 링크/버튼 클릭 시 download 이벤트로 저장
+- 방법: Playwright(Chromium)로 목록 → 상세 진입 → .hwp 링크를 manifest.json 에 수집(1단계)
+        → download_hwp_async.py 가 manifest 의 링크를 비동기 HTTP 로 병렬 다운로드(2단계)
+- 증분: manifest 에 source 로 기록된 상세 페이지는 다시 열지 않고, 한 페이지의 상세가 모두 기존이면 페이징 중단(--full 로 해제)
 - 주의: 사이트 개편/라벨명이 조금씩 다를 수 있으므로, 실행 중 셀렉터가 안 맞으면 --no-headless --debug로 실제 라벨/버튼 텍스트 확인 후 아래 선택자 테이블만 손보세요.
 """
 
 from __future__ import annotations
 import re
-import os
 import time
 import argparse
 from pathlib import Path
@@ -18,7 +19,10 @@ from typing import List, Optional
 
 from tqdm import tqdm
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout, Download
+from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+
+from hwp_manifest import Manifest, sanitize_filename
+import download_hwp_async
 
 START_URL = "https://record.assembly.go.kr/assembly/mnts/total/21.do"
 
@@ -195,11 +199,6 @@ def find_hwp_links_in_detail(page) -> List[str]:
             cand.append(href)
     return list(dict.fromkeys(cand))  # 중복 제거, 순서 유지
 
-def sanitize_filename(s: str) -> str:
-    s = re.sub(r"[\\/:*?\"<>|]", "_", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s[:200]
-
 def derive_title_date(page) -> tuple[str, str]:
     """상세 상단에서 제목/일자 비슷한 문자열을 찾아 파일명에 보태기(실패해도 무관)."""
     title = ""
@@ -223,27 +222,16 @@ def derive_title_date(page) -> tuple[str, str]:
         pass
     return title, date
 
-def save_with_playwright_download(page, href: str, out_dir: Path, prefix: str):
-    """
-    href가 단순 파일이면 request로 받는 것보다, Playwright의 download 이벤트로 받는 게
-    세션/쿠키/POST 다운로드까지 안전하게 커버됨.
-    """
-    # 새 탭 이동/다운로드 모두 대응
-    with page.expect_download(timeout=30000) as dl_info:
-        page.evaluate("(url) => window.open(url, '_self')", href)
-    dl: Download = dl_info.value
-    # 파일명 결정
-    suggested = dl.suggested_filename or os.path.basename(href.split("?")[0])
-    filename = sanitize_filename(f"{prefix}_{suggested}")
-    dl.save_as(str(out_dir / filename))
-    return filename
-
-def crawl(out_dir: Path, max_pages: int, detail_timeout: int, headless: bool, debug: bool):
+def crawl(out_dir: Path, max_pages: int, detail_timeout: int, headless: bool, debug: bool,
+          manifest_path: Path, collect_only: bool, concurrency: int, rate: float,
+          full: bool = False, refresh: bool = False):
     out_dir = ensure_dir(out_dir)
+    manifest = Manifest(manifest_path)
+    known = manifest.known_sources()
 
     with sync_playwright() as pw:
         browser = pw.chromium.launch(headless=headless)
-        ctx = browser.new_context(accept_downloads=True, locale="ko-KR")
+        ctx = browser.new_context(locale="ko-KR")
         page = ctx.new_page()
         page.goto(START_URL, wait_until="domcontentloaded", timeout=45000)
 
@@ -256,7 +244,7 @@ def crawl(out_dir: Path, max_pages: int, detail_timeout: int, headless: bool, de
             pass
 
         page_no = 1
-        total_downloads = 0
+        total_links = 0
 
         while page_no <= max_pages:
             # 목록에서 상세 링크 수집
@@ -264,7 +252,12 @@ def crawl(out_dir: Path, max_pages: int, detail_timeout: int, headless: bool, de
             if not links and debug:
                 print(f"[DEBUG] {page_no}페이지 상세 링크 없음")
 
-            for detail_url in tqdm(links, desc=f"[{page_no}p] 상세 처리"):
+            new_links = [u for u in links if u not in known]
+            if links and not new_links and not full:
+                print(f"[{page_no}p] 상세 {len(links)}건 모두 기존 → 페이징 중단 (전체 순회는 --full)")
+                break
+
+            for detail_url in tqdm(new_links, desc=f"[{page_no}p] 상세 처리"):
                 try:
                     sub = ctx.new_page()
                     sub.goto(detail_url, wait_until="domcontentloaded", timeout=45000)
@@ -276,19 +269,15 @@ def crawl(out_dir: Path, max_pages: int, detail_timeout: int, headless: bool, de
                     title, date = derive_title_date(sub)
                     prefix = sanitize_filename("_".join(x for x in [date, title] if x))
 
-                    # 상세에서 HWP 후보 링크 찾기
+                    # 상세에서 HWP 후보 링크 찾기 → manifest 에 기록 (다운로드는 2단계에서)
                     hwp_links = find_hwp_links_in_detail(sub)
 
                     for href in hwp_links:
-                        try:
-                            fname = save_with_playwright_download(sub, href, out_dir, prefix or "document")
-                            total_downloads += 1
+                        if manifest.add_link(href, prefix=prefix or "document", page=page_no, source=detail_url):
+                            total_links += 1
                             if debug:
-                                print(f"[OK] {fname}")
-                            time.sleep(0.6)
-                        except Exception as e:
-                            if debug:
-                                print("[WARN] 다운로드 실패:", href, e)
+                                print(f"[OK] {href}")
+                    known.add(detail_url)
                     sub.close()
                     time.sleep(0.5)
                 except Exception as e:
@@ -315,8 +304,15 @@ def crawl(out_dir: Path, max_pages: int, detail_timeout: int, headless: bool, de
                 pass
             page_no += 1
 
+        # 다운로드 단계에서 같은 세션으로 요청하도록 쿠키 보관
+        manifest.cookies = {c["name"]: c["value"] for c in ctx.cookies()}
+        manifest.save()
         browser.close()
-        print(f"[DONE] 총 다운로드: {total_downloads}개, 저장 위치: {out_dir.resolve()}")
+        print(f"[DONE] 신규 링크: {total_links}개 (manifest 전체 {len(manifest.items)}개): {manifest_path.resolve()}")
+
+    if not collect_only and manifest.items:
+        download_hwp_async.run(manifest_path, out_dir, concurrency=concurrency, rate=rate, timeout=60.0,
+                               refresh=refresh)
 
 def parse_args():
     ap = argparse.ArgumentParser(description="국회 회의록 기록시스템 HWP 일괄 다운로드")
@@ -325,6 +321,12 @@ def parse_args():
     ap.add_argument("--detail-timeout", type=int, default=15, help="상세페이지 네트워크 유휴 대기(초)")
     ap.add_argument("--no-headless", action="store_true", help="브라우저 UI 표시(디버그 시 유용)")
     ap.add_argument("--debug", action="store_true", help="디버그 로그")
+    ap.add_argument("--manifest", type=str, default=None, help="링크 manifest 경로 (기본: <out-dir>/manifest.json)")
+    ap.add_argument("--collect-only", action="store_true", help="링크만 수집하고 다운로드는 하지 않음")
+    ap.add_argument("--concurrency", type=int, default=8, help="다운로드 동시 요청 수")
+    ap.add_argument("--rate", type=float, default=4.0, help="다운로드 초당 최대 요청 수")
+    ap.add_argument("--full", action="store_true", help="기존 상세 페이지를 만나도 멈추지 않고 --max-pages 까지 순회")
+    ap.add_argument("--refresh", action="store_true", help="이미 받은 파일도 ETag/Last-Modified 조건부 요청으로 확인")
     return ap.parse_args()
 
 if __name__ == "__main__":
@@ -334,5 +336,11 @@ if __name__ == "__main__":
         max_pages=args.max_pages,
         detail_timeout=args.detail_timeout,
         headless=not args.no_headless,
-        debug=args.debug
+        debug=args.debug,
+        manifest_path=Path(args.manifest) if args.manifest else Path(args.out_dir) / "manifest.json",
+        collect_only=args.collect_only,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        full=args.full,
+        refresh=args.refresh,
     )
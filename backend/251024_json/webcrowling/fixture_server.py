@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+fixture_server.py
+
+record.assembly.go.kr 회의록 검색 화면을 흉내 내는 로컬 HTTP 픽스처 서버.
+크롤러(crawl_hwp_law_subcommittee.py / download_hwp_minutes.py)를 실서버 없이 돌려
+회귀 확인 및 처리량(pages/s, files/s, 메모리) 측정을 하기 위한 용도.
+
+재현하는 것
+- /assembly/mnts/total/21.do                  시작 페이지 ('상임위원회' 링크, 위원회/검색구분 select, 검색 버튼)
+- /assembly/mnts/total/21.do?...&page=N       검색 결과 목록 (최신 id 순, --per-page 건씩)
+    · 행마다 상세 링크 + <button class="btn_tit cmit">상세내용 보기</button>
+    · 버튼 클릭 시 fetch 로 상세 조각을 받아 펼침 (텍스트가 '상세내용 닫기'로 바뀜)
+    · 페이지네이션: <strong>현재</strong> + 숫자 링크 + '다음' (마지막 페이지엔 '다음' 없음)
+- /assembly/mnts/detail.do?id=ID[&frag=1]    상세 페이지(frag=1 이면 펼침용 조각)
+- /assembly/viewer/minutes/download/hwp.do?id=ID
+    · Content-Disposition(filename*=UTF-8''...), Content-Length, ETag, Last-Modified
+    · If-None-Match / If-Modified-Since 가 맞으면 304
+    · --latency / --fail-rate 로 지연과 503 오류 주입 (재시도 경로 확인용)
+
+녹화된 HTML 재생
+- --recorded DIR 를 주면 아래 파일이 있는 경우 합성 페이지 대신 그대로 내려준다.
+    DIR/start.html, DIR/list_{page}.html, DIR/detail_{id}.html, DIR/hwp/{id}.hwp
+- 녹화본 안의 절대 URL(https://record.assembly.go.kr)은 픽스처 서버 주소로 바꿔서 응답한다.
+
+증분 크롤 확인
+- id 는 (--first-id + --items - 1) 부터 내림차순. --items 를 늘려 다시 띄우면
+  늘어난 만큼의 "신규 회의록"이 목록 맨 앞에 생긴다.
+
+사용
+    python fixture_server.py --port 8765 --items 200 --per-page 10
+    python crawl_hwp_law_subcommittee.py --base http://127.0.0.1:8765 --out /tmp/hwp_fx --rate 0
+"""
+from __future__ import annotations
+import time
+import random
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse, parse_qs, quote
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LIVE_BASE = "https://record.assembly.go.kr"
+LIST_PATH = "/assembly/mnts/total/21.do"
+DETAIL_PATH = "/assembly/mnts/detail.do"
+HWP_PATH = "/assembly/viewer/minutes/download/hwp.do"
+
+# 모든 파일의 Last-Modified (고정값이어야 조건부 요청 결과가 재현됨)
+LAST_MODIFIED_TS = 1637020800  # 2021-11-16 00:00:00 UTC
+
+
+class FixtureConfig:
+    def __init__(self, items: int = 200, per_page: int = 10, first_id: int = 40000,
+                 files_per_item: int = 1, file_size: int = 256 * 1024,
+                 latency: float = 0.0, fail_rate: float = 0.0,
+                 recorded: Optional[Path] = None, seed: int = 0):
+        self.items = items
+        self.per_page = per_page
+        self.first_id = first_id
+        self.files_per_item = max(1, min(files_per_item, 10))  # hwp id = 회의록 id * 10 + k
+        self.file_size = file_size
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.recorded = recorded
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        # 요청 통계 (벤치마크 리포트용)
+        self.counts = {"list": 0, "detail": 0, "hwp": 0, "hwp_304": 0, "hwp_503": 0}
+        self.counts_lock = threading.Lock()
+
+    @property
+    def last_page(self) -> int:
+        return max(1, -(-self.items // self.per_page))
+
+    def page_ids(self, page: int):
+        """page(1부터)에 보일 회의록 id 목록 (최신순)."""
+        newest = self.first_id + self.items - 1
+        start = (page - 1) * self.per_page
+        stop = min(start + self.per_page, self.items)
+        return [newest - i for i in range(start, stop)]
+
+    def hwp_ids(self, mid: int):
+        """회의록 하나에 달린 HWP 파일 id (본문 + 부록)."""
+        return [mid * 10 + k for k in range(self.files_per_item)]
+
+    def exists(self, mid: int) -> bool:
+        return self.first_id <= mid < self.first_id + self.items
+
+    def bump(self, key: str):
+        with self.counts_lock:
+            self.counts[key] += 1
+
+    def should_fail(self) -> bool:
+        if self.fail_rate <= 0:
+            return False
+        with self.rng_lock:
+            return self.rng.random() < self.fail_rate
+
+
+# =========================================================
+# 합성 페이지
+# =========================================================
+def _meeting_title(mid: int) -> str:
+    return f"제{390 + mid % 20}회 국회(정기회) 법제사법위원회 법안심사제1소위원회 제{mid % 30 + 1}차"
+
+
+def _meeting_date(mid: int) -> str:
+    day = mid % 28 + 1
+    month = mid % 12 + 1
+    return f"2021.{month:02d}.{day:02d}"
+
+
+def render_start() -> str:
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>회의록 검색</title></head>
+<body>
+<ul class="lnb">
+  <li><a href="{LIST_PATH}?class_id_sch=1">본회의</a></li>
+  <li><a href="{LIST_PATH}?class_id_sch=2">상임위원회</a></li>
+</ul>
+<form method="get" action="{LIST_PATH}">
+  <input type="hidden" name="class_id_sch" value="2">
+  <label for="cmit">위원회명</label>
+  <select id="cmit" name="cmit_cd">
+    <option value="">전체</option>
+    <option value="1525">법제사법위원회</option>
+    <option value="1526">정무위원회</option>
+  </select>
+  <label for="gubun">검색구분</label>
+  <select id="gubun" name="search_gubun">
+    <option value="cmit">위원회</option>
+    <option value="sub_cmit">소위원회</option>
+  </select>
+  <input type="hidden" name="page" value="1">
+  <button class="btn blue" type="submit">검색</button>
+</form>
+</body></html>"""
+
+
+def _page_href(query: dict, page: int) -> str:
+    q = dict(query)
+    q["page"] = str(page)
+    return LIST_PATH + "?" + "&".join(f"{k}={quote(v)}" for k, v in q.items())
+
+
+def render_list(cfg: FixtureConfig, page: int, query: dict) -> str:
+    rows = []
+    for mid in cfg.page_ids(page):
+        rows.append(f"""
+    <tr>
+      <td>{mid}</td>
+      <td><a href="{DETAIL_PATH}?id={mid}">{_meeting_title(mid)}</a></td>
+      <td>{_meeting_date(mid)}</td>
+      <td>
+        <button class="btn_tit cmit" type="button" data-id="{mid}">상세내용 보기</button>
+        <div class="detail" id="detail-{mid}"></div>
+      </td>
+    </tr>""")
+
+    # 페이지네이션: 10개 단위 블록
+    block_start = (page - 1) // 10 * 10 + 1
+    block_end = min(block_start + 9, cfg.last_page)
+    nums = []
+    for p in range(block_start, block_end + 1):
+        nums.append(f"<strong>{p}</strong>" if p == page else f'<a href="{_page_href(query, p)}">{p}</a>')
+    if page < cfg.last_page:
+        nums.append(f'<a href="{_page_href(query, page + 1)}">다음</a>')
+
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>회의록 검색 결과</title></head>
+<body>
+<table class="list"><tbody>{''.join(rows)}
+</tbody></table>
+<div class="paging">{' '.join(nums)}</div>
+<script>
+document.querySelectorAll("button.btn_tit.cmit").forEach(function (btn) {{
+  btn.addEventListener("click", function () {{
+    var box = document.getElementById("detail-" + btn.dataset.id);
+    if (btn.dataset.open === "1") {{
+      box.innerHTML = ""; btn.dataset.open = "0"; btn.textContent = "상세내용 보기";
+      return;
+    }}
+    btn.dataset.open = "1"; btn.textContent = "상세내용 닫기";
+    fetch("{DETAIL_PATH}?frag=1&id=" + btn.dataset.id)
+      .then(function (r) {{ return r.text(); }})
+      .then(function (html) {{ box.innerHTML = html; }});
+  }});
+}});
+</script>
+</body></html>"""
+
+
+def render_detail_fragment(cfg: FixtureConfig, mid: int) -> str:
+    links = []
+    for k, hid in enumerate(cfg.hwp_ids(mid)):
+        label = "회의록 HWP" if k == 0 else f"부록{k} HWP"
+        links.append(
+            f'<a href="{HWP_PATH}?id={hid}" class="btn_ico">'
+            f'<img src="/img/ico_hwp.gif" alt="hwp 다운로드">{label}</a>'
+        )
+    return f'<div class="detail_cont"><p>{_meeting_date(mid)} {_meeting_title(mid)}</p>{"".join(links)}</div>'
+
+
+def render_detail(cfg: FixtureConfig, mid: int) -> str:
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{_meeting_title(mid)}</title></head>
+<body>
+<h2 class="title">{_meeting_title(mid)}</h2>
+<p class="date">{_meeting_date(mid)}</p>
+{render_detail_fragment(cfg, mid)}
+</body></html>"""
+
+
+def hwp_body(hid: int, size: int) -> bytes:
+    """id 로 결정되는 의사 난수 바이트 (같은 id 는 항상 같은 내용 → 같은 sha256)."""
+    block = hashlib.sha256(str(hid).encode()).digest() * 128  # 4KB
+    return (b"HWP Document File" + block * (size // len(block) + 1))[:size]
+
+
+# =========================================================
+# 요청 처리
+# =========================================================
+class FixtureHandler(BaseHTTPRequestHandler):
+    cfg: FixtureConfig = None  # serve() 에서 주입
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):  # 기본 접근 로그는 벤치마크를 느리게 하므로 끔
+        pass
+
+    # ---------- 공통 응답 ----------
+    def _send(self, status: int, body: bytes = b"", content_type: str = "text/html; charset=utf-8",
+              headers: Optional[dict] = None):
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if body and status != 304 and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _html(self, text: str):
+        host = f"http://{self.headers.get('Host') or 'localhost'}"
+        self._send(200, text.replace(LIVE_BASE, host).encode("utf-8"))
+
+    def _recorded(self, name: str) -> Optional[Path]:
+        if self.cfg.recorded is None:
+            return None
+        p = self.cfg.recorded / name
+        return p if p.exists() else None
+
+    # ---------- 라우팅 ----------
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if self.cfg.latency > 0:
+            time.sleep(self.cfg.latency)
+
+        if url.path == LIST_PATH:
+            self.handle_list(query)
+        elif url.path == DETAIL_PATH:
+            self.handle_detail(query)
+        elif url.path == HWP_PATH:
+            self.handle_hwp(query)
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def handle_list(self, query: dict):
+        if "page" not in query:
+            rec = self._recorded("start.html")
+            return self._html(rec.read_text(encoding="utf-8") if rec else render_start())
+
+        self.cfg.bump("list")
+        page = int(query.get("page") or 1)
+        rec = self._recorded(f"list_{page}.html")
+        if rec:
+            return self._html(rec.read_text(encoding="utf-8"))
+        if page < 1 or page > self.cfg.last_page:
+            return self._html(render_list(self.cfg, self.cfg.last_page + 1, query))
+        self._html(render_list(self.cfg, page, query))
+
+    def handle_detail(self, query: dict):
+        self.cfg.bump("detail")
+        try:
+            mid = int(query.get("id", ""))
+        except ValueError:
+            return self._send(400, b"bad id", "text/plain")
+        rec = self._recorded(f"detail_{mid}.html")
+        if rec:
+            return self._html(rec.read_text(encoding="utf-8"))
+        if not self.cfg.exists(mid):
+            return self._send(404, b"no such minutes", "text/plain")
+        if query.get("frag"):
+            return self._html(render_detail_fragment(self.cfg, mid))
+        self._html(render_detail(self.cfg, mid))
+
+    def handle_hwp(self, query: dict):
+        try:
+            hid = int(query.get("id", ""))
+        except ValueError:
+            return self._send(400, b"bad id", "text/plain")
+        if not self.cfg.exists(hid // 10):
+            return self._send(404, b"no such file", "text/plain")
+        if self.cfg.should_fail():
+            self.cfg.bump("hwp_503")
+            return self._send(503, b"busy", "text/plain", {"Retry-After": "1"})
+
+        rec = self._recorded(f"hwp/{hid}.hwp")
+        body = rec.read_bytes() if rec else hwp_body(hid, self.cfg.file_size)
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        last_modified = formatdate(LAST_MODIFIED_TS, usegmt=True)
+
+        inm = self.headers.get("If-None-Match")
+        ims = self.headers.get("If-Modified-Since")
+        not_modified = False
+        if inm is not None:
+            not_modified = etag in [t.strip() for t in inm.split(",")] or inm.strip() == "*"
+        elif ims:
+            try:
+                not_modified = parsedate_to_datetime(ims).timestamp() >= LAST_MODIFIED_TS
+            except (TypeError, ValueError):
+                not_modified = False
+        if not_modified:
+            self.cfg.bump("hwp_304")
+            return self._send(304, headers={"ETag": etag, "Last-Modified": last_modified})
+
+        self.cfg.bump("hwp")
+        mid = hid // 10
+        fname = f"{_meeting_date(mid).replace('.', '')}_{_meeting_title(mid)}_{hid}.hwp"
+        self._send(200, body, "application/x-hwp", {
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(fname)}",
+            "ETag": etag,
+            "Last-Modified": last_modified,
+        })
+
+
+def serve(cfg: FixtureConfig, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """
+    픽스처 서버를 백그라운드 스레드로 띄우고 서버 객체를 반환 (벤치마크/스크립트에서 사용).
+    종료: server.shutdown()
+    """
+    handler = type("BoundFixtureHandler", (FixtureHandler,), {"cfg": cfg})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser(description="국회 회의록 검색/다운로드 로컬 픽스처 서버")
+    ap.add_argument("--host", type=str, default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--items", type=int, default=200, help="검색 결과 회의록 수")
+    ap.add_argument("--per-page", type=int, default=10, help="목록 한 페이지당 건수")
+    ap.add_argument("--first-id", type=int, default=40000, help="가장 오래된 회의록 id")
+    ap.add_argument("--files-per-item", type=int, default=1, help="회의록당 HWP 파일 수 (본문 + 부록)")
+    ap.add_argument("--file-size", type=int, default=256 * 1024, help="HWP 파일 크기(바이트)")
+    ap.add_argument("--latency", type=float, default=0.0, help="모든 응답에 더할 지연(초)")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="hwp.do 가 503 을 돌려줄 확률 (0~1)")
+    ap.add_argument("--recorded", type=str, default=None, help="녹화된 HTML/HWP 폴더 (있는 파일만 덮어씀)")
+    ap.add_argument("--seed", type=int, default=0, help="오류 주입 난수 시드")
+    args = ap.parse_args()
+
+    cfg = FixtureConfig(
+        items=args.items, per_page=args.per_page, first_id=args.first_id,
+        files_per_item=args.files_per_item, file_size=args.file_size,
+        latency=args.latency, fail_rate=args.fail_rate,
+        recorded=Path(args.recorded) if args.recorded else None, seed=args.seed,
+    )
+    server = serve(cfg, args.host, args.port)
+    print(f"[FIXTURE] http://{args.host}:{args.port}{LIST_PATH}  "
+          f"(회의록 {cfg.items}건, {cfg.last_page}페이지, 파일 {cfg.items * cfg.files_per_item}개)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"[FIXTURE] 종료. 요청 통계: {cfg.counts}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
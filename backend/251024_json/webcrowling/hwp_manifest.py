@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+hwp_manifest.py
+
+HWP 회의록 크롤러의 1단계(링크 수집)와 2단계(HTTP 다운로드)를 잇는 manifest.
+
+- 1단계: Playwright 크롤러가 /assembly/viewer/minutes/download/hwp.do?id=... 링크를 모아 add_link()
+- 2단계: download_hwp_async.py 가 manifest 를 읽어 pending/failed 항목을 병렬 다운로드
+- 증분 실행: 이미 manifest 에 있는 id 만 나오는 페이지에 도달하면 크롤러가 페이징을 멈추고,
+  --refresh 다운로드는 ETag/Last-Modified 로 조건부 요청(304 면 그대로 둠)
+
+manifest.json 구조
+{
+  "version": 1,
+  "cookies": {"JSESSIONID": "..."},          # 브라우저 세션 쿠키 (다운로드 시 재사용)
+  "items": {
+    "45139": {
+      "id": "45139",
+      "url": "https://record.assembly.go.kr/assembly/viewer/minutes/download/hwp.do?id=45139",
+      "prefix": "20211116_법제사법위원회",     # 파일명 앞에 붙일 문자열 (없으면 "")
+      "page": 1,                               # 수집된 목록 페이지
+      "source": "https://.../상세페이지",        # 링크를 찾은 상세 페이지 (없으면 null)
+      "status": "pending" | "done" | "failed",
+      "path": "downloads_hwp/....hwp",
+      "size": 123456,
+      "sha256": "...",
+      "etag": "\"abc\"",                      # 서버가 준 ETag / Last-Modified (조건부 재요청용)
+      "last_modified": "Tue, 16 Nov 2021 ...",
+      "attempts": 1,
+      "error": null,
+      "collected_at": "...",
+      "downloaded_at": "...",
+      "checked_at": "..."                      # 마지막 조건부 확인 시각 (304 포함)
+    }
+  }
+}
+"""
+from __future__ import annotations
+import os
+import re
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Set
+from urllib.parse import urlparse, parse_qs
+
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+MANIFEST_VERSION = 1
+
+
+def sanitize_filename(s: str) -> str:
+    s = re.sub(r"[\\/:*?\"<>|]", "_", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s[:200]
+
+
+def minutes_id_from_url(url: str) -> Optional[str]:
+    """hwp.do?id=45139 → '45139'"""
+    qs = parse_qs(urlparse(url).query)
+    vals = qs.get("id")
+    return vals[0] if vals else None
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class Manifest:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.cookies: Dict[str, str] = {}
+        self.items: Dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.cookies = data.get("cookies") or {}
+            self.items = data.get("items") or {}
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체 (중간에 죽어도 manifest 가 깨지지 않도록)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "cookies": self.cookies, "items": self.items},
+                f, ensure_ascii=False, indent=2,
+            )
+        os.replace(tmp, self.path)
+
+    def has(self, url: str) -> bool:
+        return (minutes_id_from_url(url) or url) in self.items
+
+    def known_sources(self) -> Set[str]:
+        """이미 링크를 수집한 상세 페이지 URL 집합 (상세 재방문 생략용)."""
+        return {it["source"] for it in self.items.values() if it.get("source")}
+
+    def add_link(self, url: str, prefix: str = "", page: Optional[int] = None,
+                 source: Optional[str] = None) -> bool:
+        """새 링크면 pending 으로 추가하고 True. 이미 있으면 False."""
+        # id 쿼리가 없는 링크(상세 페이지의 기타 .hwp 링크)는 URL 자체를 키로 사용
+        mid = minutes_id_from_url(url) or url
+        if mid in self.items:
+            return False
+        self.items[mid] = {
+            "id": mid,
+            "url": url,
+            "prefix": prefix or "",
+            "page": page,
+            "source": source,
+            "status": STATUS_PENDING,
+            "path": None,
+            "size": None,
+            "sha256": None,
+            "etag": None,
+            "last_modified": None,
+            "attempts": 0,
+            "error": None,
+            "collected_at": _now(),
+            "downloaded_at": None,
+            "checked_at": None,
+        }
+        return True
+
+    def mark_done(self, mid: str, path: str, size: int, sha256: str,
+                  etag: Optional[str] = None, last_modified: Optional[str] = None):
+        item = self.items[mid]
+        now = _now()
+        item.update(
+            status=STATUS_DONE, path=path, size=size, sha256=sha256,
+            etag=etag, last_modified=last_modified,
+            error=None, downloaded_at=now, checked_at=now,
+        )
+
+    def mark_unchanged(self, mid: str):
+        """조건부 요청 결과 304 (Not Modified)."""
+        item = self.items[mid]
+        item.update(status=STATUS_DONE, error=None, checked_at=_now())
+
+    def mark_failed(self, mid: str, error: str):
+        item = self.items[mid]
+        item.update(status=STATUS_FAILED, error=error)
+
+    def counts(self) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for item in self.items.values():
+            out[item["status"]] = out.get(item["status"], 0) + 1
+        return out
@@ -9,7 +9,7 @@ when explicit columns ('회수', '차수') are empty or missing.
 
 Usage:
   pip install pandas openpyxl
-  python xlsx_to_json_parliament2.py --excel "./제21대 국회 소위원회 법제사법위원회 회의록 데이터셋.xlsx" --outdir "./out"
+  PYTHONPATH=../FastAPI python xlsx_to_json_parliament2.py --excel "./제21대 국회 소위원회 법제사법위원회 회의록 데이터셋.xlsx" --outdir "./out"
 
 Outputs:
   <base>_speeches.json
@@ -17,26 +17,8 @@ Outputs:
 """
 
 # === Bills filter: keep only lines that contain a valid bill number (의안번호 ####) ===
-import re as _re_bills_filter
-
-_RE_BILLNO = _re_bills_filter.compile(r"의\s*안\s*번\s*호\s*[:\s\-]*\d{4,}", _re_bills_filter.IGNORECASE)
-
-def _bf_has_bill_number(text: str) -> bool:
-    if not text:
-        return False
-    return bool(_RE_BILLNO.search(str(text)))
-
-def _bf_filter_bills_lines(bills: str):
-    """
-    - If bills has multiple lines, keep only lines that contain a bill number (의안번호 ####).
-    - If none remain, return None to avoid recording bills.
-    """
-    if not bills:
-        return None
-    s = str(bills).replace("\\r", "\\n")
-    lines = [ln.strip() for ln in s.split("\\n") if ln.strip()]
-    kept = [ln for ln in lines if _bf_has_bill_number(ln)]
-    return "\\n".join(kept) if kept else None
+# 파서는 backend/FastAPI/util_bill.py 하나로 통일 (정규식 사전 컴파일) → PYTHONPATH 에 backend/FastAPI 필요
+from util_bill import filter_bill_lines as _bf_filter_bills_lines
 
 
 import argparse
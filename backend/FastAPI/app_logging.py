@@ -0,0 +1,200 @@
+"""
+app_logging.py
+----------------------------------------------------------
+FastAPI 서버용 구조화 로깅 (print 디버깅 대체).
+
+- 레벨: 환경변수 LOG_LEVEL (기본 INFO). 운영은 INFO → 행 단위/샘플 출력(DEBUG)은 나가지 않는다.
+- 비동기 출력: 요청 스레드는 QueueHandler 에 넣기만 하고, 실제 stdout 쓰기는
+  QueueListener 스레드가 담당 (콘솔 I/O 가 응답 지연에 더해지지 않도록).
+- 포맷: LOG_FORMAT=json (기본) | text
+    {"ts": "...", "level": "INFO", "logger": "klegisight.main", "msg": "...", "request_id": "a1b2...", ...}
+- 요청 상관관계: RequestContextMiddleware 가 X-Request-ID 를 받거나 새로 만들어
+  모든 로그 레코드와 응답 헤더에 붙인다.
+- DEBUG 샘플링: LOG_DEBUG_SAMPLE (0~1, 기본 1.0). DEBUG 레벨일 때도 요청 단위로
+  이 비율만큼만 DEBUG 로그를 남긴다 (한 요청의 DEBUG 로그는 전부 남거나 전부 빠짐).
+
+사용
+    from app_logging import get_logger
+    log = get_logger(__name__)
+    log.debug("rows count = %d", len(rows))          # 비활성 레벨이면 포맷팅 비용도 없음
+    log.warning("party_total_score 조회 실패: %s", e)
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import random
+import logging
+import contextvars
+import logging.handlers
+from datetime import datetime, timezone
+from typing import Optional
+
+ROOT_LOGGER = "klegisight"
+REQUEST_ID_HEADER = b"x-request-id"
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+_debug_sampled_var: contextvars.ContextVar[bool] = contextvars.ContextVar("debug_sampled", default=True)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_debug_sample_rate = 1.0
+
+# LogRecord 기본 속성 (그 외 extra= 로 넘긴 값만 JSON 필드로 출력)
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+def get_logger(name: str) -> logging.Logger:
+    if name == "__main__" or not name:
+        name = "main"
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+# ======================================================================
+# 필터 / 포맷터
+# ======================================================================
+class RequestContextFilter(logging.Filter):
+    """request_id 를 레코드에 붙이고, 샘플에서 빠진 요청의 DEBUG 레코드는 버린다."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        if record.levelno <= logging.DEBUG and not _debug_sampled_var.get():
+            return False
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            out["request_id"] = record.request_id
+        for k, v in record.__dict__.items():
+            if k not in _RESERVED and not k.startswith("_"):
+                out[k] = v
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not getattr(record, "request_id", None):
+            record.request_id = "-"
+        return super().format(record)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    기본 QueueHandler 는 traceback 을 msg 문자열에 이어 붙이므로,
+    메시지와 traceback 을 따로 보관해 JSON 의 msg / exc 필드로 나눠 출력한다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        msg = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg, record.args, record.message = msg, None, msg
+        record.exc_info = None
+        return record
+
+
+# ======================================================================
+# 설정 / 종료
+# ======================================================================
+def setup_logging(level: Optional[str] = None, fmt: Optional[str] = None,
+                  debug_sample: Optional[float] = None) -> logging.Logger:
+    """
+    klegisight.* 로거를 QueueHandler → QueueListener(stdout) 로 구성.
+    여러 번 불러도 한 번만 설정된다 (uvicorn --reload 등).
+    """
+    global _listener, _debug_sample_rate
+
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    fmt = (fmt or os.getenv("LOG_FORMAT", "json")).lower()
+    if debug_sample is None:
+        debug_sample = float(os.getenv("LOG_DEBUG_SAMPLE", "1.0"))
+    _debug_sample_rate = max(0.0, min(1.0, debug_sample))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.propagate = False
+    if _listener is not None:
+        return root
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    q: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    qh = _QueueHandler(q)
+    # 필터는 요청 컨텍스트가 살아 있는 호출 스레드 쪽(QueueHandler)에서 적용해야 함
+    qh.addFilter(RequestContextFilter())
+    root.handlers[:] = [qh]
+
+    _listener = logging.handlers.QueueListener(q, stream, respect_handler_level=False)
+    _listener.start()
+    return root
+
+
+def shutdown_logging():
+    """
+    남은 레코드를 모두 내보내고 리스너 스레드 종료 (lifespan 종료 시).
+    이후 레코드는 stdout 에 바로 쓴다 (큐에 쌓이기만 하고 사라지지 않도록).
+    다시 setup_logging() 을 부르면 큐 구성으로 돌아간다.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        root = logging.getLogger(ROOT_LOGGER)
+        root.handlers[:] = list(_listener.handlers)
+        for h in root.handlers:
+            h.addFilter(RequestContextFilter())
+        _listener = None
+
+
+# ======================================================================
+# 요청 ID / 샘플링 미들웨어 (순수 ASGI)
+# ======================================================================
+class RequestContextMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.access_log = get_logger("access")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        rid = headers.get(REQUEST_ID_HEADER, b"").decode("latin-1")[:64] or uuid.uuid4().hex[:16]
+        t_rid = request_id_var.set(rid)
+        t_smp = _debug_sampled_var.set(_debug_sample_rate >= 1.0 or random.random() < _debug_sample_rate)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers") or []) + [(REQUEST_ID_HEADER, rid.encode("latin-1"))]
+            await send(message)
+
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.access_log.info(
+                "%s %s %d", scope.get("method"), scope.get("path"), status["code"],
+                extra={"status": status["code"], "duration_ms": round((time.perf_counter() - t0) * 1000, 2)},
+            )
+            request_id_var.reset(t_rid)
+            _debug_sampled_var.reset(t_smp)
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_api.py
+----------------------------------------------------------
+FastAPI 앱을 인메모리 Supabase(fake_supabase.py) 위에 띄워 라우트별 처리량/지연을 측정한다.
+네트워크 / 실제 Supabase 프로젝트 없이 재현 가능한 성능 기준선을 만드는 용도.
+
+데이터
+  - data/assembly.dimension.json      → dimension / parties / parties_history / committees_history
+  - data/speeches_meeting_50242.json  → speeches / bills (안건 문자열에서 법안 추출)
+  - 파생 테이블(member_bill_stats, bill_*_score, party_*, committee_*)은 speeches 로부터 집계
+  - --scales 1,10,100 : speeches/bills 와 파생 테이블을 배수만큼 복제
+    (회차마다 meeting_id·bill_id 를 새로 매기고 발언자를 다른 의원으로 돌려 배정).
+    의원·정당·위원회 수는 실제 규모 그대로 둔다.
+
+측정
+  - 라우트마다 warmup 후 --requests 회 호출 → req/s, p50/p95/p99, 평균 응답 크기, 상태코드 분포
+    (2xx 가 아닌 응답이 섞인 라우트는 ⚠ 표시 + non_2xx_routes, --strict 면 종료 코드 1)
+  - query_trace 통계로 요청당 Supabase 쿼리 수도 함께 기록
+  - --concurrency N : 스레드 N 개가 각자 TestClient 로 동시에 호출
+  - 외부 서비스가 필요한 라우트(OpenAI 임베딩)는 건너뛰고 목록에 남긴다.
+
+사용
+    python bench_api.py                               # 1x/10x/100x 전체 라우트
+    python bench_api.py --scales 1,10 --requests 50 --routes legislators --json bench_api.json
+    python bench_api.py --latency 0.02                # .execute() 당 20ms 왕복 지연 가정
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+# 앱 import 전에 환경 고정 (벤치 중 로그 출력 억제 / OpenAI 클라이언트 생성용 더미 키
+# / 벤치 토큰을 jwt_verify 가 로컬 검증하도록 서명 키 고정)
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("OPENAI_API_KEY", "bench-offline")
+from fake_supabase import BENCH_JWT_SECRET
+os.environ["SUPABASE_JWT_SECRET"] = BENCH_JWT_SECRET
+
+import pandas as pd
+
+from build_party_summary import build_party_summary
+
+HERE = Path(__file__).resolve().parent
+DATA_DIR = HERE.parent.parent / "data"
+DIMENSION_JSON = DATA_DIR / "assembly.dimension.json"
+SPEECHES_JSON = DATA_DIR / "speeches_meeting_50242.json"
+
+BASE_MEETING_ID = 50242
+BASE_BILL_ID = 2100001
+SYNTH_MEMBER_ID = 8000   # 발언 데이터와 이름이 안 맞는 의원에게 부여할 id 시작값
+
+COMMITTEES = [
+    "법제사법위원회", "정무위원회", "기획재정위원회", "교육위원회",
+    "과학기술정보방송통신위원회", "외교통일위원회", "국방위원회", "행정안전위원회",
+    "문화체육관광위원회", "농림축산식품해양수산위원회", "산업통상자원중소벤처기업위원회",
+    "보건복지위원회", "환경노동위원회", "국토교통위원회", "정보위원회", "여성가족위원회",
+]
+
+# 외부 서비스가 있어야 하는 라우트 (오프라인 벤치 대상 아님)
+SKIP_ROUTES = {
+    ("POST", "/api/predict/bill-pass"): "OpenAI 임베딩 호출",
+}
+INTERNAL_ROUTES = {"/metrics", "/api/debug/query-stats", "/api/debug/search-index"}
+
+_RE_AGENDA_NO = re.compile(r"^\s*\d+\.\s*")
+_RE_PROPOSER = re.compile(r"\(([^()]+?)\s*의원\s*(?:등\s*\d+인\s*)?대표\s*발의\)")
+_RE_TRAILING_PAREN = re.compile(r"\(.*$")
+
+
+# ======================================================================
+# 데이터셋 생성
+# ======================================================================
+def _last_part(v):
+    if not v:
+        return None
+    parts = [p for p in str(v).split("/") if p.strip()]
+    return parts[-1].strip() if parts else None
+
+
+def _birth_date(v):
+    try:
+        ms = int(v["$date"]["$numberLong"])
+        return (datetime(1970, 1, 1) + timedelta(milliseconds=ms)).date().isoformat()
+    except Exception:
+        return None
+
+
+def _stance(score):
+    if score >= 0.05:
+        return "협력"
+    if score <= -0.05:
+        return "비협력"
+    return "중립"
+
+
+def _bayesian(mean, n, prior, k=5):
+    return (mean * n + prior * k) / (n + k)
+
+
+def build_dataset(scale: int = 1, seed: int = 42):
+    """
+    {테이블명: [행 dict]} 과 라우트 파라미터용 샘플(meta) 을 돌려준다.
+    scale 배로 발언/법안과 모든 파생 집계 테이블이 커진다.
+    """
+    rng = random.Random(seed)
+    dim_raw = json.loads(DIMENSION_JSON.read_text(encoding="utf-8"))
+    speeches_raw = json.loads(SPEECHES_JSON.read_text(encoding="utf-8"))
+
+    # --- 위원회 / 정당 ---
+    committees = [{"committee_id": i, "committee": name} for i, name in enumerate(COMMITTEES, start=1)]
+    party_names = sorted({_last_part(d.get("party_id")) for d in dim_raw} - {None})
+    parties = [{"party_id": i, "party_name": name} for i, name in enumerate(party_names, start=1)]
+    party_id_of = {p["party_name"]: p["party_id"] for p in parties}
+
+    # --- 의원 (발언자 이름이 맞으면 발언 데이터의 member_id 사용) ---
+    speaker_ids = {}
+    for s in speeches_raw:
+        mid = str(s.get("member_id") or "").strip()
+        if mid.isdigit():
+            # "소위원장 백혜련" / "김종민 위원" → 직함 제거
+            names = [t for t in str(s.get("member_name", "")).split() if not t.endswith(("위원", "위원장"))]
+            speaker_ids[names[-1] if names else mid] = int(mid)
+
+    # 이름이 dimension 에 없는 발언자는 매칭 안 된 의원 자리를 이어받는다
+    dim_names = {(d.get("members") or {}).get("name") for d in dim_raw}
+    leftover = [(n, i) for n, i in speaker_ids.items() if n not in dim_names]
+
+    dimension, parties_history, committees_history = [], [], []
+    next_id = SYNTH_MEMBER_ID
+    for d in dim_raw:
+        m = d.get("members") or {}
+        name = m.get("name")
+        if name in speaker_ids:
+            member_id = speaker_ids.pop(name)
+        elif leftover:
+            name, member_id = leftover.pop()
+        else:
+            member_id, next_id = next_id, next_id + 1
+        party = _last_part(d.get("party_id"))
+        district = _last_part(m.get("district")) or "비례대표"
+        committee_id = rng.randint(1, len(COMMITTEES))
+        dimension.append({
+            "member_id": member_id, "name": name, "party": party, "party_id": party_id_of.get(party),
+            "committee_id": committee_id, "district": district, "gender": m.get("gender"),
+            "elected_time": rng.choice([1, 1, 1, 2, 2, 3, 4, 5]),
+            "elected_type": "비례대표" if district == "비례대표" else "지역구",
+            "birth_date": _birth_date(m.get("birthyear")),
+        })
+        history_parties = [_last_part(p) for p in str(d.get("party_id") or "").split("/") if p.strip()] or [party]
+        for k, p in enumerate(dict.fromkeys(history_parties)):
+            parties_history.append({
+                "number": len(parties_history) + 1, "member_id": member_id, "party_name": p,
+                "party_id": party_id_of.get(p), "start_date": f"{2020 + k * 2}-05-30", "end_date": None,
+            })
+        for k in range(rng.randint(1, 3)):
+            cid = committee_id if k == 0 else rng.randint(1, len(COMMITTEES))
+            committees_history.append({
+                "number": len(committees_history) + 1, "member_id": member_id, "committee_id": cid,
+                "committee": COMMITTEES[cid - 1], "start_date": f"{2020 + k}-06-15", "end_date": f"{2021 + k}-06-14",
+            })
+    member_ids = [d["member_id"] for d in dimension]
+    member_by_id = {d["member_id"]: d for d in dimension}
+    base_speakers = sorted({int(s["member_id"]) for s in speeches_raw if str(s.get("member_id", "")).strip().isdigit()})
+
+    # --- 발언 / 법안 (scale 회 복제) ---
+    speeches, bills, meetings = [], [], []
+    next_bill = BASE_BILL_ID
+    for r in range(scale):
+        meeting_id = BASE_MEETING_ID + r
+        committee = COMMITTEES[r % len(COMMITTEES)]
+        meeting_date = (date(2020, 11, 2) + timedelta(days=r * 3)).isoformat()
+        meetings.append({"meeting_id": meeting_id, "meeting_category": committee, "meeting_date": meeting_date})
+        # 회차마다 발언자를 다른 의원으로 순환 배정 (1회차는 원본 그대로)
+        offset = r * len(base_speakers)
+        speaker_map = {sid: (sid if r == 0 else member_ids[(member_ids.index(sid) + offset) % len(member_ids)])
+                       for sid in base_speakers}
+        agenda_ids = {}
+        for s in speeches_raw:
+            agenda = s.get("bills") or ""
+            if agenda not in agenda_ids:
+                ids = []
+                for line in agenda.split("\n"):
+                    if not _RE_AGENDA_NO.match(line):
+                        continue
+                    title = _RE_AGENDA_NO.sub("", line).strip()
+                    pm = _RE_PROPOSER.search(title)
+                    bills.append({
+                        "bill_id": next_bill, "bill_name": _RE_TRAILING_PAREN.sub("", title).strip(),
+                        "proposer_name": pm.group(1).strip() if pm else "정부",
+                        "proposer_type": "의원" if pm else "정부",
+                        "proposer_date": meeting_date, "committee": committee,
+                        "status": rng.choice(["원안가결", "수정가결", "대안반영폐기", "임기만료폐기"]),
+                        "result": None, "pass_date": None,
+                    })
+                    ids.append(next_bill)
+                    next_bill += 1
+                agenda_ids[agenda] = ids
+            raw_mid = str(s.get("member_id", "")).strip()
+            mid = speaker_map.get(int(raw_mid)) if raw_mid.isdigit() else None
+            p_coop, p_non = rng.random(), rng.random()
+            total = p_coop + p_non + rng.random() + 1e-9
+            p_coop, p_non = p_coop / total, p_non / total
+            score = p_coop - p_non
+            text = s.get("speech_text") or ""
+            speeches.append({
+                "speech_id": len(speeches) + 1,
+                "meeting_id": meeting_id, "member_id": mid,
+                "member_name": member_by_id[mid]["name"] if mid in member_by_id and r else s.get("member_name"),
+                "speech_order": s.get("speech_order"), "speech_text": text, "bills": agenda,
+                "bill_numbers": str([str(b) for b in agenda_ids[agenda]]),
+                "speech_length": len(text), "prob_coop": p_coop, "prob_noncoop": p_non,
+                "prob_neutral": 1 - p_coop - p_non, "score_prob": score, "sentiment_label": _stance(score),
+                "committee": committee,
+            })
+
+    tables = {
+        "committees": committees, "parties": parties, "dimension": dimension,
+        "parties_history": parties_history, "committees_history": committees_history,
+        "speeches": [{k: v for k, v in s.items() if k != "committee"} for s in speeches],
+        "bills": bills, "meetings": meetings,
+    }
+    tables.update(_derived_tables(speeches, bills, member_by_id))
+    tables["party_summary"] = build_party_summary(tables)
+    tables.update(_user_tables(scale, rng))
+
+    top_speakers = (pd.Series([s["member_id"] for s in speeches if s["member_id"] is not None])
+                    .value_counts().index[:5].tolist())
+    meta = {
+        "scale": scale,
+        "members": [int(m) for m in top_speakers],
+        "member_names": [member_by_id[m]["name"] for m in top_speakers],
+        "bill_ids": [b["bill_id"] for b in bills[:5]],
+        "bill_keyword": "일부개정",
+        "party_ids": [p["party_id"] for p in parties if any(r["party_name"] == p["party_name"]
+                                                           for r in tables["party_total_score"])][:3],
+        "committee_ids": sorted({COMMITTEES.index(c["committee"]) + 1 for c in tables["committee_total_score"]})[:3],
+    }
+    return tables, meta
+
+
+def _derived_tables(speeches, bills, member_by_id):
+    """speeches 로부터 서비스가 읽는 집계 테이블을 만든다 (값의 정확성보다 모양/행 수가 목적)."""
+    df = pd.DataFrame(speeches)
+    df = df[df["member_id"].notna()].copy()
+    df["member_id"] = df["member_id"].astype(int)
+    df["party_name"] = df["member_id"].map(lambda m: member_by_id[m]["party"])
+    df["bill_id"] = df["bill_numbers"].map(lambda v: [int(x) for x in re.findall(r"\d+", v)])
+    ex = df.explode("bill_id").dropna(subset=["bill_id"])
+    ex["bill_id"] = ex["bill_id"].astype(int)
+    bill_name = {b["bill_id"]: b["bill_name"] for b in bills}
+    prior = float(df["score_prob"].mean()) if len(df) else 0.0
+
+    mb = ex.groupby(["member_id", "bill_id"]).agg(
+        member_name=("member_name", "first"), party_name=("party_name", "first"),
+        n_speeches=("speech_id", "count"), total_len=("speech_length", "sum"),
+        avg_len=("speech_length", "mean"), score=("score_prob", "mean"),
+    ).reset_index()
+    member_bill_stats = [{
+        "member_id": r.member_id, "member_name": r.member_name, "bill_id": str(r.bill_id),
+        "n_speeches": int(r.n_speeches), "total_speech_length_bill": int(r.total_len),
+        "avg_speech_length_bill": float(r.avg_len), "score_prob_mean": float(r.score), "stance": _stance(r.score),
+    } for r in mb.itertuples()]
+    bill_member_score = [{
+        "bill_number": str(r.bill_id), "member_id": r.member_id, "member_name": r.member_name,
+        "party_name": r.party_name, "speech_count": int(r.n_speeches), "avg_score_prob": float(r.score),
+        "bayesian_score": _bayesian(r.score, r.n_speeches, prior), "adjusted_stance": _stance(r.score - prior),
+    } for r in mb.itertuples()]
+
+    pb = ex.groupby(["bill_id", "party_name"]).agg(n=("speech_id", "count"), score=("score_prob", "mean")).reset_index()
+    bill_party_score = [{
+        "bill_number": str(r.bill_id), "party_name": r.party_name, "speech_count": int(r.n),
+        "avg_score_prob": float(r.score), "bayesian_score": _bayesian(r.score, r.n, prior),
+        "original_stance": _stance(r.score),
+    } for r in pb.itertuples()]
+    party_bill_ranking = [{
+        "party_name": r.party_name, "bill_number": str(r.bill_id), "bill_name": bill_name.get(r.bill_id),
+        "speech_count": int(r.n), "bayesian_score": _bayesian(r.score, r.n, prior),
+    } for r in pb.itertuples()]
+
+    bd = ex.groupby("bill_id").agg(n=("speech_id", "count"), score=("score_prob", "mean")).reset_index()
+    bill_detail_score = [{
+        "bill_number": str(r.bill_id), "total_speeches": int(r.n), "avg_score_prob": float(r.score),
+        "bayesian_score": _bayesian(r.score, r.n, prior),
+    } for r in bd.itertuples()]
+
+    pm = df.groupby(["party_name", "member_id"]).agg(
+        member_name=("member_name", "first"), n=("speech_id", "count"), score=("score_prob", "mean"),
+    ).reset_index()
+    party_member_ranking_unique = [{
+        "party_name": r.party_name, "member_id": r.member_id, "member_name": r.member_name,
+        "speech_count": int(r.n), "avg_score_prob": float(r.score), "bayesian_score": _bayesian(r.score, r.n, prior),
+    } for r in pm.itertuples()]
+    member_stats = [{
+        "member_id": r.member_id, "member_name": r.member_name, "total_speeches": int(r.n),
+        "cooperation_score_prob": float(r.score), "controversy_rate": 0.0,
+    } for r in pm.itertuples()]
+
+    pt = df.groupby("party_name").agg(n=("speech_id", "count"), members=("member_id", "nunique"),
+                                      total=("score_prob", "sum"), score=("score_prob", "mean")).reset_index()
+    party_total_score = [{
+        "party_name": r.party_name, "total_speeches": int(r.n), "total_score": float(r.total),
+        "avg_score_prob": float(r.score), "n_members": int(r.members), "baseline_score": prior,
+        "original_stance": _stance(r.score), "adjusted_stance": _stance(r.score - prior),
+        "adjusted_score_prob": float(r.score - prior),
+    } for r in pt.itertuples()]
+
+    cm = df.groupby(["committee", "member_id"]).agg(
+        member_name=("member_name", "first"), n=("speech_id", "count"),
+        total_len=("speech_length", "sum"), avg_len=("speech_length", "mean"),
+    ).reset_index()
+    cm["rank"] = cm.groupby("committee")["n"].rank(ascending=False, method="first").astype(int)
+    committee_member_ranking = [{
+        "committee": r.committee, "member_id": r.member_id, "member_name": r.member_name,
+        "speech_count": int(r.n), "total_speech_length": int(r.total_len), "avg_speech_length": float(r.avg_len),
+        "activity_score": float(r.n), "rank_in_committee": int(r.rank),
+    } for r in cm.itertuples()]
+
+    cb = ex.groupby(["committee", "bill_id"]).agg(
+        n=("speech_id", "count"), total_len=("speech_length", "sum"), avg_len=("speech_length", "mean"),
+    ).reset_index()
+    cb["rank"] = cb.groupby("committee")["n"].rank(ascending=False, method="first").astype(int)
+    committee_bill_ranking = [{
+        "committee": r.committee, "bill_number": str(r.bill_id), "bill_name": bill_name.get(r.bill_id),
+        "speech_count": int(r.n), "total_speech_length": int(r.total_len), "avg_speech_length": float(r.avg_len),
+        "bill_activity_score": float(r.n), "rank_in_committee": int(r.rank),
+    } for r in cb.itertuples()]
+
+    ct = df.groupby("committee").agg(score=("score_prob", "mean"), n=("speech_id", "count")).reset_index()
+    committee_total_score = [{
+        "committee": r.committee, "bayesian_score": _bayesian(r.score, r.n, prior),
+        "adjusted_stance": _stance(r.score - prior),
+    } for r in ct.itertuples()]
+
+    return {
+        "member_bill_stats": member_bill_stats, "bill_member_score": bill_member_score,
+        "bill_party_score": bill_party_score, "bill_detail_score": bill_detail_score,
+        "party_bill_ranking": party_bill_ranking, "party_member_ranking_unique": party_member_ranking_unique,
+        "party_total_score": party_total_score, "member_stats": member_stats,
+        "committee_member_ranking": committee_member_ranking, "committee_bill_ranking": committee_bill_ranking,
+        "committee_total_score": committee_total_score,
+    }
+
+
+def _user_tables(scale: int, rng: random.Random):
+    from fake_supabase import BENCH_USER_ID
+    now = datetime.now(timezone.utc)
+    logs = [{
+        "id": i + 1, "user_id": BENCH_USER_ID, "activity_type": rng.choice(["search", "view_bill", "view_person"]),
+        "target_name": f"target-{i}", "details": None, "created_at": (now - timedelta(minutes=i)).isoformat(),
+    } for i in range(50 * scale)]
+    bookmarks = [{
+        "id": i + 1, "user_id": BENCH_USER_ID, "item_type": "bill", "item_id": str(BASE_BILL_ID + i),
+        "title": f"bill-{i}", "score": 0.0, "status": "Tracking", "created_at": (now - timedelta(hours=i)).isoformat(),
+    } for i in range(5 * scale)]
+    return {"user_logs": logs, "user_bookmarks": bookmarks}
+
+
+# ======================================================================
+# 라우트 목록
+# ======================================================================
+def route_cases(meta: dict):
+    """(라벨, method, path 템플릿, 요청 kwargs 생성기) — 생성기는 호출 번호 i 를 받아 파라미터를 돌려가며 쓴다."""
+    from fake_supabase import BENCH_TOKEN
+    auth = {"Authorization": f"Bearer {BENCH_TOKEN}"}
+    members, names = meta["members"], meta["member_names"]
+    bills, parties, committees = meta["bill_ids"], meta["party_ids"] or [1], meta["committee_ids"] or [1]
+
+    def pick(seq, i):
+        return seq[i % len(seq)]
+
+    return [
+        ("GET", "/", lambda i: ("/", {})),
+        ("GET", "/api/dashboard-stats", lambda i: ("/api/dashboard-stats", {})),
+        ("GET", "/api/legislators", lambda i: ("/api/legislators", {})),
+        ("GET", "/api/filters", lambda i: ("/api/filters", {})),
+        ("GET", "/api/parties/summary", lambda i: ("/api/parties/summary", {})),
+        ("GET", "/api/parties/{party_id}/summary", lambda i: (f"/api/parties/{pick(parties, i)}/summary", {})),
+        ("GET", "/api/parties/total-score", lambda i: ("/api/parties/total-score", {})),
+        ("GET", "/api/parties/member-ranking", lambda i: ("/api/parties/member-ranking", {})),
+        ("GET", "/api/parties/bill-ranking", lambda i: ("/api/parties/bill-ranking", {})),
+        ("POST", "/api/search", lambda i: ("/api/search", {"json": {"query": pick(names, i)}})),
+        ("GET", "/api/legislators/{member_id}/bills", lambda i: (f"/api/legislators/{pick(members, i)}/bills", {})),
+        ("GET", "/api/speeches", lambda i: ("/api/speeches", {"params": {"member_id": pick(members, i)}})),
+        ("GET", "/api/build_stat/{member_id}", lambda i: (f"/api/build_stat/{pick(members, i)}", {})),
+        ("GET", "/api/member_bill_stat/{member_id}", lambda i: (f"/api/member_bill_stat/{pick(members, i)}", {})),
+        ("GET", "/api/legislators/{member_id}/detail", lambda i: (f"/api/legislators/{pick(members, i)}/detail", {})),
+        ("GET", "/api/legislators/{member_id}/committees_history",
+         lambda i: (f"/api/legislators/{pick(members, i)}/committees_history", {})),
+        ("GET", "/api/legislators/{member_id}/bills/{bill_id}/speeches",
+         lambda i: (f"/api/legislators/{pick(members, i)}/bills/{pick(bills, i)}/speeches", {})),
+        ("POST", "/register", lambda i: ("/register", {"json": {
+            "email": f"bench{i}@example.com", "username": f"bench{i}", "password": "pw"}})),
+        ("POST", "/token", lambda i: ("/token", {"json": {"email": "bench@example.com", "password": "pw"}})),
+        ("POST", "/sentiment", lambda i: ("/sentiment", {"json": {"speech_text": "협력"}, "headers": auth})),
+        ("POST", "/prediction", lambda i: ("/prediction", {"json": {"speech_text": "협력"}, "headers": auth})),
+        ("GET", "/api/unified-search", lambda i: ("/api/unified-search", {"params": {"query": meta["bill_keyword"]}})),
+        ("GET", "/api/suggest", lambda i: ("/api/suggest", {"params": {"q": ("ㅇㅂ", "김", "일부")[i % 3]}})),
+        ("POST", "/api/bills/analysis", lambda i: ("/api/bills/analysis", {"json": {"bill_name": meta["bill_keyword"]}})),
+        ("GET", "/api/public-table-previews", lambda i: ("/api/public-table-previews", {})),
+        ("GET", "/api/committee-summary/{committee_id}",
+         lambda i: (f"/api/committee-summary/{pick(committees, i)}", {})),
+        ("GET", "/api/dashboard/me", lambda i: ("/api/dashboard/me", {"headers": auth})),
+        ("POST", "/api/log/activity", lambda i: ("/api/log/activity", {
+            "json": {"activity_type": "search", "target_name": "bench"}, "headers": auth})),
+        ("POST", "/api/bookmark", lambda i: ("/api/bookmark", {"json": {
+            "item_type": "bill", "item_id": str(pick(bills, i)), "title": "bench"}, "headers": auth})),
+    ]
+
+
+def uncovered_routes(app, cases):
+    covered = {(m, p) for m, p, _ in cases}
+    out = []
+    for r in app.routes:
+        for m in sorted(getattr(r, "methods", None) or []):
+            if m in ("HEAD", "OPTIONS") or r.path in INTERNAL_ROUTES or r.path.startswith(("/docs", "/redoc", "/openapi")):
+                continue
+            if (m, r.path) not in covered:
+                out.append({"route": f"{m} {r.path}", "reason": SKIP_ROUTES.get((m, r.path), "벤치 케이스 없음")})
+    return out
+
+
+# ======================================================================
+# 측정
+# ======================================================================
+def _pct(sorted_vals, q):
+    if not sorted_vals:
+        return None
+    k = min(len(sorted_vals) - 1, max(0, int(round(q / 100 * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+
+def bench_route(app, method, make, n, warmup, concurrency):
+    from fastapi.testclient import TestClient
+
+    def worker(indices):
+        lat, sizes, statuses = [], [], {}
+        with TestClient(app, raise_server_exceptions=False) as client:
+            for i in indices:
+                path, kw = make(i)
+                t0 = time.perf_counter()
+                resp = client.request(method, path, **kw)
+                lat.append(time.perf_counter() - t0)
+                sizes.append(len(resp.content))
+                statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+        return lat, sizes, statuses
+
+    worker(range(warmup))
+    chunks = [range(w, n, concurrency) for w in range(concurrency)]
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        results = list(ex.map(worker, chunks))
+    wall = time.perf_counter() - t0
+
+    lat = sorted(x for r in results for x in r[0])
+    sizes = [x for r in results for x in r[1]]
+    statuses = {}
+    for r in results:
+        for k, v in r[2].items():
+            statuses[str(k)] = statuses.get(str(k), 0) + v
+    return {
+        "requests": len(lat),
+        "rps": round(len(lat) / wall, 1) if wall else None,
+        "mean_ms": round(statistics.fmean(lat) * 1000, 2),
+        "p50_ms": round(_pct(lat, 50) * 1000, 2),
+        "p95_ms": round(_pct(lat, 95) * 1000, 2),
+        "p99_ms": round(_pct(lat, 99) * 1000, 2),
+        "avg_bytes": int(statistics.fmean(sizes)),
+        "status": statuses,
+        # 2xx 가 아닌 응답 수 — 0 이 아니면 그 라우트의 지연은 오류 경로를 잰 것
+        "non_2xx": sum(v for k, v in statuses.items() if not k.startswith("2")),
+    }
+
+
+def run_scale(app, scale, args):
+    import database
+    import query_trace
+    import search_index
+    from fake_supabase import FakeSupabase
+
+    t0 = time.perf_counter()
+    tables, meta = build_dataset(scale, seed=args.seed)
+    fake = FakeSupabase(tables, latency=args.latency)
+    database.supabase._client = fake
+    search_index.invalidate()
+    build_s = time.perf_counter() - t0
+
+    cases = [c for c in route_cases(meta) if not args.routes or any(s in c[1] for s in args.routes)]
+    rows = {}
+    for method, path, make in cases:
+        query_trace.reset_stats()
+        res = bench_route(app, method, make, args.requests, args.warmup, args.concurrency)
+        qs = query_trace.stats()["routes"]
+        res["avg_queries"] = qs[0]["avg_queries"] if qs else 0
+        rows[f"{method} {path}"] = res
+        print(f"  [{scale:>4}x] {method:<4} {path:<55} {res['rps']:>8} req/s  "
+              f"p50 {res['p50_ms']:>8}  p95 {res['p95_ms']:>8}  p99 {res['p99_ms']:>8} ms  "
+              f"q/req {res['avg_queries']:<5} {res['status']}"
+              f"{'  ⚠ non-2xx' if res['non_2xx'] else ''}", file=sys.stderr)
+    return {"dataset_seconds": round(build_s, 2), "rows": fake.row_counts(), "routes": rows,
+            "skipped": uncovered_routes(app, cases) if not args.routes else []}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="FastAPI 라우트 오프라인 벤치마크 (인메모리 Supabase)")
+    ap.add_argument("--scales", type=str, default="1,10,100", help="데이터 배수 목록 (쉼표 구분)")
+    ap.add_argument("--requests", type=int, default=100, help="라우트당 측정 요청 수")
+    ap.add_argument("--warmup", type=int, default=5, help="라우트당 워밍업 요청 수")
+    ap.add_argument("--concurrency", type=int, default=1, help="동시 요청 스레드 수")
+    ap.add_argument("--latency", type=float, default=0.0, help=".execute() 당 가정 왕복 지연(초)")
+    ap.add_argument("--routes", type=str, default=None, help="경로에 이 문자열이 들어간 라우트만 (쉼표 구분)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--json", type=str, default=None, help="결과 JSON 저장 경로")
+    ap.add_argument("--strict", action="store_true", help="2xx 가 아닌 응답이 있는 라우트가 있으면 종료 코드 1")
+    args = ap.parse_args()
+    args.routes = [s.strip() for s in args.routes.split(",")] if args.routes else None
+
+    sys.path.insert(0, str(HERE))
+    import main as app_main
+
+    report = {"config": vars(args), "scales": {}}
+    for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+        report["scales"][str(scale)] = run_scale(app_main.app, scale, args)
+
+    failing = sorted({
+        route for res in report["scales"].values() for route, r in res["routes"].items() if r["non_2xx"]
+    })
+    report["non_2xx_routes"] = failing
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if failing:
+        print(f"⚠ 2xx 가 아닌 응답이 있는 라우트 ({len(failing)}개, 지연은 오류 경로 기준): {', '.join(failing)}",
+              file=sys.stderr)
+        if args.strict:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
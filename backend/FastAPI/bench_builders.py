@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_builders.py
+----------------------------------------------------------
+집계 빌더(build_*.py)의 규모별 실행 시간 / 메모리를 측정하는 마이크로 벤치마크.
+
+대상
+  - member_stats          : build_member_stats(df)              (speeches DataFrame)
+  - party_bill_ranking    : build_party_bill_ranking(tables)    (member_bill_stats + dimension)
+  - party_member_ranking  : build_party_member_ranking(tables)  (speeches + dimension)
+  - party_total_score     : build_party_total_score(tables)     (speeches + dimension)
+
+측정 방식
+  - (빌더, 발언 수) 조합마다 새 프로세스(spawn)에서 합성 데이터를 만들고 빌더를 한 번 실행
+    → 앞선 측정의 메모리/캐시가 섞이지 않는다.
+  - wall_s          : 빌더 호출 시간 (입력 생성/변환 제외)
+  - rss_before_mb   : 빌더 호출 직전 RSS (입력 데이터 포함)
+  - peak_rss_mb     : 빌더 실행 중 RSS 최댓값 (/proc 샘플링, 없으면 ru_maxrss)
+  - builder_peak_mb : peak_rss_mb - rss_before_mb (빌더가 추가로 쓴 메모리)
+  - 메모리 부족 / 예외는 error 로 기록하고 다음 조합으로 넘어간다.
+
+합성 데이터
+  - --members / --parties / --bills-per-speech(평균, 포아송) / --text-length
+  - 발언 본문은 서로 다른 256개 문장을 돌려 쓴다 (1천만 건에서 본문만 수 GB 가 되는 것 방지).
+  - 입력 형태는 서비스와 같다: tables 빌더는 Supabase 응답처럼 list[dict] 를 받는다.
+
+결과 JSON 에는 git 커밋 / 파이썬·pandas 버전이 함께 남아 커밋 간 추이 비교에 쓴다.
+
+사용
+    python bench_builders.py --sizes 10000,100000 --json bench_builders.json
+    python bench_builders.py --builders party_total_score --sizes 1000000,10000000
+    python bench_builders.py --sizes 100000 --compare bench_builders.json   # 이전 결과 대비 배율
+"""
+import os
+import sys
+import gc
+import json
+import time
+import platform
+import argparse
+import resource
+import threading
+import subprocess
+import multiprocessing as mp
+from datetime import datetime, timezone
+from pathlib import Path
+
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_SIZES = "10000,100000,1000000,10000000"
+BUILDERS = ["member_stats", "party_bill_ranking", "party_member_ranking", "party_total_score"]
+TEXT_POOL_SIZE = 256
+PARTY_NAMES = ["더불어민주당", "국민의힘", "정의당", "국민의당", "기본소득당", "시대전환", "무소속"]
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# ======================================================================
+# 메모리 측정
+# ======================================================================
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE / 1e6
+    except OSError:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1e6 if sys.platform == "darwin" else rss / 1024
+
+
+class _RssSampler(threading.Thread):
+    """빌더 실행 동안 RSS 를 주기적으로 읽어 최댓값을 기록."""
+
+    def __init__(self, interval: float = 0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = _rss_mb()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            self.peak = max(self.peak, _rss_mb())
+            self._done.wait(self.interval)
+
+    def stop(self) -> float:
+        self._done.set()
+        self.join()
+        self.peak = max(self.peak, _rss_mb())
+        return self.peak
+
+
+# ======================================================================
+# 합성 데이터
+# ======================================================================
+def generate_speeches(n: int, members: int = 300, bills_per_speech: float = 1.5,
+                      text_length: int = 200, seed: int = 0):
+    """speeches 테이블과 같은 컬럼의 DataFrame (member_id 는 1..members)."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    n_bills = max(100, n // 20)
+    member_id = rng.integers(1, members + 1, size=n)
+
+    probs = rng.dirichlet([2.0, 2.0, 4.0], size=n)
+    n_per = rng.poisson(bills_per_speech, size=n)
+    flat = rng.integers(0, n_bills, size=int(n_per.sum())) + 2100001
+    offsets = np.concatenate([[0], np.cumsum(n_per)])
+    flat_s = flat.astype(str).tolist()
+    bill_numbers = [str(flat_s[offsets[i]:offsets[i + 1]]) for i in range(n)]
+
+    syllables = [chr(c) for c in range(0xAC00, 0xAC00 + 400)]
+    pool = ["".join(rng.choice(syllables, size=text_length).tolist()) for _ in range(TEXT_POOL_SIZE)]
+    text = [pool[i % TEXT_POOL_SIZE] for i in range(n)]
+
+    return pd.DataFrame({
+        "speech_id": np.arange(1, n + 1),
+        "meeting_id": rng.integers(50000, 50000 + max(1, n // 1000), size=n),
+        "member_id": member_id,
+        "member_name": [f"의원{m}" for m in member_id.tolist()],
+        "speech_text": text,
+        "speech_length": rng.integers(max(1, text_length // 4), text_length * 4 + 1, size=n),
+        "bill_numbers": bill_numbers,
+        "prob_coop": probs[:, 0],
+        "prob_noncoop": probs[:, 1],
+        "prob_neutral": probs[:, 2],
+        "score_prob": probs[:, 0] - probs[:, 1],
+        "sentiment_label": probs.argmax(axis=1),
+    })
+
+
+def generate_dimension(members: int, parties: int, seed: int = 0) -> list:
+    import numpy as np
+    rng = np.random.default_rng(seed + 1)
+    names = PARTY_NAMES[:max(1, min(parties, len(PARTY_NAMES)))]
+    return [{"member_id": m, "name": f"의원{m}", "party": names[int(rng.integers(len(names)))]}
+            for m in range(1, members + 1)]
+
+
+def member_bill_stats_from(df) -> list:
+    """speeches → member_bill_stats 행 (build_party_bill_ranking 입력)."""
+    import ast
+    ex = df[["member_id", "member_name", "bill_numbers", "score_prob", "speech_length"]].copy()
+    ex["bill_id"] = ex["bill_numbers"].map(ast.literal_eval)
+    ex = ex.explode("bill_id").dropna(subset=["bill_id"])
+    agg = ex.groupby(["member_id", "member_name", "bill_id"], as_index=False).agg(
+        n_speeches=("score_prob", "size"),
+        total_speech_length_bill=("speech_length", "sum"),
+        avg_score_prob=("score_prob", "mean"),
+    )
+    return agg.to_dict("records")
+
+
+def _prepare(builder: str, n: int, opts: dict):
+    """(호출할 함수, 인자) — 입력 변환까지 여기서 끝내 측정 구간에서 뺀다."""
+    sys.path.insert(0, str(HERE))
+    df = generate_speeches(n, opts["members"], opts["bills_per_speech"], opts["text_length"], opts["seed"])
+    dimension = generate_dimension(opts["members"], opts["parties"], opts["seed"])
+
+    if builder == "member_stats":
+        from build_member_stats import build_member_stats
+        return build_member_stats, df
+    if builder == "party_bill_ranking":
+        from build_party_bill_ranking import build_party_bill_ranking
+        tables = {"member_bill_stats": member_bill_stats_from(df), "dimension": dimension}
+        return build_party_bill_ranking, tables
+    if builder == "party_member_ranking":
+        from build_party_member_ranking import build_party_member_ranking
+        return build_party_member_ranking, {"speeches": df.to_dict("records"), "dimension": dimension}
+    if builder == "party_total_score":
+        from build_party_total_score import build_party_total_score
+        return build_party_total_score, {"speeches": df.to_dict("records"), "dimension": dimension}
+    raise ValueError(f"unknown builder: {builder}")
+
+
+def _child(builder: str, n: int, opts: dict, conn):
+    try:
+        t0 = time.perf_counter()
+        fn, arg = _prepare(builder, n, opts)
+        prep_s = time.perf_counter() - t0
+        gc.collect()
+        before = _rss_mb()
+        sampler = _RssSampler()
+        sampler.start()
+        t0 = time.perf_counter()
+        out = fn(arg)
+        wall = time.perf_counter() - t0
+        peak = sampler.stop()
+        conn.send({
+            "wall_s": round(wall, 4),
+            "prepare_s": round(prep_s, 2),
+            "rss_before_mb": round(before, 1),
+            "peak_rss_mb": round(peak, 1),
+            "builder_peak_mb": round(peak - before, 1),
+            "output_rows": int(len(out)),
+        })
+    except MemoryError:
+        conn.send({"error": "MemoryError"})
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_case(builder: str, n: int, opts: dict, timeout: float) -> dict:
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    p = ctx.Process(target=_child, args=(builder, n, opts, child))
+    p.start()
+    child.close()
+    result = None
+    if parent.poll(timeout):
+        try:
+            result = parent.recv()
+        except EOFError:
+            result = None
+    p.join(5)
+    if p.is_alive():
+        p.kill()
+        p.join()
+        return result or {"error": f"timeout ({timeout:.0f}s)"}
+    if result is None:
+        # OOM killer 등으로 결과 없이 종료
+        return {"error": f"process exited with code {p.exitcode}"}
+    return result
+
+
+# ======================================================================
+# 결과 / 비교
+# ======================================================================
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def _environment() -> dict:
+    import numpy as np
+    import pandas as pd
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(report: dict, old: dict):
+    """같은 (빌더, 크기) 의 wall_s / builder_peak_mb 배율 (현재 / 이전) 출력."""
+    old_cases = {(c["builder"], c["speeches"]): c for c in old.get("cases", [])}
+    print(f"\n비교 대상: {old.get('env', {}).get('commit')} → {report['env']['commit']}", file=sys.stderr)
+    for c in report["cases"]:
+        o = old_cases.get((c["builder"], c["speeches"]))
+        if not o or "error" in c or "error" in o:
+            continue
+        t = c["wall_s"] / o["wall_s"] if o["wall_s"] else float("nan")
+        m = (c["builder_peak_mb"] / o["builder_peak_mb"]) if o["builder_peak_mb"] else float("nan")
+        print(f"  {c['builder']:<22} {c['speeches']:>10,}  time x{t:.2f}  mem x{m:.2f}", file=sys.stderr)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="집계 빌더 규모별 시간/메모리 벤치마크")
+    ap.add_argument("--sizes", type=str, default=DEFAULT_SIZES, help="발언 수 목록 (쉼표 구분)")
+    ap.add_argument("--builders", type=str, default=",".join(BUILDERS), help="측정할 빌더 (쉼표 구분)")
+    ap.add_argument("--members", type=int, default=300, help="의원 수")
+    ap.add_argument("--parties", type=int, default=6, help="정당 수")
+    ap.add_argument("--bills-per-speech", type=float, default=1.5, help="발언당 평균 법안 수")
+    ap.add_argument("--text-length", type=int, default=200, help="발언 본문 길이(글자)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--timeout", type=float, default=3600, help="조합당 제한 시간(초)")
+    ap.add_argument("--json", type=str, default=None, help="결과 JSON 저장 경로")
+    ap.add_argument("--compare", type=str, default=None, help="이전 결과 JSON 과 배율 비교")
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    builders = [b.strip() for b in args.builders.split(",") if b.strip()]
+    unknown = set(builders) - set(BUILDERS)
+    if unknown:
+        ap.error(f"알 수 없는 빌더: {', '.join(sorted(unknown))} (가능: {', '.join(BUILDERS)})")
+    opts = {"members": args.members, "parties": args.parties, "bills_per_speech": args.bills_per_speech,
+            "text_length": args.text_length, "seed": args.seed}
+
+    report = {"env": _environment(), "config": {**opts, "sizes": sizes, "builders": builders}, "cases": []}
+    for n in sizes:
+        for b in builders:
+            res = run_case(b, n, opts, args.timeout)
+            report["cases"].append({"builder": b, "speeches": n, **res})
+            if "error" in res:
+                print(f"  {b:<22} {n:>10,}  ERROR {res['error']}", file=sys.stderr)
+            else:
+                print(f"  {b:<22} {n:>10,}  {res['wall_s']:>9.3f}s  peak {res['peak_rss_mb']:>8.1f}MB  "
+                      f"(+{res['builder_peak_mb']:.1f}MB)  rows {res['output_rows']}", file=sys.stderr)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
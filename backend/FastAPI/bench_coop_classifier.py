@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_coop_classifier.py
+----------------------------------------------------------
+협력도 분류기 런타임별 (torch fp32 / torch-int8 / onnx / onnx-int8) 정확도 일치도와 CPU 처리량 비교.
+
+일치도 (기준: --baseline, 기본 torch fp32)
+  - score_prob = prob_coop - prob_noncoop 의 절대 오차 평균 / p95 / 최대, 피어슨 상관
+  - label_agree  : 최고 확률 라벨 (비협력/협력/중립) 일치 비율
+  - stance_agree : score_prob 로 매긴 입장 (±0.05, main._stance_from_score 와 같은 기준) 일치 비율
+처리량
+  - 로드 시간, --repeat 회 predict_proba 의 발언/초 (배치 계획은 score_speeches 와 같음)
+
+입력은 speeches JSON (기본: 저장소의 data/speeches_meeting_50242.json), 빈 본문과 중복 본문은 뺀다.
+onnx / onnx-int8 은 export_coop_classifier.py 로 먼저 내보내야 한다 (없으면 error 로 기록).
+
+사용
+    python bench_coop_classifier.py
+    python bench_coop_classifier.py --runtimes torch,torch-int8 --limit 2000 --threads 4
+    python bench_coop_classifier.py --inputs "./out/*.json" --json bench_coop.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+import coop_classifier
+from coop_classifier import LABELS, text_hash
+from score_speeches import expand_inputs, iter_speeches
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_INPUT = str(HERE.parent.parent / "data" / "speeches_meeting_50242.json")
+STANCE_MARGIN = 0.05
+
+
+def load_texts(patterns: List[str], limit: int) -> List[str]:
+    texts = {}
+    for _, speeches in iter_speeches(expand_inputs(patterns)):
+        for s in speeches:
+            t = s.get("speech_text")
+            if t and str(t).strip():
+                texts.setdefault(text_hash(t), str(t))
+            if len(texts) >= limit:
+                return list(texts.values())
+    return list(texts.values())
+
+
+def score_prob(probs: np.ndarray) -> np.ndarray:
+    return probs[:, LABELS.index("coop")] - probs[:, LABELS.index("noncoop")]
+
+
+def stance(scores: np.ndarray) -> np.ndarray:
+    return np.where(scores >= STANCE_MARGIN, 1, np.where(scores <= -STANCE_MARGIN, -1, 0))
+
+
+def agreement(base: np.ndarray, other: np.ndarray) -> Dict[str, float]:
+    """기준 확률 대비 일치도 (둘 다 (n, 3), LABELS 순서)."""
+    a, b = score_prob(base), score_prob(other)
+    diff = np.abs(a - b)
+    corr = float(np.corrcoef(a, b)[0, 1]) if len(a) > 1 and a.std() > 0 and b.std() > 0 else float("nan")
+    return {
+        "score_abs_mean": round(float(diff.mean()), 5),
+        "score_abs_p95": round(float(np.percentile(diff, 95)), 5),
+        "score_abs_max": round(float(diff.max()), 5),
+        "score_pearson": round(corr, 5),
+        "label_agree": round(float((base.argmax(1) == other.argmax(1)).mean()), 4),
+        "stance_agree": round(float((stance(a) == stance(b)).mean()), 4),
+    }
+
+
+def run_runtime(runtime: str, texts: List[str], repeat: int, threads: int, batch_size: int) -> dict:
+    t0 = time.perf_counter()
+    clf = coop_classifier.CoopClassifier(runtime=runtime, num_threads=threads)
+    load_s = time.perf_counter() - t0
+    clf.predict_proba(texts[:batch_size], batch_size=batch_size)     # warmup
+    times, probs = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        probs = clf.predict_proba(texts, batch_size=batch_size)
+        times.append(time.perf_counter() - t0)
+    best = min(times)
+    return {
+        "load_s": round(load_s, 2),
+        "wall_s": round(best, 3),
+        "speeches_per_s": round(len(texts) / best, 1) if best else None,
+        "probs": probs,
+    }
+
+
+def _environment() -> dict:
+    env = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+    if coop_classifier.torch is not None:
+        env["torch"] = coop_classifier.torch.__version__
+    if coop_classifier.ort is not None:
+        env["onnxruntime"] = coop_classifier.ort.__version__
+    return env
+
+
+def main():
+    ap = argparse.ArgumentParser(description="협력도 분류기 런타임별 일치도 / 처리량 비교")
+    ap.add_argument("--inputs", nargs="+", default=[DEFAULT_INPUT], help="speeches JSON 파일 또는 glob")
+    ap.add_argument("--runtimes", default=",".join(coop_classifier.RUNTIMES), help="비교할 런타임 (쉼표 구분)")
+    ap.add_argument("--baseline", default="torch", choices=coop_classifier.RUNTIMES)
+    ap.add_argument("--limit", type=int, default=1000, help="최대 고유 발언 수")
+    ap.add_argument("--repeat", type=int, default=3, help="런타임마다 반복 횟수 (가장 빠른 회차 기록)")
+    ap.add_argument("--threads", type=int, default=os.cpu_count() or 1, help="추론 스레드 수")
+    ap.add_argument("--batch-size", type=int, default=coop_classifier.BATCH_SIZE)
+    ap.add_argument("--json", type=str, default=None, help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    runtimes = [r.strip() for r in args.runtimes.split(",") if r.strip()]
+    unknown = set(runtimes) - set(coop_classifier.RUNTIMES)
+    if unknown:
+        ap.error(f"알 수 없는 런타임: {', '.join(sorted(unknown))} (가능: {', '.join(coop_classifier.RUNTIMES)})")
+    if args.baseline not in runtimes:
+        runtimes.insert(0, args.baseline)
+
+    texts = load_texts(args.inputs, args.limit)
+    if not texts:
+        ap.error("입력 발언이 없습니다")
+    print(f"발언 {len(texts)}건, 모델 {coop_classifier.MODEL_PATH}, 스레드 {args.threads}", file=sys.stderr)
+
+    results = {}
+    for rt in runtimes:
+        try:
+            results[rt] = run_runtime(rt, texts, args.repeat, args.threads, args.batch_size)
+        except Exception as e:
+            results[rt] = {"error": str(e)}
+
+    base = results[args.baseline].get("probs")
+    report = {"env": _environment(), "config": {**vars(args), "texts": len(texts)}, "runtimes": {}}
+    for rt, res in results.items():
+        probs = res.pop("probs", None)
+        if base is not None and probs is not None:
+            res.update(agreement(base, probs))
+            res["speedup"] = round(res["speeches_per_s"] / results[args.baseline]["speeches_per_s"], 2)
+        report["runtimes"][rt] = res
+        if "error" in res:
+            print(f"  {rt:<11} ERROR {res['error']}", file=sys.stderr)
+        else:
+            print(f"  {rt:<11} {res['speeches_per_s']:>8.1f}건/s  x{res.get('speedup', float('nan')):.2f}  "
+                  f"|Δscore| mean {res.get('score_abs_mean', float('nan')):.4f} max {res.get('score_abs_max', float('nan')):.4f}  "
+                  f"stance {res.get('stance_agree', float('nan')):.2%}", file=sys.stderr)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
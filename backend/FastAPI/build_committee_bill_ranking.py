@@ -15,7 +15,7 @@ build_committee_bill_ranking.py
 ✔ 제공 기능:
 1) all_committee.pkl 로드
 2) bill_review 리스트 explode
-3) util_bill.parse_bill_string 으로 법안 정보 정제
+3) util_bill.parse_many 로 법안 정보 정제 (중복 문자열은 1회만 파싱)
 4) 위원회 × 법안 단위 발언 수 / 길이 집계
 5) 논의 점수(bill_activity_score) 산출
 6) 위원회 내부 순위(rank_in_committee) 부여
@@ -30,7 +30,7 @@ build_committee_bill_ranking.py
 
 import os
 import pandas as pd
-from util_bill import parse_bill_string
+from util_bill import parse_many
 
 
 # ------------------------------------------------------
@@ -82,8 +82,8 @@ if __name__ == "__main__":
     # --------------------------------------------------
     # 4) 법안 문자열 파싱
     # --------------------------------------------------
-    df["bill_name"], df["bill_proposer"], df["bill_number"] = zip(
-        *df["bill_review"].apply(parse_bill_string)
+    df["bill_name"], df["bill_proposer"], df["bill_number"] = parse_many(
+        df["bill_review"].to_numpy()
     )
 
     df = df[df["bill_name"].notna()]
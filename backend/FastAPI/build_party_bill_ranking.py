@@ -9,26 +9,14 @@ per-party bill rankings from Supabase-loaded tables (dict).
 This mirrors the logic of the original script but accepts
 `tables` produced by `_load_party_tables()` in `main.py`.
 """
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any
+import logging
+import numpy as np
 import pandas as pd
-import math
-
-try:
-        from util_bill import parse_bill_string
-except Exception:
-        # fallback parser: returns (bill_name, proposer, bill_number)
-        def parse_bill_string(s: str) -> Tuple[str, str, Any]:
-                if not s:
-                        return (None, None, None)
-                s = str(s).strip()
-                # naive attempt to split number in parentheses or trailing digits
-                import re
-                m = re.search(r"(\d{5,})", s)
-                if m:
-                        num = m.group(1)
-                        name = s.replace(num, "").strip(" ()\t\n")
-                        return (name or s, None, num)
-                return (s, None, None)
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
 
 
 def bayesian_adjusted_score(avg: float, n: int, baseline: float = 0.0, weight: int = 30) -> float:
@@ -71,26 +59,26 @@ def build_party_bill_ranking(tables: Dict[str, List[Dict[str, Any]]]) -> pd.Data
         Returns DataFrame with columns: party_name, bill_name, bill_number, speech_count, avg_score_prob, bayesian_score, rank_in_party
         """
 
-        print("[DEBUG] 단계 0: member_bill_stats 사용하도록 변경된 입력 확인")
+        log.debug("단계 0: member_bill_stats 사용하도록 변경된 입력 확인")
         mbs = tables.get("member_bill_stats", [])
-        print(f"[DEBUG] member_bill_stats 행 수: {len(mbs)}")
+        log.debug("member_bill_stats 행 수: %d", len(mbs))
         if not mbs:
                 raise ValueError("member_bill_stats table missing or empty")
 
         df = pd.DataFrame(mbs)
-        print(f"[DEBUG] DataFrame 생성: {df.shape} (행, 열)")
-        print(f"[DEBUG] 컬럼: {list(df.columns)}")
+        log.debug("DataFrame 생성: %s (행, 열)", df.shape)
+        log.debug("컬럼: %s", list(df.columns))
 
         # dimension -> party mapping (same as before)
-        print("[DEBUG] 단계 1: 정당 매핑")
+        log.debug("단계 1: 정당 매핑")
         dim = tables.get("dimension", [])
         dim_df = pd.DataFrame(dim) if dim else pd.DataFrame()
         if not dim_df.empty and "member_id" in dim_df.columns and "party" in dim_df.columns:
                 party_map = dict(zip(dim_df["member_id"], dim_df["party"]))
-                print(f"[DEBUG] 정당 매핑 생성: {len(party_map)} 항목")
+                log.debug("정당 매핑 생성: %d 항목", len(party_map))
         else:
                 party_map = {}
-                print("[DEBUG] 정당 매핑 실패 (dimension 테이블 이상)")
+                log.warning("정당 매핑 실패 (dimension 테이블 이상)")
 
         # detect member id column
         member_col = None
@@ -102,7 +90,8 @@ def build_party_bill_ranking(tables: Dict[str, List[Dict[str, Any]]]) -> pd.Data
                 raise ValueError("No member id column found in member_bill_stats")
 
         df["party_name"] = df[member_col].map(party_map)
-        print(f"[DEBUG] party_name 할당 완료, 비NULL: {df['party_name'].notna().sum()}/{len(df)}")
+        if log.isEnabledFor(logging.DEBUG):
+                log.debug("party_name 할당 완료, 비NULL: %d/%d", df["party_name"].notna().sum(), len(df))
 
         # Identify bill name/number columns
         bill_name_col = None
@@ -135,7 +124,7 @@ def build_party_bill_ranking(tables: Dict[str, List[Dict[str, Any]]]) -> pd.Data
                         sum_score_col = cand
                         break
 
-        print(f"[DEBUG] 사용 컬럼 후보: bill_name={bill_name_col}, bill_number={bill_number_col}, n={n_col}, avg={avg_col}, sum_score={sum_score_col}")
+        log.debug("사용 컬럼 후보: bill_name=%s, bill_number=%s, n=%s, avg=%s, sum_score=%s", bill_name_col, bill_number_col, n_col, avg_col, sum_score_col)
 
         # Coerce numeric columns where present
         if n_col is not None:
@@ -173,67 +162,64 @@ def build_party_bill_ranking(tables: Dict[str, List[Dict[str, Any]]]) -> pd.Data
         # Filter rows with party and some bill identifier
         df = df[df["party_name"].notna()]
         df = df[df["bill_name_norm"].notna() | df["bill_number_norm"].notna()]
-        print(f"[DEBUG] 필터 후: {df.shape}")
+        log.debug("필터 후: %s", df.shape)
         if df.empty:
-                print('[DEBUG] ⚠️ 필터 후 데이터 없음!')
+                log.info("⚠️ 필터 후 데이터 없음!")
                 return pd.DataFrame(columns=["party_name","bill_name","bill_number","speech_count","avg_score_prob","bayesian_score","rank_in_party"])
 
         # Aggregation: compute total speech_count per (party, bill) and weighted avg_score_prob
-        print('[DEBUG] 단계 2: 집계 시작 (party × bill)')
-        # helper to compute weighted average when possible
-        def _agg_party_bill(subdf: pd.DataFrame) -> Tuple[int, float]:
-                n_sum = subdf[n_col].sum()
-                # compute weighted avg if avg_col present
-                if avg_col is not None and n_sum > 0:
-                        # if avg_col has NaN for some rows, treat them as 0 weight
-                        weighted_sum = (subdf[avg_col].fillna(0) * subdf[n_col]).sum()
-                        avg = float(weighted_sum / n_sum) if n_sum > 0 else 0.0
-                        return int(n_sum), avg
-                # fallback: if sum_score_col present
-                if sum_score_col is not None and n_sum > 0:
-                        total_score = subdf[sum_score_col].sum()
-                        return int(n_sum), float(total_score / n_sum)
-                # if only avg_col present (no counts), take mean of avg_col
-                if avg_col is not None:
-                        avg = float(subdf[avg_col].dropna().mean()) if not subdf[avg_col].dropna().empty else 0.0
-                        return int(n_sum), avg
-                # nothing available
-                return int(n_sum), 0.0
-
-        # groupby keys
-        grouped_rows = []
-        for (party, name, num), sub in df.groupby(["party_name","bill_name_norm","bill_number_norm"], dropna=False):
-                speech_count_total, avg_score_prob_total = _agg_party_bill(sub)
-                grouped_rows.append({
-                        "party_name": party,
-                        "bill_name": name,
-                        "bill_number": num,
-                        "speech_count": int(speech_count_total),
-                        "avg_score_prob": float(avg_score_prob_total)
-                })
-
-        grouped = pd.DataFrame(grouped_rows)
-        print(f"[DEBUG] 그룹화 완료: {grouped.shape}")
-
-        # baseline and bayesian
-        baseline = grouped["avg_score_prob"].mean() if not grouped.empty else 0.0
-        print(f"[DEBUG] baseline: {baseline}")
-        grouped["bayesian_score"] = grouped.apply(lambda r: bayesian_adjusted_score(r["avg_score_prob"], int(r["speech_count"]), baseline=baseline, weight=30), axis=1)
+        # (one groupby().agg over precomputed columns; no per-group Python calls)
+        log.debug("단계 2: 집계 시작 (party × bill)")
+        keys = ["party_name", "bill_name_norm", "bill_number_norm"]
+        df["__n"] = df[n_col]
+        aggs = {"__n": "sum"}
+        if avg_col is not None:
+                # NaN avg rows count with 0 score but full weight (same as before)
+                df["__w"] = df[avg_col].fillna(0) * df[n_col]
+                df["__avg"] = df[avg_col]
+                aggs.update({"__w": "sum", "__avg": "mean"})
+        if sum_score_col is not None:
+                df["__s"] = df[sum_score_col]
+                aggs["__s"] = "sum"
+
+        g = df.groupby(keys, dropna=False)[list(aggs)].agg(aggs).reset_index()
+        n_sum = g["__n"].to_numpy(dtype=float)
+        has_n = n_sum > 0
+        safe_n = np.where(has_n, n_sum, 1.0)
+        if avg_col is not None:
+                # weighted mean when counts exist, plain mean of avg otherwise
+                avg = np.where(has_n, g["__w"].to_numpy(dtype=float) / safe_n,
+                               g["__avg"].fillna(0.0).to_numpy(dtype=float))
+        elif sum_score_col is not None:
+                avg = np.where(has_n, g["__s"].to_numpy(dtype=float) / safe_n, 0.0)
+        else:
+                avg = np.zeros(len(g))
+
+        grouped = pd.DataFrame({
+                "party_name": g["party_name"],
+                "bill_name": g["bill_name_norm"],
+                "bill_number": g["bill_number_norm"],
+                "speech_count": n_sum.astype(int),
+                "avg_score_prob": avg,
+        })
+        log.debug("그룹화 완료: %s", grouped.shape)
+
+        # baseline and bayesian (array form of bayesian_adjusted_score)
+        baseline = float(avg.mean()) if len(avg) else 0.0
+        log.debug("baseline: %s", baseline)
+        weight = 30
+        counts = grouped["speech_count"].to_numpy(dtype=float)
+        grouped["bayesian_score"] = np.where(
+                counts > 0, (avg * counts + baseline * weight) / (counts + weight), baseline
+        )
 
         # rank in party
         grouped["rank_in_party"] = grouped.groupby("party_name")["bayesian_score"].rank(method="first", ascending=False).astype(int)
         grouped = grouped.sort_values(["party_name","rank_in_party"]).reset_index(drop=True)
-        print(f"[DEBUG] 정렬 완료: {grouped.shape}")
-
-        # Replace NaN/NaT with None for JSON serialization (per-column)
-        print("[DEBUG] 단계 3: NaN → None 변환")
-        print(f"[DEBUG] NaN 개수 변환 전: {grouped.isna().sum().sum()}")
-        for col in grouped.columns:
-                if grouped[col].dtype == 'object':
-                        grouped[col] = grouped[col].where(pd.notna(grouped[col]), None)
-                else:
-                        grouped[col] = grouped[col].apply(lambda x: None if (isinstance(x, float) and pd.isna(x)) else x)
-        print(f"[DEBUG] NaN 개수 변환 후: {grouped.isna().sum().sum()}")
-
-        print("[DEBUG] ✅ 완료!")
+        log.debug("정렬 완료: %s", grouped.shape)
+
+        # NaN/NaT are left as-is: fast_json.FastJSONResponse writes them as null,
+        # and fast_json.df_records() gives JSON-safe records outside a response.
+
+        log.debug("✅ 완료!")
         return grouped
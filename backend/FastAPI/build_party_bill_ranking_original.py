@@ -16,7 +16,7 @@ build_party_bill_ranking.py
 
 ✔ 핵심 기능 요약:
 1) all_party.pkl 로드 → bill_review 리스트 explode
-2) util_bill.parse_bill_string() 사용해 robust 법안명/의안번호 파싱
+2) util_bill.parse_many() 사용해 robust 법안명/의안번호 파싱 (중복 문자열은 1회만 파싱)
 3) 정당 × 법안 단위로 협력도 평균 계산
 4) 발언수가 적어서 평균이 튀는 문제를 방지하기 위해
    → 베이시안 보정 점수(bayesian_score) 적용
@@ -43,7 +43,7 @@ build_party_bill_ranking.py
 
 import os
 import pandas as pd
-from util_bill import parse_bill_string
+from util_bill import parse_many
 
 
 # ==============================================================  
@@ -106,8 +106,8 @@ if __name__ == "__main__":
     # ----------------------------------------------------------
     print("[INFO] 법안 문자열 파싱 중...")
 
-    df["bill_name"], df["bill_proposer"], df["bill_number"] = zip(
-        *df["bill_review"].apply(parse_bill_string)
+    df["bill_name"], df["bill_proposer"], df["bill_number"] = parse_many(
+        df["bill_review"].to_numpy()
     )
 
     # bill_name 없는 경우 제거 (거의 없음)
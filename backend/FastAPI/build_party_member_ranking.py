@@ -145,12 +145,6 @@ def build_party_member_ranking(tables: Dict[str, List[Dict[str, Any]]]) -> pd.Da
     member_stats = member_stats.sort_values(["party_name", "bayesian_score"], ascending=[True, False])
     member_stats["rank_total"] = member_stats.groupby("party_name").cumcount() + 1
 
-    # NaN을 None으로 변환 (JSON 직렬화 가능하게)
-    for col in member_stats.columns:
-        if member_stats[col].dtype == 'object':
-            member_stats[col] = member_stats[col].where(pd.notna(member_stats[col]), None)
-        else:
-            # numeric 컬럼: NaN을 None으로 변환
-            member_stats[col] = member_stats[col].apply(lambda x: None if (isinstance(x, float) and pd.isna(x)) else x)
-
+    # NaN 은 그대로 둔다: 응답은 fast_json.FastJSONResponse 가 null 로 쓰고,
+    # 응답 밖에서 JSON-safe records 가 필요하면 fast_json.df_records() 사용
     return member_stats
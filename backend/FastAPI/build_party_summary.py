@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+build_party_summary.py
+----------------------------------------------------------
+📌 목적:
+정당별 요약(총 협력도 + 의원 상위/하위 5명 + 법안 상위/하위 5개)을
+랭킹 빌드 시점에 한 번 계산해 party_summary 테이블에 저장한다.
+→ /api/parties/{party_id}/summary 는 party_id 로 한 행만 읽고,
+  /api/parties/summary 는 전체 정당을 한 번에 읽는다.
+
+입력 테이블 (build_party_total_score / build_party_member_ranking /
+build_party_bill_ranking 결과가 올라간 Supabase 테이블):
+  parties, party_total_score, party_member_ranking_unique, party_bill_ranking
+
+⚠ 랭킹 테이블을 다시 올린 뒤에는 이 스크립트도 다시 실행해야 한다.
+  랭킹 빌더(build_party_*.py)는 이 스크립트를 부르지 않으므로, 다시 돌리지 않으면
+  API 는 이전 요약(built_at 시점)을 그대로 내보낸다.
+  party_summary 테이블이 없거나 비어 있을 때만 API 가 랭킹 테이블에서 바로 계산한다.
+
+📌 party_summary 테이블
+    create table if not exists party_summary (
+        party_id          integer primary key,
+        party_name        text not null,
+        total_cooperation jsonb,
+        analyzed_members  integer,
+        member_top5       jsonb,
+        member_bottom5    jsonb,
+        bill_top5         jsonb,
+        bill_bottom5      jsonb,
+        built_at          timestamptz default now()
+    );
+
+📌 사용
+    python build_party_summary.py              # Supabase 에서 읽어 party_summary upsert
+    python build_party_summary.py --dry-run    # 계산 결과만 출력
+"""
+
+import argparse
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+from util_rank import top_k, bottom_k
+
+TOP_N = 5
+SUMMARY_TABLE = "party_summary"
+SUMMARY_FIELDS = (
+    "party_id", "party_name", "total_cooperation", "analyzed_members",
+    "member_top5", "member_bottom5", "bill_top5", "bill_bottom5",
+)
+
+
+# ---------------------------------------------------------
+# ✔ 상위/하위 선택
+# ---------------------------------------------------------
+def _score(row: Dict[str, Any]):
+    return row.get("bayesian_score", 0)
+
+
+def select_members(members: List[Dict[str, Any]], n: int = TOP_N) -> Tuple[list, list]:
+    """bayesian_score 기준 상위 n명 / 하위 n명."""
+    return top_k(members, n, key=_score), bottom_k(members, n, key=_score)
+
+
+def dedup_bills_by_name(bills: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """같은 이름의 법안을 하나로 통합 (가장 높은 bayesian_score 사용, 이름 없는 행은 제외)."""
+    by_name: Dict[str, Dict[str, Any]] = {}
+    for bill in bills:
+        name = bill.get("bill_name")
+        if not name:
+            continue
+        if name not in by_name or _score(bill) > _score(by_name[name]):
+            by_name[name] = bill
+    return list(by_name.values())
+
+
+def select_distinct_scores(rows: List[Dict[str, Any]], n: int = TOP_N, reverse: bool = True) -> list:
+    """점수순으로 n개 (같은 점수는 처음 나온 하나만 포함)."""
+    pick = top_k if reverse else bottom_k
+    return pick(rows, n, key=_score, distinct=True)
+
+
+def total_cooperation_of(total_row: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if total_row is None:
+        return {"status": "분석 불가", "message": "정당 협력도 데이터가 없습니다."}
+    return {
+        "avg_score_prob": total_row.get("avg_score_prob"),
+        "adjusted_score_prob": total_row.get("adjusted_score_prob"),
+        "original_stance": total_row.get("original_stance"),
+        "adjusted_stance": total_row.get("adjusted_stance"),
+    }
+
+
+# ---------------------------------------------------------
+# ✔ 정당 1개 / 전체 요약
+# ---------------------------------------------------------
+def summarize_party(
+    party_id: int,
+    party_name: str,
+    total_row: Optional[Dict[str, Any]],
+    members: List[Dict[str, Any]],
+    bills: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """party_summary 한 행 (API 응답 모양과 같음)."""
+    analyzed_members = (total_row or {}).get("n_members", 0) or len(members)
+    member_top5, member_bottom5 = select_members(members)
+    unique_bills = dedup_bills_by_name(bills)
+    return {
+        "party_id": party_id,
+        "party_name": party_name,
+        "total_cooperation": total_cooperation_of(total_row),
+        "analyzed_members": analyzed_members,
+        "member_top5": member_top5,
+        "member_bottom5": member_bottom5,
+        "bill_top5": select_distinct_scores(unique_bills, reverse=True),
+        "bill_bottom5": select_distinct_scores(unique_bills, reverse=False),
+    }
+
+
+def build_party_summary(tables: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    parties 의 정당마다 summarize_party() 결과를 만든다.
+    랭킹 테이블은 party_name 으로 한 번씩만 그룹핑한다 (정당 수 × 전체 스캔 없음).
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    for row in tables.get("party_total_score", []):
+        totals.setdefault(row.get("party_name"), row)
+
+    members = defaultdict(list)
+    for row in tables.get("party_member_ranking_unique", []):
+        members[row.get("party_name")].append(row)
+
+    bills = defaultdict(list)
+    for row in tables.get("party_bill_ranking", []):
+        bills[row.get("party_name")].append(row)
+
+    built_at = datetime.now(timezone.utc).isoformat()
+    out = []
+    for party in tables.get("parties", []):
+        name = party.get("party_name")
+        if party.get("party_id") is None or not name:
+            continue
+        row = summarize_party(party["party_id"], name, totals.get(name), members.get(name, []), bills.get(name, []))
+        row["built_at"] = built_at
+        out.append(row)
+    return out
+
+
+# ---------------------------------------------------------
+# ✔ Supabase 읽기 / 저장
+# ---------------------------------------------------------
+def _fetch_all(client, table: str, columns: str = "*", page: int = 1000) -> List[Dict[str, Any]]:
+    rows, start = [], 0
+    while True:
+        chunk = client.table(table).select(columns).range(start, start + page - 1).execute().data or []
+        rows.extend(chunk)
+        if len(chunk) < page:
+            return rows
+        start += page
+
+
+def load_tables(client) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        "parties": _fetch_all(client, "parties", "party_id, party_name"),
+        "party_total_score": _fetch_all(client, "party_total_score"),
+        "party_member_ranking_unique": _fetch_all(client, "party_member_ranking_unique"),
+        "party_bill_ranking": _fetch_all(client, "party_bill_ranking"),
+    }
+
+
+def save_summary(client, rows: List[Dict[str, Any]]) -> int:
+    if rows:
+        client.table(SUMMARY_TABLE).upsert(rows, on_conflict="party_id").execute()
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="정당별 요약(top/bottom 5) 사전 계산 → party_summary")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 결과만 출력")
+    args = parser.parse_args()
+
+    from database import supabase
+
+    rows = build_party_summary(load_tables(supabase))
+    if args.dry_run:
+        for r in rows:
+            print(f"{r['party_id']:>4} {r['party_name']}: 의원 {r['analyzed_members']}명, "
+                  f"법안 top {len(r['bill_top5'])} / bottom {len(r['bill_bottom5'])}")
+        return
+    n = save_summary(supabase, rows)
+    print(f"✅ party_summary {n}개 정당 저장 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -148,12 +148,6 @@ def build_party_total_score(tables: Dict[str, List[Dict[str, Any]]]) -> pd.DataF
     # 9) adjusted_score_prob 추가 (baseline 기준 보정 점수)
     stats["adjusted_score_prob"] = stats["avg_score_prob"] - baseline
 
-    # NaN을 None으로 변환 (JSON 직렬화 가능하게)
-    for col in stats.columns:
-        if stats[col].dtype == 'object':
-            stats[col] = stats[col].where(pd.notna(stats[col]), None)
-        else:
-            # numeric 컬럼: NaN을 None으로 변환
-            stats[col] = stats[col].apply(lambda x: None if (isinstance(x, float) and pd.isna(x)) else x)
-
+    # NaN 은 그대로 둔다: 응답은 fast_json.FastJSONResponse 가 null 로 쓰고,
+    # 응답 밖에서 JSON-safe records 가 필요하면 fast_json.df_records() 사용
     return stats
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+build_user_stats.py
+----------------------------------------------------------
+📌 목적:
+대시보드(/api/dashboard/me)용 사용자별 통계를 user_stats 한 행으로 유지한다.
+→ 대시보드는 user_id 로 한 행만 읽는다 (user_logs 가 아무리 쌓여도 count(exact) 스캔 없음).
+
+  - 활동 로그: user_logs write-behind 버퍼(write_behind.py)가 묶음을 쓸 때마다
+    record_activity() 가 사용자별 증가분 + 최근 5건 + 일별 집계를 RPC 한 번으로 반영
+  - 북마크: /api/bookmark 추가 / 삭제 때 record_bookmark() 가 개수와 목록을 갱신
+  - 일별 집계: user_activity_daily (사용자, 날짜(KST), 활동 종류) → 횟수
+  - 처음 보는 사용자: seed_user_stats() 가 원본 테이블(user_logs / user_bookmarks)에서 한 번 세어
+    행을 만든다 (증가분만으로 행을 만들지 않음). 방금 쓴 로그 / 북마크도 이미 들어 있으므로
+    그 사용자의 이번 증가분은 더하지 않는다. 대시보드도 행이 없으면 seed() 를 먼저 부른다.
+    → 사용자마다 평생 한 번만 원본 테이블을 센다 (기존 사용자 일괄 백필 불필요)
+
+  이 스크립트(전체 재계산)는 카운터가 어긋났을 때 고치는 용도다.
+  재계산 값(절대값)으로 덮어쓰므로 실행 중에 들어온 증가분은 사라진다
+  → 로그 / 북마크 쓰기를 멈춘 상태(점검 시간)에 실행한다.
+  사용자 한 명만 고칠 때는 SQL 로 그 행을 지우고 seed_user_stats(user_id) 를 부르면 된다.
+
+📌 테이블 / 함수 (Supabase SQL)
+    create table if not exists user_stats (
+        user_id           uuid primary key,
+        total_activities  bigint not null default 0,
+        total_saved       integer not null default 0,
+        recent_activities jsonb not null default '[]',
+        saved_items       jsonb not null default '[]',
+        last_activity_at  timestamptz,
+        updated_at        timestamptz default now()
+    );
+
+    create table if not exists user_activity_daily (
+        user_id       uuid not null,
+        day           date not null,
+        activity_type text not null,
+        n             integer not null default 0,
+        primary key (user_id, day, activity_type)
+    );
+
+    -- 행이 없을 때만 원본 테이블에서 만든다. 새로 만들었으면 true
+    create or replace function seed_user_stats(p_user uuid) returns boolean
+    language plpgsql as $$
+    begin
+        insert into user_stats (user_id, total_activities, total_saved, recent_activities, saved_items, last_activity_at)
+        select p_user,
+               (select count(*) from user_logs where user_id = p_user),
+               (select count(*) from user_bookmarks where user_id = p_user),
+               coalesce((select jsonb_agg(to_jsonb(l) order by l.created_at desc)
+                         from (select * from user_logs where user_id = p_user
+                               order by created_at desc limit 5) l), '[]'::jsonb),
+               coalesce((select jsonb_agg(to_jsonb(b) order by b.created_at desc)
+                         from user_bookmarks b where b.user_id = p_user), '[]'::jsonb),
+               (select max(created_at) from user_logs where user_id = p_user)
+        on conflict (user_id) do nothing;
+        if not found then
+            return false;
+        end if;
+        insert into user_activity_daily (user_id, day, activity_type, n)
+        select p_user, (created_at at time zone 'Asia/Seoul')::date, coalesce(activity_type, 'unknown'), count(*)
+        from user_logs where user_id = p_user
+        group by 2, 3
+        on conflict (user_id, day, activity_type) do nothing;
+        return true;
+    end $$;
+
+    -- p_users: [{user_id, n, last_at, recent: [...]}], p_daily: [{user_id, day, activity_type, n}]
+    create or replace function bump_user_activity(p_users jsonb, p_daily jsonb) returns void
+    language plpgsql as $$
+    declare
+        u jsonb;
+        seeded uuid[] := '{}';
+    begin
+        for u in select * from jsonb_array_elements(p_users) loop
+            if seed_user_stats((u->>'user_id')::uuid) then
+                seeded := seeded || (u->>'user_id')::uuid;
+                continue;
+            end if;
+            update user_stats set
+                total_activities  = total_activities + (u->>'n')::bigint,
+                recent_activities = (
+                    select coalesce(jsonb_agg(s.e order by s.e->>'created_at' desc), '[]'::jsonb)
+                    from (select r.e from jsonb_array_elements(u->'recent' || recent_activities) as r(e)
+                          order by r.e->>'created_at' desc limit 5) s),
+                last_activity_at  = greatest(last_activity_at, (u->>'last_at')::timestamptz),
+                updated_at        = now()
+            where user_id = (u->>'user_id')::uuid;
+        end loop;
+        insert into user_activity_daily (user_id, day, activity_type, n)
+        select (d->>'user_id')::uuid, (d->>'day')::date, d->>'activity_type', (d->>'n')::integer
+        from jsonb_array_elements(p_daily) as t(d)
+        where (d->>'user_id')::uuid <> all(seeded)
+        on conflict (user_id, day, activity_type) do update set n = user_activity_daily.n + excluded.n;
+    end $$;
+
+    -- p_delta: +1 (추가, p_item 을 목록 맨 앞에) / -1 (삭제, p_item.id 를 목록에서 제거)
+    create or replace function bump_user_saved(p_user uuid, p_delta integer, p_item jsonb) returns void
+    language plpgsql as $$
+    begin
+        if seed_user_stats(p_user) then
+            return;
+        end if;
+        update user_stats set
+            total_saved = greatest(total_saved + p_delta, 0),
+            saved_items = case when p_delta > 0
+                then jsonb_build_array(p_item) || saved_items
+                else coalesce((select jsonb_agg(r.e order by r.i)
+                               from jsonb_array_elements(saved_items) with ordinality as r(e, i)
+                               where r.e->>'id' is distinct from p_item->>'id'), '[]'::jsonb) end,
+            updated_at  = now()
+        where user_id = p_user;
+    end $$;
+
+📌 사용
+    python build_user_stats.py              # (쓰기 중지 상태에서) user_logs / user_bookmarks 전체 재계산 후 저장
+    python build_user_stats.py --dry-run    # 계산 결과만 출력
+"""
+
+import argparse
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+STATS_TABLE = "user_stats"
+DAILY_TABLE = "user_activity_daily"
+STATS_FIELDS = (
+    "user_id", "total_activities", "total_saved", "recent_activities",
+    "saved_items", "last_activity_at",
+)
+RECENT_N = 5
+KST = timezone(timedelta(hours=9))
+
+
+# ---------------------------------------------------------
+# ✔ 집계
+# ---------------------------------------------------------
+def _day(created_at: Optional[str]) -> str:
+    """created_at(ISO) → KST 날짜 문자열. 없거나 형식이 틀리면 오늘."""
+    try:
+        ts = datetime.fromisoformat(str(created_at).replace("Z", "+00:00"))
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+    except ValueError:
+        ts = datetime.now(timezone.utc)
+    return ts.astimezone(KST).date().isoformat()
+
+
+def _newest_first(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(rows, key=lambda r: str(r.get("created_at") or ""), reverse=True)
+
+
+def activity_deltas(rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    user_logs 행 묶음 → (사용자별 증가분, 일별 증가분) — bump_user_activity 인자 모양.
+    """
+    by_user = defaultdict(list)
+    daily = Counter()
+    for r in rows:
+        uid = r.get("user_id")
+        if not uid:
+            continue
+        by_user[uid].append(r)
+        daily[(uid, _day(r.get("created_at")), r.get("activity_type") or "unknown")] += 1
+
+    users = []
+    for uid, logs in by_user.items():
+        recent = _newest_first(logs)[:RECENT_N]
+        users.append({
+            "user_id": uid,
+            "n": len(logs),
+            "last_at": recent[0].get("created_at"),
+            "recent": recent,
+        })
+    days = [
+        {"user_id": uid, "day": day, "activity_type": kind, "n": n}
+        for (uid, day, kind), n in daily.items()
+    ]
+    return users, days
+
+
+def build_user_stats(logs: List[Dict[str, Any]], bookmarks: List[Dict[str, Any]]) -> Tuple[list, list]:
+    """원본 전체 → (user_stats 행, user_activity_daily 행)."""
+    users, days = activity_deltas(logs)
+    saved = defaultdict(list)
+    for b in bookmarks:
+        if b.get("user_id"):
+            saved[b["user_id"]].append(b)
+
+    built_at = datetime.now(timezone.utc).isoformat()
+    stats = {}
+    for u in users:
+        stats[u["user_id"]] = {
+            "user_id": u["user_id"],
+            "total_activities": u["n"],
+            "total_saved": 0,
+            "recent_activities": u["recent"],
+            "saved_items": [],
+            "last_activity_at": u["last_at"],
+        }
+    for uid, items in saved.items():
+        row = stats.setdefault(uid, {
+            "user_id": uid, "total_activities": 0, "recent_activities": [], "last_activity_at": None,
+        })
+        row["total_saved"] = len(items)
+        row["saved_items"] = _newest_first(items)
+    for row in stats.values():
+        row["updated_at"] = built_at
+    return list(stats.values()), days
+
+
+# ---------------------------------------------------------
+# ✔ 증가분 반영 (API 쓰기 경로)
+# ---------------------------------------------------------
+def record_activity(client, rows: List[Dict[str, Any]]):
+    """user_logs 에 쓴 행 묶음을 user_stats / user_activity_daily 에 더한다."""
+    users, days = activity_deltas(rows)
+    if users:
+        client.rpc("bump_user_activity", {"p_users": users, "p_daily": days}).execute()
+
+
+def record_bookmark(client, user_id: str, delta: int, item: Dict[str, Any]):
+    """북마크 추가(+1, item 은 저장된 행) / 삭제(-1, item 은 지운 행)."""
+    client.rpc("bump_user_saved", {"p_user": user_id, "p_delta": delta, "p_item": item}).execute()
+
+
+def seed(client, user_id: str):
+    """user_stats 에 행이 없으면 원본 테이블에서 만든다 (있으면 그대로)."""
+    client.rpc("seed_user_stats", {"p_user": user_id}).execute()
+
+
+# ---------------------------------------------------------
+# ✔ Supabase 읽기 / 저장
+# ---------------------------------------------------------
+def _fetch_all(client, table: str, columns: str = "*", page: int = 1000) -> List[Dict[str, Any]]:
+    rows, start = [], 0
+    while True:
+        chunk = client.table(table).select(columns).range(start, start + page - 1).execute().data or []
+        rows.extend(chunk)
+        if len(chunk) < page:
+            return rows
+        start += page
+
+
+def save_stats(client, stats: List[Dict[str, Any]], days: List[Dict[str, Any]], page: int = 500) -> int:
+    # 재계산 값으로 덮어쓴다 (증가분이 아니라 전체 값) → 쓰기를 멈춘 상태에서만 실행
+    for i in range(0, len(stats), page):
+        client.table(STATS_TABLE).upsert(stats[i:i + page], on_conflict="user_id").execute()
+    for i in range(0, len(days), page):
+        client.table(DAILY_TABLE).upsert(days[i:i + page], on_conflict="user_id,day,activity_type").execute()
+    return len(stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자별 대시보드 통계 재계산 → user_stats / user_activity_daily")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 결과만 출력")
+    args = parser.parse_args()
+
+    from database import supabase
+
+    logs = _fetch_all(supabase, "user_logs")
+    bookmarks = _fetch_all(supabase, "user_bookmarks")
+    stats, days = build_user_stats(logs, bookmarks)
+    if args.dry_run:
+        for r in stats:
+            print(f"{r['user_id']}: 활동 {r['total_activities']}건, 북마크 {r['total_saved']}개, "
+                  f"최근 {r['last_activity_at']}")
+        print(f"일별 집계 {len(days)}행")
+        return
+    n = save_stats(supabase, stats, days)
+    print(f"✅ user_stats {n}명 / user_activity_daily {len(days)}행 저장 완료")
+
+
+if __name__ == "__main__":
+    main()
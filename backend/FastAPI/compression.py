@@ -0,0 +1,232 @@
+"""
+compression.py
+----------------------------------------------------------
+Accept-Encoding 협상 기반 응답 압축 (br > gzip) 미들웨어.
+
+랭킹/목록 API (/api/parties/*-ranking, /api/legislators, /api/public-table-previews ...)
+는 반복되는 한글 텍스트 테이블을 통째로 돌려주므로 압축 효과가 크다.
+
+- 최소 크기      : COMPRESS_MIN_SIZE 바이트 미만은 그대로 보냄 (기본 1024)
+- 압축 레벨      : COMPRESS_GZIP_LEVEL (1~9, 기본 6), COMPRESS_BROTLI_QUALITY (0~11, 기본 5)
+- 이벤트 루프 보호 : COMPRESS_OFFLOAD_SIZE 바이트 이상 본문은 스레드풀에서 압축 (기본 65536)
+- 대상 타입      : application/json, text/*, javascript, xml, svg
+- 이미 Content-Encoding 이 있는 응답, 206/204/304 등은 건드리지 않음
+- brotli 패키지가 없으면 gzip 만 협상한다
+
+압축에 쓴 시간은 /metrics 의 compress 구간으로 남는다 (serialize 구간에서는 빠짐).
+MetricsMiddleware 안쪽에 두면 응답 크기 히스토그램이 실제 전송(압축 후) 바이트가 된다.
+
+사용 (main.py)
+    app.add_middleware(compression.CompressionMiddleware)
+"""
+import os
+import gzip
+import time
+import zlib
+from typing import List, Optional, Tuple
+
+import anyio
+
+import metrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli 미설치 환경
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "text/", "application/javascript",
+    "application/xml", "image/svg+xml",
+)
+SKIP_STATUS = {204, 206, 304}
+
+
+# ======================================================================
+# Accept-Encoding 협상
+# ======================================================================
+def parse_accept_encoding(value: str) -> dict:
+    """'br;q=1.0, gzip;q=0.8, *;q=0' → {'br': 1.0, 'gzip': 0.8, '*': 0.0}"""
+    prefs = {}
+    for part in value.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for p in params.split(";"):
+            k, _, v = p.strip().partition("=")
+            if k.strip() == "q":
+                try:
+                    q = float(v)
+                except ValueError:
+                    q = 0.0
+        prefs[token] = q
+    return prefs
+
+
+def choose_encoding(value: str, brotli_ok: bool = True) -> Optional[str]:
+    """클라이언트가 허용한 것 중 br → gzip 순으로 선택 (q 값이 높은 쪽 우선)."""
+    prefs = parse_accept_encoding(value)
+    candidates = (["br"] if brotli_ok else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for enc in candidates:
+        q = prefs.get(enc, prefs.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+# ======================================================================
+# 압축기
+# ======================================================================
+class _Compressor:
+    """gzip / br 스트리밍 압축기 공통 인터페이스 (compress / finish)."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 → gzip 헤더/트레일러
+            self._c = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._c.process(data)
+        return self._c.compress(data)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._c.finish()
+        return self._c.flush()
+
+
+def compress_bytes(data: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 5) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+# ======================================================================
+# ASGI 미들웨어
+# ======================================================================
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for k, v in headers:
+        if k.lower() == name:
+            return v
+    return None
+
+
+def _without(headers: List[Tuple[bytes, bytes]], *names: bytes) -> List[Tuple[bytes, bytes]]:
+    return [(k, v) for k, v in headers if k.lower() not in names]
+
+
+def _add_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    vary = _header(headers, b"vary")
+    if vary is None:
+        return headers + [(b"vary", b"Accept-Encoding")]
+    if b"accept-encoding" in vary.lower() or vary.strip() == b"*":
+        return headers
+    return _without(headers, b"vary") + [(b"vary", vary + b", Accept-Encoding")]
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None,
+        offload_size: Optional[int] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+        self.gzip_level = gzip_level if gzip_level is not None else int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+        self.brotli_quality = (
+            brotli_quality if brotli_quality is not None else int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+        )
+        self.offload_size = offload_size if offload_size is not None else int(os.getenv("COMPRESS_OFFLOAD_SIZE", "65536"))
+
+    async def _run(self, fn, data: bytes, *args) -> bytes:
+        """본문이 크면 스레드풀에서, 작으면 그 자리에서 압축 (소요 시간은 compress 구간)."""
+        t0 = time.perf_counter()
+        try:
+            if len(data) >= self.offload_size:
+                return await anyio.to_thread.run_sync(fn, data, *args)
+            return fn(data, *args)
+        finally:
+            metrics.add_phase("compress", time.perf_counter() - t0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = _header(scope.get("headers") or [], b"accept-encoding")
+        encoding = choose_encoding(accept.decode("latin-1"), brotli is not None) if accept else None
+
+        state = {"start": None, "compressor": None, "passthrough": False}
+
+        async def send_wrapper(message):
+            mtype = message["type"]
+            if mtype == "http.response.start":
+                headers = list(message.get("headers") or [])
+                ctype = (_header(headers, b"content-type") or b"").decode("latin-1").lower()
+                compressible = ctype.startswith(COMPRESSIBLE_TYPES)
+                # 압축하지 않더라도 Vary 는 붙여야 캐시가 인코딩별로 구분한다
+                if compressible:
+                    message["headers"] = headers = _add_vary(headers)
+                if (
+                    encoding is None
+                    or not compressible
+                    or message["status"] in SKIP_STATUS
+                    or _header(headers, b"content-encoding") is not None
+                ):
+                    state["passthrough"] = True
+                    await send(message)
+                    return
+                # 첫 본문 조각을 보고 압축 여부를 정하므로 시작 메시지는 잠시 보류
+                state["start"] = message
+                return
+
+            if mtype != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            start = state["start"]
+
+            if start is not None:
+                state["start"] = None
+                headers = start["headers"]
+                if not more:
+                    # 단일 본문: 임계값 미만이면 원본 그대로
+                    if len(body) < self.minimum_size:
+                        await send(start)
+                        await send(message)
+                        return
+                    data = await self._run(compress_bytes, body, encoding, self.gzip_level, self.brotli_quality)
+                    start["headers"] = _without(headers, b"content-length") + [
+                        (b"content-encoding", encoding.encode()),
+                        (b"content-length", str(len(data)).encode()),
+                    ]
+                    await send(start)
+                    await send({"type": "http.response.body", "body": data, "more_body": False})
+                    return
+                # 스트리밍 응답: 길이를 모르므로 Content-Length 제거 후 청크 단위 압축
+                state["compressor"] = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                start["headers"] = _without(headers, b"content-length") + [(b"content-encoding", encoding.encode())]
+                await send(start)
+
+            comp = state["compressor"]
+            if comp is None:
+                await send(message)
+                return
+            data = await self._run(comp.compress, body) if body else b""
+            if not more:
+                data += comp.finish()
+            if data or not more:
+                await send({"type": "http.response.body", "body": data, "more_body": more})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,226 @@
+"""
+coop_classifier.py
+----------------------------------------------------------
+발언 협력도 분류기 (비협력 / 협력 / 중립 3분류) 의 CPU 추론 래퍼.
+
+speeches 의 prob_noncoop / prob_coop / prob_neutral 을 만드는 모델이다.
+score_speeches.py (일괄 채점) 와 /sentiment 가 같은 코드를 쓴다.
+
+  - 모델: transformers AutoModelForSequenceClassification (COOP_MODEL, 기본 ./models/coop_classifier)
+    라벨 순서는 config.id2label 이름으로 맞춘다 (noncoop/비협력, coop/협력, neutral/중립).
+  - 배치: 토큰 길이순으로 정렬한 뒤 (배치 크기, 배치당 토큰 수) 한도로 묶고 배치 안에서만 패딩
+    → 짧은 발언이 긴 발언 길이만큼 패딩되지 않는다. 결과는 입력 순서로 되돌린다.
+  - 런타임 (COOP_RUNTIME): torch (fp32, 기본) / torch-int8 (Linear 동적 int8 양자화) /
+    onnx / onnx-int8 (export_coop_classifier.py 로 만든 ONNX 를 ONNX Runtime 으로).
+    정확도/속도 비교는 bench_coop_classifier.py.
+  - torch / transformers 가 없으면 import 는 되고, CoopClassifier 생성 시 RuntimeError.
+    get_classifier() 는 로드 실패를 기억해 다시 시도하지 않는다 (API 서버는 시작 시 한 번 로드).
+
+사용
+    from coop_classifier import get_classifier, LABELS
+    probs = get_classifier().predict_proba(["동의합니다.", "반대합니다."])   # (n, 3), LABELS 순서
+"""
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import torch
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+except ImportError:  # pragma: no cover - 모델 스택 미설치 환경 (API 서버만 띄우는 경우)
+    torch = None
+
+try:
+    import onnxruntime as ort
+except ImportError:  # pragma: no cover - onnx 런타임을 쓰지 않는 환경
+    ort = None
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+LABELS = ("noncoop", "coop", "neutral")
+PROB_COLUMNS = tuple(f"prob_{l}" for l in LABELS)
+
+MODEL_PATH = os.getenv("COOP_MODEL", "./models/coop_classifier")
+MAX_LENGTH = int(os.getenv("COOP_MAX_LENGTH", "256"))
+BATCH_SIZE = int(os.getenv("COOP_BATCH_SIZE", "32"))
+MAX_BATCH_TOKENS = int(os.getenv("COOP_MAX_BATCH_TOKENS", "8192"))
+
+# 추론 런타임: torch (fp32) / torch-int8 (동적 양자화) / onnx / onnx-int8 (ONNX Runtime)
+RUNTIMES = ("torch", "torch-int8", "onnx", "onnx-int8")
+RUNTIME = os.getenv("COOP_RUNTIME", "torch")
+ONNX_FILES = {"onnx": "model.onnx", "onnx-int8": "model.int8.onnx"}
+
+# config.id2label 이름 → LABELS (비협력을 협력보다 먼저 확인)
+_LABEL_ALIASES = (
+    ("noncoop", ("noncoop", "non_coop", "non-coop", "uncoop", "비협력")),
+    ("neutral", ("neutral", "중립")),
+    ("coop", ("coop", "협력")),
+)
+
+
+def text_hash(text: Optional[str]) -> str:
+    """채점 캐시 키: 앞뒤 공백과 연속 공백을 정리한 본문의 sha1."""
+    return hashlib.sha1(" ".join(str(text or "").split()).encode("utf-8")).hexdigest()
+
+
+def model_id(model_path: str = MODEL_PATH, runtime: str = RUNTIME) -> str:
+    """
+    캐시 키에 쓰는 모델 이름 (COOP_MODEL_ID, 없으면 모델 경로의 마지막 이름).
+    양자화 런타임은 점수가 조금 달라지므로 "@런타임" 을 붙여 따로 캐시한다.
+    """
+    base = os.getenv("COOP_MODEL_ID") or os.path.basename(os.path.normpath(model_path))
+    return base if runtime == "torch" else f"{base}@{runtime}"
+
+
+def onnx_path(model_path: str = MODEL_PATH, runtime: str = "onnx") -> str:
+    """export_coop_classifier.py 가 만드는 ONNX 파일 위치."""
+    return os.path.join(model_path, "onnx", ONNX_FILES[runtime])
+
+
+def _onnx_session(path: str, num_threads: Optional[int] = None):
+    if ort is None:
+        raise RuntimeError("onnxruntime 이 설치되어 있지 않습니다 (pip install onnxruntime)")
+    if not os.path.exists(path):
+        raise RuntimeError(f"ONNX 모델이 없습니다: {path} (python export_coop_classifier.py 로 생성)")
+    opts = ort.SessionOptions()
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads:
+        opts.intra_op_num_threads = num_threads
+    return ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+
+
+def label_order(id2label: Dict[int, str]) -> List[int]:
+    """
+    LABELS 순서대로 모델 출력 열 번호. 이름을 하나도 못 맞추면 (LABEL_0..) 출력 순서가 LABELS 와 같다고 본다.
+    일부만 맞으면 (예: 협력 / 중립 / LABEL_2) 순서를 알 수 없으므로 ValueError (확률 열이 뒤바뀌지 않도록).
+    """
+    found = {}
+    for idx, name in id2label.items():
+        low = str(name).lower()
+        for label, aliases in _LABEL_ALIASES:
+            if any(a in low for a in aliases):
+                found.setdefault(label, int(idx))
+                break
+    if len(found) == len(LABELS):
+        return [found[l] for l in LABELS]
+    if found:
+        raise ValueError(f"협력도 분류기 라벨 이름을 일부만 알아볼 수 있습니다 ({sorted(found)}): {id2label}")
+    if len(id2label) != len(LABELS):
+        raise ValueError(f"협력도 분류기는 3개 라벨이어야 합니다: {id2label}")
+    return list(range(len(LABELS)))
+
+
+def plan_batches(lengths: Sequence[int], batch_size: int = BATCH_SIZE, max_tokens: int = MAX_BATCH_TOKENS) -> List[List[int]]:
+    """
+    토큰 길이순 배치 계획 → [[입력 번호, ...], ...].
+    배치 하나는 batch_size 개 이하, (개수 × 배치 안 최대 길이) 가 max_tokens 이하.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches, cur, cur_max = [], [], 0
+    for i in order:
+        longest = max(cur_max, lengths[i])
+        if cur and (len(cur) >= batch_size or (len(cur) + 1) * longest > max_tokens):
+            batches.append(cur)
+            cur, longest = [], lengths[i]
+        cur.append(i)
+        cur_max = longest
+    if cur:
+        batches.append(cur)
+    return batches
+
+
+class CoopClassifier:
+    def __init__(self, model_path: str = MODEL_PATH, max_length: int = MAX_LENGTH,
+                 num_threads: Optional[int] = None, runtime: str = RUNTIME):
+        if torch is None:
+            raise RuntimeError("torch / transformers 가 설치되어 있지 않습니다 (requirement.txt 의 모델 스택 필요)")
+        if runtime not in RUNTIMES:
+            raise ValueError(f"COOP_RUNTIME 은 {', '.join(RUNTIMES)} 중 하나: {runtime}")
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.model_path = model_path
+        self.max_length = max_length
+        self.runtime = runtime
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        config = AutoConfig.from_pretrained(model_path)
+        self.columns = label_order(config.id2label)
+        self.model_id = model_id(model_path, runtime)
+        self.model = self.session = None
+
+        if runtime.startswith("onnx"):
+            self.session = _onnx_session(onnx_path(model_path, runtime), num_threads)
+            self._onnx_inputs = [i.name for i in self.session.get_inputs()]
+        else:
+            self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+            self.model.eval()
+            if runtime == "torch-int8":
+                # Linear 가중치만 int8, 활성값은 추론 때 동적 양자화 (별도 내보내기 파일 없이 로드 시 변환)
+                self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        log.info("협력도 분류기 로드: %s [%s] (라벨 열 %s)", model_path, runtime, self.columns)
+
+    def tokenize(self, texts: Sequence[str]) -> List[List[int]]:
+        enc = self.tokenizer(
+            [str(t or "") for t in texts], truncation=True, max_length=self.max_length,
+            padding=False, return_attention_mask=False,
+        )
+        return enc["input_ids"]
+
+    def forward(self, input_ids: List[List[int]]) -> np.ndarray:
+        """토큰화된 배치 하나 → (n, 3) 확률 (LABELS 순서)."""
+        if self.session is not None:
+            padded = self.tokenizer.pad({"input_ids": input_ids}, return_tensors="np")
+            feeds = {name: padded[name].astype(np.int64) for name in self._onnx_inputs if name in padded}
+            if "token_type_ids" in self._onnx_inputs and "token_type_ids" not in feeds:
+                feeds["token_type_ids"] = np.zeros_like(feeds["input_ids"])
+            logits = self.session.run(None, feeds)[0].astype(np.float32)
+            logits -= logits.max(axis=-1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=-1, keepdims=True)
+        else:
+            padded = self.tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+            with torch.inference_mode():
+                logits = self.model(**padded).logits
+            probs = torch.softmax(logits.float(), dim=-1).numpy()
+        return probs[:, self.columns]
+
+    def predict_proba(self, texts: Sequence[str], batch_size: int = BATCH_SIZE,
+                      max_tokens: int = MAX_BATCH_TOKENS) -> np.ndarray:
+        """texts → (len(texts), 3) 확률, 입력 순서 그대로."""
+        out = np.zeros((len(texts), len(LABELS)), dtype=np.float32)
+        if not texts:
+            return out
+        ids = self.tokenize(texts)
+        for batch in plan_batches([len(x) for x in ids], batch_size, max_tokens):
+            out[batch] = self.forward([ids[i] for i in batch])
+        return out
+
+
+_classifier: Optional[CoopClassifier] = None
+_load_error: Optional[Exception] = None
+_lock = threading.Lock()
+
+
+def get_classifier() -> CoopClassifier:
+    """프로세스당 한 번 로드. 실패도 기억해 두고 다시 로드하지 않는다 (같은 오류를 바로 올림)."""
+    global _classifier, _load_error
+    if _classifier is None:
+        with _lock:
+            if _classifier is None:
+                if _load_error is not None:
+                    raise RuntimeError(f"협력도 분류기 로드 실패: {_load_error}")
+                try:
+                    _classifier = CoopClassifier()
+                except Exception as e:
+                    _load_error = e
+                    raise
+    return _classifier
+
+
+def load_error() -> Optional[Exception]:
+    """get_classifier() 가 실패했으면 그 오류 (아직 안 불렀거나 성공했으면 None)."""
+    return _load_error
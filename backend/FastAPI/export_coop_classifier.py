@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+export_coop_classifier.py
+----------------------------------------------------------
+📌 목적:
+협력도 분류기(COOP_MODEL)를 CPU 추론용 ONNX 로 내보낸다.
+
+  <모델>/onnx/model.onnx       : fp32 ONNX (배치 / 길이 축 동적)   → COOP_RUNTIME=onnx
+  <모델>/onnx/model.int8.onnx  : 가중치 int8 동적 양자화 ONNX      → COOP_RUNTIME=onnx-int8
+
+torch 동적 양자화(COOP_RUNTIME=torch-int8)는 로드 시 변환하므로 내보낼 파일이 없다.
+내보낸 뒤에는 bench_coop_classifier.py 로 fp32 대비 score_prob 일치도 / 처리량을 확인한다.
+
+📌 사용
+    python export_coop_classifier.py                      # COOP_MODEL 기준
+    python export_coop_classifier.py --model ./models/coop_classifier --opset 17
+    python export_coop_classifier.py --no-quantize        # fp32 ONNX 만
+"""
+
+import argparse
+import os
+
+import coop_classifier
+
+
+def export_onnx(model_path: str, out_path: str, opset: int = 17) -> str:
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+
+    names = [n for n in tokenizer.model_input_names if n in ("input_ids", "attention_mask", "token_type_ids")]
+    sample = tokenizer(["협력도 분류기 내보내기 예시 문장입니다."], return_tensors="pt")
+    args = tuple(sample[n] for n in names)
+    dynamic = {n: {0: "batch", 1: "sequence"} for n in names}
+    dynamic["logits"] = {0: "batch"}
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with torch.inference_mode():
+        torch.onnx.export(
+            model, args, out_path,
+            input_names=names, output_names=["logits"],
+            dynamic_axes=dynamic, opset_version=opset, do_constant_folding=True,
+        )
+    return out_path
+
+
+def quantize_onnx(src: str, dst: str) -> str:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(src, dst, weight_type=QuantType.QInt8)
+    return dst
+
+
+def _size_mb(path: str) -> float:
+    return os.path.getsize(path) / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="협력도 분류기 → ONNX (+ int8 동적 양자화)")
+    parser.add_argument("--model", default=coop_classifier.MODEL_PATH, help="transformers 모델 디렉터리")
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--no-quantize", action="store_true", help="int8 양자화 ONNX 는 만들지 않음")
+    args = parser.parse_args()
+
+    fp32 = export_onnx(args.model, coop_classifier.onnx_path(args.model, "onnx"), args.opset)
+    print(f"✅ ONNX (fp32): {fp32} ({_size_mb(fp32):.1f} MB)")
+    if not args.no_quantize:
+        int8 = quantize_onnx(fp32, coop_classifier.onnx_path(args.model, "onnx-int8"))
+        print(f"✅ ONNX (int8): {int8} ({_size_mb(int8):.1f} MB)")
+    print("→ python bench_coop_classifier.py 로 fp32 대비 일치도 / 처리량 확인")
+
+
+if __name__ == "__main__":
+    main()
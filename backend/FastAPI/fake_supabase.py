@@ -0,0 +1,500 @@
+"""
+fake_supabase.py
+----------------------------------------------------------
+네트워크 없이 FastAPI 앱을 돌리기 위한 인메모리 Supabase 클라이언트.
+
+main.py / build_*.py 가 실제로 쓰는 PostgREST 빌더 부분집합만 흉내낸다.
+  - table(name).select(cols, count="exact", head=False)
+  - eq / neq / gt / gte / lt / lte / like / ilike / in_ / is_ / not_.<filter>
+  - order(col, desc=False) / limit(n) / range(start, end)
+  - insert / upsert / update / delete  (+ id, created_at 자동 부여)
+  - rpc: build_user_stats.py 의 SQL 함수 (seed_user_stats / bump_user_activity / bump_user_saved)
+  - auth.get_user / sign_up / sign_in_with_password (고정 벤치 사용자)
+  - BENCH_TOKEN: BENCH_JWT_SECRET 로 서명한 HS256 토큰
+    (SUPABASE_JWT_SECRET=BENCH_JWT_SECRET 이면 jwt_verify 로컬 검증을 그대로 통과)
+
+비교는 PostgREST 처럼 문자열로 들어온 숫자도 같은 값으로 본다 ("2100001" == 2100001).
+eq 필터는 (테이블, 컬럼) 해시 인덱스를 써서 100배 데이터에서도 스텁 비용이
+측정값을 잡아먹지 않게 한다. latency 를 주면 .execute() 마다 왕복 지연을 흉내낸다.
+
+사용
+    from fake_supabase import FakeSupabase
+    import database
+    database.supabase._client = FakeSupabase({"dimension": rows, ...})
+"""
+import os
+import re
+import time
+import uuid
+import itertools
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+BENCH_USER_ID = "00000000-0000-0000-0000-00000000beef"
+BENCH_USER_EMAIL = "bench@example.com"
+BENCH_JWT_SECRET = "bench-jwt-secret"
+
+
+def _bench_token() -> str:
+    from jose import jwt
+
+    url = os.getenv("SUPABASE_URL")
+    if not url:
+        from database import SUPABASE_URL as url
+    now = int(time.time())
+    return jwt.encode({
+        "sub": BENCH_USER_ID, "email": BENCH_USER_EMAIL, "role": "authenticated",
+        "aud": "authenticated", "iss": f"{url.rstrip('/')}/auth/v1",
+        "iat": now, "exp": now + 7 * 24 * 3600,
+        "user_metadata": {"username": "bench", "full_name": "Bench User"},
+    }, BENCH_JWT_SECRET, algorithm="HS256")
+
+
+BENCH_TOKEN = _bench_token()
+
+
+def _key(v):
+    """비교용 정규화: 숫자/숫자 문자열은 같은 키로."""
+    if isinstance(v, bool) or v is None:
+        return v
+    if isinstance(v, (int, float)):
+        return str(int(v)) if float(v).is_integer() else str(v)
+    s = str(v).strip()
+    if s.lstrip("-").isdigit():
+        return str(int(s))
+    return s
+
+
+def _num(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _like_regex(pattern: str, flags=0):
+    parts = [".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in str(pattern)]
+    return re.compile("^" + "".join(parts) + "$", flags | re.DOTALL)
+
+
+def _cmp(op):
+    def check(a, b):
+        na, nb = _num(a), _num(b)
+        if na is not None and nb is not None:
+            return op(na, nb)
+        if a is None or b is None:
+            return False
+        return op(str(a), str(b))
+    return check
+
+
+_COMPARE = {
+    "gt": _cmp(lambda a, b: a > b),
+    "gte": _cmp(lambda a, b: a >= b),
+    "lt": _cmp(lambda a, b: a < b),
+    "lte": _cmp(lambda a, b: a <= b),
+}
+
+
+# ======================================================================
+# 테이블 저장소
+# ======================================================================
+class _Table:
+    def __init__(self, rows: List[dict]):
+        self.rows = list(rows)
+        self.version = 0
+        self._indexes: Dict[str, tuple] = {}
+        self._next_id = itertools.count(
+            max((r["id"] for r in self.rows if isinstance(r.get("id"), int)), default=0) + 1
+        )
+
+    def index(self, col: str) -> Dict[object, List[int]]:
+        cached = self._indexes.get(col)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        idx: Dict[object, List[int]] = {}
+        for i, r in enumerate(self.rows):
+            idx.setdefault(_key(r.get(col)), []).append(i)
+        self._indexes[col] = (self.version, idx)
+        return idx
+
+    def touch(self):
+        self.version += 1
+
+
+# ======================================================================
+# 쿼리 빌더
+# ======================================================================
+class _Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _NotProxy:
+    def __init__(self, query: "_FakeQuery"):
+        self._q = query
+
+    def __getattr__(self, name):
+        def add(*args):
+            self._q._filter(name, args, negate=True)
+            return self._q
+        return add
+
+
+class _FakeQuery:
+    def __init__(self, owner: "FakeSupabase", name: str):
+        self._owner = owner
+        self._name = name
+        self._op = "select"
+        self._cols: Optional[List[str]] = None
+        self._count = None
+        self._head = False
+        self._filters = []       # (op, col, value, negate)
+        self._order = []         # (col, desc)
+        self._limit = None
+        self._offset = 0
+        self._payload = None
+        self._single = False
+
+    # --- 동작 ---
+    def select(self, columns: str = "*", count: Optional[str] = None, head: bool = False):
+        cols = [c.strip() for c in columns.split(",") if c.strip()]
+        self._cols = None if not cols or "*" in cols else cols
+        self._count, self._head = count, head
+        return self
+
+    def insert(self, rows, **_):
+        self._op, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: str = "id", **_):
+        self._op, self._payload = "upsert", (rows, [c.strip() for c in on_conflict.split(",")])
+        return self
+
+    def update(self, values: dict, **_):
+        self._op, self._payload = "update", values
+        return self
+
+    def delete(self, **_):
+        self._op = "delete"
+        return self
+
+    # --- 필터 ---
+    def _filter(self, op, args, negate=False):
+        col, value = args[0], args[1] if len(args) > 1 else None
+        self._filters.append((op, col, value, negate))
+
+    def eq(self, col, value):
+        self._filter("eq", (col, value))
+        return self
+
+    def neq(self, col, value):
+        self._filter("neq", (col, value))
+        return self
+
+    def gt(self, col, value):
+        self._filter("gt", (col, value))
+        return self
+
+    def gte(self, col, value):
+        self._filter("gte", (col, value))
+        return self
+
+    def lt(self, col, value):
+        self._filter("lt", (col, value))
+        return self
+
+    def lte(self, col, value):
+        self._filter("lte", (col, value))
+        return self
+
+    def like(self, col, pattern):
+        self._filter("like", (col, pattern))
+        return self
+
+    def ilike(self, col, pattern):
+        self._filter("ilike", (col, pattern))
+        return self
+
+    def in_(self, col, values):
+        self._filter("in_", (col, list(values)))
+        return self
+
+    def is_(self, col, value):
+        self._filter("is_", (col, value))
+        return self
+
+    @property
+    def not_(self):
+        return _NotProxy(self)
+
+    # --- 정렬 / 페이지 ---
+    def order(self, col, desc: bool = False, **_):
+        self._order.append((col, desc))
+        return self
+
+    def limit(self, n: int, **_):
+        self._limit = n
+        return self
+
+    def range(self, start: int, end: int, **_):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self):
+        self._single, self._limit = True, 1
+        return self
+
+    def maybe_single(self):
+        return self.single()
+
+    # --- 실행 ---
+    def _predicate(self, op, col, value):
+        if op == "eq":
+            k = _key(value)
+            return lambda r: _key(r.get(col)) == k
+        if op == "neq":
+            k = _key(value)
+            return lambda r: _key(r.get(col)) != k
+        if op in _COMPARE:
+            f = _COMPARE[op]
+            return lambda r: f(r.get(col), value)
+        if op in ("like", "ilike"):
+            rx = _like_regex(value, re.IGNORECASE if op == "ilike" else 0)
+            return lambda r: r.get(col) is not None and rx.match(str(r.get(col))) is not None
+        if op == "in_":
+            keys = {_key(v) for v in value}
+            return lambda r: _key(r.get(col)) in keys
+        if op == "is_":
+            target = None if value in (None, "null") else value
+            return lambda r: r.get(col) is target or r.get(col) == target
+        raise NotImplementedError(f"fake_supabase: 지원하지 않는 필터 {op}")
+
+    def _matched(self, table: _Table) -> List[int]:
+        filters = list(self._filters)
+        candidates = None
+        for i, (op, col, value, negate) in enumerate(filters):
+            if op == "eq" and not negate:
+                candidates = table.index(col).get(_key(value), [])
+                filters.pop(i)
+                break
+        if candidates is None:
+            candidates = range(len(table.rows))
+        preds = [(self._predicate(op, col, value), negate) for op, col, value, negate in filters]
+        rows = table.rows
+        return [i for i in candidates if all(p(rows[i]) != neg for p, neg in preds)]
+
+    def _sorted(self, rows: List[dict]) -> List[dict]:
+        for col, desc in reversed(self._order):
+            present = [r for r in rows if r.get(col) is not None]
+            missing = [r for r in rows if r.get(col) is None]
+            present.sort(key=lambda r: (_num(r[col]) is None, _num(r[col]) or 0, str(r[col])), reverse=desc)
+            # PostgREST 기본값: asc → nulls last, desc → nulls first
+            rows = missing + present if desc else present + missing
+        return rows
+
+    def _project(self, r: dict) -> dict:
+        if self._cols is None:
+            return dict(r)
+        return {c: r.get(c) for c in self._cols}
+
+    def execute(self):
+        if self._owner.latency:
+            time.sleep(self._owner.latency)
+        table = self._owner._table(self._name)
+
+        if self._op == "insert":
+            rows = self._payload if isinstance(self._payload, list) else [self._payload]
+            out = [self._owner._stamp(table, r) for r in rows]
+            table.rows.extend(out)
+            table.touch()
+            return _Response([dict(r) for r in out])
+
+        if self._op == "upsert":
+            rows, keys = self._payload
+            rows = rows if isinstance(rows, list) else [rows]
+            out = []
+            for r in rows:
+                hit = next((x for x in table.rows if all(_key(x.get(k)) == _key(r.get(k)) for k in keys)), None)
+                if hit is not None:
+                    hit.update(r)
+                    out.append(hit)
+                else:
+                    new = self._owner._stamp(table, r)
+                    table.rows.append(new)
+                    out.append(new)
+            table.touch()
+            return _Response([dict(r) for r in out])
+
+        matched = self._matched(table)
+
+        if self._op == "update":
+            for i in matched:
+                table.rows[i].update(self._payload)
+            table.touch()
+            return _Response([dict(table.rows[i]) for i in matched])
+
+        if self._op == "delete":
+            gone = set(matched)
+            removed = [table.rows[i] for i in matched]
+            table.rows = [r for i, r in enumerate(table.rows) if i not in gone]
+            table.touch()
+            return _Response([dict(r) for r in removed])
+
+        rows = self._sorted([table.rows[i] for i in matched])
+        total = len(rows) if self._count else None
+        end = None if self._limit is None else self._offset + self._limit
+        rows = rows[self._offset:end]
+        if self._head:
+            return _Response([], total)
+        data = [self._project(r) for r in rows]
+        if self._single:
+            return _Response(data[0] if data else None, total)
+        return _Response(data, total)
+
+
+# ======================================================================
+# RPC (build_user_stats.py 의 SQL 함수와 같은 동작)
+# ======================================================================
+def _rpc_seed_user_stats(db: "FakeSupabase", p_user) -> bool:
+    import build_user_stats as us
+
+    stats = db._table(us.STATS_TABLE)
+    if any(_key(r.get("user_id")) == _key(p_user) for r in stats.rows):
+        return False
+    logs = [r for r in db._table("user_logs").rows if _key(r.get("user_id")) == _key(p_user)]
+    marks = [r for r in db._table("user_bookmarks").rows if _key(r.get("user_id")) == _key(p_user)]
+    rows, days = us.build_user_stats(logs, marks)
+    stats.rows.append(rows[0] if rows else {
+        "user_id": p_user, "total_activities": 0, "total_saved": 0,
+        "recent_activities": [], "saved_items": [], "last_activity_at": None,
+    })
+    stats.touch()
+    daily = db._table(us.DAILY_TABLE)
+    daily.rows.extend(days)
+    daily.touch()
+    return True
+
+
+def _stats_row(db: "FakeSupabase", user_id) -> dict:
+    import build_user_stats as us
+
+    return next(r for r in db._table(us.STATS_TABLE).rows if _key(r.get("user_id")) == _key(user_id))
+
+
+def _rpc_bump_user_activity(db: "FakeSupabase", p_users, p_daily) -> None:
+    import build_user_stats as us
+
+    seeded = set()
+    for u in p_users:
+        if _rpc_seed_user_stats(db, u["user_id"]):
+            seeded.add(_key(u["user_id"]))
+            continue
+        row = _stats_row(db, u["user_id"])
+        row["total_activities"] += u["n"]
+        row["recent_activities"] = us._newest_first(u["recent"] + row["recent_activities"])[:us.RECENT_N]
+        row["last_activity_at"] = max(filter(None, [row["last_activity_at"], u["last_at"]]), default=None)
+    daily = db._table(us.DAILY_TABLE)
+    for d in p_daily:
+        if _key(d["user_id"]) in seeded:
+            continue
+        key = (_key(d["user_id"]), d["day"], d["activity_type"])
+        hit = next((r for r in daily.rows if (_key(r["user_id"]), r["day"], r["activity_type"]) == key), None)
+        if hit is not None:
+            hit["n"] += d["n"]
+        else:
+            daily.rows.append(dict(d))
+    db._table(us.STATS_TABLE).touch()
+    daily.touch()
+
+
+def _rpc_bump_user_saved(db: "FakeSupabase", p_user, p_delta, p_item) -> None:
+    import build_user_stats as us
+
+    if _rpc_seed_user_stats(db, p_user):
+        return
+    row = _stats_row(db, p_user)
+    row["total_saved"] = max(row["total_saved"] + p_delta, 0)
+    if p_delta > 0:
+        row["saved_items"] = [p_item] + row["saved_items"]
+    else:
+        row["saved_items"] = [r for r in row["saved_items"] if _key(r.get("id")) != _key(p_item.get("id"))]
+    db._table(us.STATS_TABLE).touch()
+
+
+_RPC_FUNCTIONS = {
+    "seed_user_stats": _rpc_seed_user_stats,
+    "bump_user_activity": _rpc_bump_user_activity,
+    "bump_user_saved": _rpc_bump_user_saved,
+}
+
+
+class _FakeRpc:
+    def __init__(self, owner: "FakeSupabase", fn: str, params: dict):
+        if fn not in _RPC_FUNCTIONS:
+            raise ValueError(f"알 수 없는 rpc: {fn}")
+        self._owner, self._fn, self._params = owner, _RPC_FUNCTIONS[fn], params
+
+    def execute(self):
+        if self._owner.latency:
+            time.sleep(self._owner.latency)
+        return _Response(self._fn(self._owner, **self._params))
+
+
+# ======================================================================
+# 인증 (고정 사용자)
+# ======================================================================
+class _FakeAuth:
+    def __init__(self):
+        self.user = SimpleNamespace(
+            id=BENCH_USER_ID, email=BENCH_USER_EMAIL,
+            user_metadata={"username": "bench", "full_name": "Bench User"},
+        )
+
+    def get_user(self, token: str):
+        if token != BENCH_TOKEN:
+            raise ValueError("invalid token")
+        return SimpleNamespace(user=self.user)
+
+    def sign_in_with_password(self, credentials: dict):
+        return SimpleNamespace(user=self.user, session=SimpleNamespace(access_token=BENCH_TOKEN))
+
+    def sign_up(self, credentials: dict):
+        opts = (credentials.get("options") or {}).get("data") or {}
+        user = SimpleNamespace(id=str(uuid.uuid4()), email=credentials.get("email"), user_metadata=opts)
+        return SimpleNamespace(user=user, session=None)
+
+
+class FakeSupabase:
+    """supabase.Client 대역. tables: {테이블명: [행 dict, ...]} (행은 그대로 보관, 응답은 복사본)."""
+
+    def __init__(self, tables: Optional[Dict[str, List[dict]]] = None, latency: float = 0.0):
+        self._tables = {name: _Table(rows) for name, rows in (tables or {}).items()}
+        self.latency = latency
+        self.auth = _FakeAuth()
+
+    def _table(self, name: str) -> _Table:
+        if name not in self._tables:
+            self._tables[name] = _Table([])
+        return self._tables[name]
+
+    @staticmethod
+    def _stamp(table: _Table, row: dict) -> dict:
+        new = dict(row)
+        new.setdefault("id", next(table._next_id))
+        new.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        return new
+
+    def table(self, name: str) -> _FakeQuery:
+        return _FakeQuery(self, name)
+
+    def from_(self, name: str) -> _FakeQuery:
+        return self.table(name)
+
+    def rpc(self, fn: str, params: Optional[dict] = None) -> _FakeRpc:
+        return _FakeRpc(self, fn, params or {})
+
+    def row_counts(self) -> Dict[str, int]:
+        return {name: len(t.rows) for name, t in self._tables.items()}
@@ -0,0 +1,130 @@
+"""
+fast_json.py
+----------------------------------------------------------
+DataFrame / NumPy 를 바로 JSON 바이트로 쓰는 응답 클래스.
+
+기존 경로: df.to_dict("records") → jsonable_encoder 가 dict 를 다시 한 번 순회 → json.dumps
+  (+ 빌더마다 NaN → None 변환 루프)
+이 모듈: 엔드포인트가 FastJSONResponse({... "rows": df ...}) 를 돌려주면
+  - jsonable_encoder 를 거치지 않고 (Response 객체는 FastAPI 가 그대로 내보냄)
+  - DataFrame 은 컬럼 단위 tolist() 로 한 번만 파이썬 객체화, NumPy 배열/스칼라는 orjson 이 직접 직렬화
+  - NaN / NaT / ±inf → null 을 인코더가 처리 (빌더에서 변환할 필요 없음)
+
+orjson 이 없으면 표준 json 으로 동작한다 (NaN → null 은 같은 결과, 속도만 느림).
+
+사용
+    from fast_json import FastJSONResponse
+    return FastJSONResponse({"count": len(df), "bill_stats": df})
+
+    df_records(df)   # Supabase upsert 등 응답 밖에서 JSON-safe records 가 필요할 때
+"""
+import json
+import math
+import time
+import datetime as _dt
+from typing import Any, List
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+import metrics
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+
+_ORJSON_OPTS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+# ======================================================================
+# DataFrame → records (한 번의 변환)
+# ======================================================================
+def _column_values(s: pd.Series) -> list:
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        # NaT → None, 나머지는 ISO 문자열
+        return [None if v is pd.NaT else v.isoformat() for v in s]
+    return s.tolist()
+
+
+def df_records(df: pd.DataFrame, nan_to_none: bool = True) -> List[dict]:
+    """
+    df.to_dict("records") 와 같은 모양. 컬럼별 tolist() 를 zip 해서 만든다.
+    nan_to_none=True 면 NaN/NaT 를 None 으로 (NaN 이 있는 컬럼만 마스크).
+    """
+    cols = [str(c) for c in df.columns]
+    values = []
+    for c in df.columns:
+        s = df[c]
+        vals = _column_values(s)
+        if nan_to_none and s.dtype.kind in "fcO" and s.isna().any():
+            mask = s.isna().tolist()
+            vals = [None if m else v for v, m in zip(vals, mask)]
+        values.append(vals)
+    return [dict(zip(cols, row)) for row in zip(*values)]
+
+
+# ======================================================================
+# 인코더
+# ======================================================================
+def _default(obj: Any):
+    """orjson / json 이 모르는 타입 처리."""
+    if isinstance(obj, pd.DataFrame):
+        # orjson 은 float NaN 을 null 로 쓰므로 마스크 단계가 필요 없다
+        return df_records(obj, nan_to_none=orjson is None)
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, (_dt.datetime, _dt.date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _sanitize(obj: Any):
+    """표준 json 대체 경로: NaN/inf → None (orjson 의 동작과 맞춤)."""
+    if isinstance(obj, float):
+        return None if math.isnan(obj) or math.isinf(obj) else obj
+    if isinstance(obj, dict):
+        return {k: _sanitize(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_sanitize(v) for v in obj]
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index, np.ndarray, np.generic, set, frozenset)) or obj is pd.NaT or obj is pd.NA:
+        return _sanitize(_default(obj))
+    return obj
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTS)
+    return json.dumps(
+        _sanitize(content), default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    DataFrame / NumPy 를 담은 dict 를 바로 직렬화하는 응답.
+    엔드포인트 안에서 만들어지면 직렬화 시간을 /metrics 의 serialize 구간에 더한다
+    (엔드포인트 밖 - default_response_class 경로 - 은 MetricsMiddleware 가 이미 잰다).
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if not metrics.endpoint_running():
+            return dumps(content)
+        t0 = time.perf_counter()
+        try:
+            return dumps(content)
+        finally:
+            metrics.add_phase("serialize", time.perf_counter() - t0)
@@ -0,0 +1,260 @@
+"""
+fuzzy.py
+----------------------------------------------------------
+오타를 허용하는 의원 이름 / 법안명 매칭 (자모 단위 편집 거리).
+
+검색 인덱스(search_index.py)와 ilike 는 부분 문자열이 정확히 맞아야 해서
+"김철주"(← 김철수), "조세특례재한법"(← 조세특례제한법) 같은 자모 하나짜리 오타에 결과가 없다.
+이 모듈은 정확 검색이 비었을 때의 대체 경로다.
+
+  - 한글 음절을 자모로 분해 ("김" → "ㄱㅣㅁ"), 겹모음/겹받침은 입력 순서대로 한 번 더 나눈다
+    ("ㅘ" → "ㅗㅏ", "ㄳ" → "ㄱㅅ") → 편집 거리 1 ≈ 키 하나 오타
+  - 후보 색인: 자모 bigram → 키 번호. 거리 k 이내 문자열은 검색어의 서로 다른 bigram 중
+    최소 (개수 - 2k) 개를 공유하므로 (count filter) 그 미만인 키는 거리 계산 없이 버린다.
+    길이 차이가 k 보다 큰 키도 버린다. 남은 후보만 띠(band) 제한 편집 거리로 확인한다.
+  - 의원: 이름 전체와 비교. 법안: 법안명 단어 사전과 단어 단위로 비교
+    (단어의 앞부분과도 비교하므로 "조세특레" → "조세특례제한법"),
+    검색어의 모든 단어가 맞은 법안만, 거리 합이 작은 순.
+  - 허용 거리: 자모 길이에 비례 (max_distance), 한 음절 검색어는 오타 허용 없음.
+
+search_index 가 읽어 둔 행으로 만들고, 검색 인덱스가 새로 만들어지면 같이 다시 만든다.
+
+사용
+    import fuzzy
+    fuzzy.legislators("김철주")      # [(1, {"member_id": ..., "name": "김철수", ...}), ...]
+    fuzzy.bills("조세특례재한법")     # [(1, {"bill_id": ..., "bill_name": ...}), ...]
+"""
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import search_index
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+_HANGUL_FIRST, _HANGUL_LAST = 0xAC00, 0xD7A3
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+         "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+# 겹모음 / 겹받침 → 입력 순서
+_SPLIT = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+_SYLLABLE = [
+    "".join(_SPLIT.get(j, j) for j in (_CHO[i // 588], _JUNG[(i % 588) // 28], _JONG[i % 28]))
+    for i in range(_HANGUL_LAST - _HANGUL_FIRST + 1)
+]
+_WORD_RE = re.compile(r"[0-9a-z가-힣]+")
+
+DEFAULT_LIMIT = 10
+
+
+# ======================================================================
+# 자모 분해 / 편집 거리
+# ======================================================================
+def jamo(text: str) -> str:
+    """소문자 + 공백 제거 후 한글 음절을 자모열로."""
+    out = []
+    for ch in "".join(str(text).lower().split()):
+        code = ord(ch)
+        out.append(_SYLLABLE[code - _HANGUL_FIRST] if _HANGUL_FIRST <= code <= _HANGUL_LAST else ch)
+    return "".join(out)
+
+
+def max_distance(length: int) -> int:
+    """자모 길이 → 허용 편집 거리 (한 음절 ≈ 3자모 이하는 0, 음절 셋 ≈ 9자모까지 1, 그 이상 2)."""
+    if length <= 3:
+        return 0
+    return 1 if length <= 9 else 2
+
+
+def _grams(s: str) -> set:
+    return {s[i:i + 2] for i in range(len(s) - 1)} or {s}
+
+
+def distance(a: str, b: str, k: int, prefix: bool = False) -> int:
+    """
+    a, b 의 편집 거리 (k 초과면 k + 1).
+    prefix=True 면 b 의 앞부분 중 a 와 가장 가까운 것과의 거리.
+    """
+    la, lb = len(a), len(b)
+    if not prefix and abs(la - lb) > k:
+        return k + 1
+    if prefix:
+        lb = min(lb, la + k)
+    big = k + 1
+    prev = list(range(lb + 1))
+    for i in range(1, la + 1):
+        ca = a[i - 1]
+        lo, hi = max(1, i - k), min(lb, i + k)
+        cur = [big] * (lb + 1)
+        if lo == 1:
+            cur[0] = i
+        for j in range(lo, hi + 1):
+            cost = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < cost:
+                cost = prev[j] + 1
+            if cur[j - 1] + 1 < cost:
+                cost = cur[j - 1] + 1
+            cur[j] = cost
+        if min(cur[lo - 1:hi + 1]) > k:
+            return big
+        prev = cur
+    d = min(prev[max(0, la - k):]) if prefix else prev[lb]
+    return min(d, big)
+
+
+# ======================================================================
+# 자모 bigram 후보 색인
+# ======================================================================
+class _GramIndex:
+    def __init__(self, keys: Sequence[str]):
+        self.keys = list(keys)
+        self.lens = np.fromiter((len(k) for k in self.keys), dtype=np.int32, count=len(self.keys))
+        postings: Dict[str, List[int]] = {}
+        for kid, key in enumerate(self.keys):
+            for g in _grams(key):
+                postings.setdefault(g, []).append(kid)
+        self.postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+
+    def search(self, q: str, k: int, prefix: bool = False) -> List[Tuple[int, int]]:
+        """거리 k 이내 키 → [(거리, 키 번호)] (거리순)."""
+        if not self.keys:
+            return []
+        grams = _grams(q)
+        need = max(1, len(grams) - 2 * k)
+        counts = np.zeros(len(self.keys), dtype=np.int16)
+        for g in grams:
+            ids = self.postings.get(g)
+            if ids is not None:
+                counts[ids] += 1    # 한 목록 안에 같은 키는 한 번만 있으므로 fancy index 로 더해도 된다
+        lq = len(q)
+        ok = (counts >= need) & (self.lens >= lq - k)
+        if not prefix:
+            ok &= self.lens <= lq + k
+        out = []
+        for kid in np.flatnonzero(ok).tolist():
+            d = distance(q, self.keys[kid], k, prefix)
+            if d <= k:
+                out.append((d, kid))
+        out.sort()
+        return out
+
+
+# ======================================================================
+# 의원 / 법안 매처
+# ======================================================================
+class FuzzyMatcher:
+    def __init__(self, rows: Dict[str, List[dict]]):
+        t0 = time.perf_counter()
+        self.legislator_rows = rows.get("legislator", [])
+        self.bill_rows = rows.get("bill", [])
+
+        # 의원: 자모 이름 키 → 행 번호들
+        name_keys: Dict[str, List[int]] = {}
+        for pos, r in enumerate(self.legislator_rows):
+            key = jamo(r.get("name") or "")
+            if key:
+                name_keys.setdefault(key, []).append(pos)
+        self.names = _GramIndex(list(name_keys))
+        self.name_rows = list(name_keys.values())
+
+        # 법안: 법안명 단어(자모) 사전 → 법안 행 번호 집합
+        vocab: Dict[str, set] = {}
+        for pos, r in enumerate(self.bill_rows):
+            for w in _WORD_RE.findall(str(r.get("bill_name") or "").lower()):
+                vocab.setdefault(jamo(w), set()).add(pos)
+        self.words = _GramIndex(list(vocab))
+        self.word_bills = list(vocab.values())
+        self.build_seconds = time.perf_counter() - t0
+
+    def legislators(self, q: str, limit: int = DEFAULT_LIMIT, max_dist: Optional[int] = None) -> List[Tuple[int, dict]]:
+        key = jamo(q)
+        if not key:
+            return []
+        k = max_distance(len(key)) if max_dist is None else max_dist
+        out = []
+        for d, kid in self.names.search(key, k):
+            out.extend((d, self.legislator_rows[pos]) for pos in self.name_rows[kid])
+            if len(out) >= limit:
+                break
+        return out[:limit]
+
+    def bills(self, q: str, limit: int = DEFAULT_LIMIT, max_dist: Optional[int] = None) -> List[Tuple[int, dict]]:
+        words = [jamo(w) for w in _WORD_RE.findall(str(q).lower())]
+        if not words:
+            return []
+        # 단어마다 후보 단어를 먼저 찾고, 해당 법안 수가 적은 단어부터 교집합 ("일부개정" 같은 흔한 단어는 마지막)
+        per_word = []
+        for w in words:
+            k = max_distance(len(w)) if max_dist is None else max_dist
+            hits = self.words.search(w, k, prefix=True)
+            if not hits:
+                return []
+            per_word.append((sum(len(self.word_bills[kid]) for _, kid in hits), hits))
+        per_word.sort(key=lambda x: x[0])
+
+        best: Dict[int, int] = {}
+        for d, kid in per_word[0][1]:
+            for pos in self.word_bills[kid]:
+                if pos not in best:
+                    best[pos] = d
+        for _, hits in per_word[1:]:
+            merged = {}
+            for pos, total in best.items():
+                for d, kid in hits:     # 거리순이므로 처음 맞는 것이 최소
+                    if pos in self.word_bills[kid]:
+                        merged[pos] = total + d
+                        break
+            best = merged
+            if not best:
+                return []
+        rows = self.bill_rows
+        ranked = sorted(best, key=lambda p: (best[p], len(str(rows[p].get("bill_name") or "")), p))
+        return [(best[p], rows[p]) for p in ranked[:limit]]
+
+    def stats(self) -> dict:
+        return {
+            "names": len(self.names.keys),
+            "bill_words": len(self.words.keys),
+            "build_seconds": round(self.build_seconds, 3),
+        }
+
+
+# ======================================================================
+# search_index 행 → FuzzyMatcher (인덱스가 바뀌면 다시 생성)
+# ======================================================================
+_cache: Tuple[Optional[object], Optional[FuzzyMatcher]] = (None, None)
+_lock = threading.Lock()
+
+
+def get_matcher() -> Optional[FuzzyMatcher]:
+    global _cache
+    idx = search_index.get_index()
+    if idx is None:
+        return None
+    if _cache[0] is idx:
+        return _cache[1]
+    with _lock:
+        if _cache[0] is not idx:
+            fm = FuzzyMatcher(idx.rows)
+            log.info("오타 허용 매처 생성: %s", fm.stats())
+            _cache = (idx, fm)
+    return _cache[1]
+
+
+def legislators(q: str, limit: int = DEFAULT_LIMIT) -> List[Tuple[int, dict]]:
+    fm = get_matcher()
+    return fm.legislators(q, limit) if fm is not None else []
+
+
+def bills(q: str, limit: int = DEFAULT_LIMIT) -> List[Tuple[int, dict]]:
+    fm = get_matcher()
+    return fm.bills(q, limit) if fm is not None else []
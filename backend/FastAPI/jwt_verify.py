@@ -0,0 +1,246 @@
+"""
+jwt_verify.py
+----------------------------------------------------------
+Supabase 액세스 토큰(Bearer) 로컬 검증 — 보호된 요청마다 하던 supabase.auth.get_user() 왕복 제거.
+
+get_current_user() 는 요청마다 Supabase Auth 서버에 토큰을 보내 사용자를 받아 왔다.
+Supabase 액세스 토큰은 서명된 JWT 라서 서명 / 만료 / aud / iss 는 로컬에서 확인할 수 있다.
+
+  - 서명 키
+      HS256 (기존 프로젝트) : SUPABASE_JWT_SECRET 환경변수
+      RS256 / ES256 (비대칭 키) : {SUPABASE_URL}/auth/v1/.well-known/jwks.json 을 JWKS_TTL 동안 캐시,
+                                   모르는 kid 가 오면 (키 교체) JWKS_MIN_REFRESH 간격으로 다시 받는다
+  - 검증 통과 토큰은 TOKEN_CACHE_SECONDS(기본 60초, 토큰 만료 시각을 넘지 않음) 동안
+    토큰 → 사용자 캐시 (최대 TOKEN_CACHE_SIZE 개, 오래된 것부터 제거)
+  - 로컬로 판단할 수 없을 때만 원격 호출 (remote): HS256 인데 비밀키가 없음 / JWKS 를 못 받음 / kid 없음
+    서명 불일치 · 만료 · aud/iss 불일치는 원격 호출 없이 바로 InvalidToken
+  - 돌려주는 TokenUser 는 엔드포인트가 쓰는 id / email / user_metadata 를 supabase User 와 같은 이름으로 가진다.
+
+주의: 로컬 검증은 로그아웃 / 세션 폐기를 토큰 만료 전까지 알 수 없다 (Supabase 액세스 토큰 수명은 짧다).
+JWT_LOCAL_VERIFY=0 이면 예전처럼 매번 원격 호출.
+
+사용
+    import jwt_verify
+    user = jwt_verify.verify(token, remote=lambda t: supabase.auth.get_user(t).user)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import httpx
+from jose import JWTError, jwt
+
+import metrics
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+ENABLED = os.getenv("JWT_LOCAL_VERIFY", "1") != "0"
+JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+JWKS_TTL = float(os.getenv("JWKS_TTL", "600"))
+JWKS_MIN_REFRESH = 30.0
+TOKEN_CACHE_SECONDS = float(os.getenv("TOKEN_CACHE_SECONDS", "60"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+LEEWAY = 5   # 서버 간 시계 오차 허용(초)
+
+ASYMMETRIC_ALGS = ("RS256", "ES256")
+
+AUTH_RESULTS = {
+    k: metrics.Counter(f"auth_{k}_total", h) for k, h in (
+        ("cache_hit", "토큰 캐시로 인증한 요청 수"),
+        ("local", "로컬 서명 검증으로 인증한 요청 수"),
+        ("remote", "Supabase Auth 원격 호출로 인증한 요청 수"),
+        ("rejected", "인증 실패 요청 수"),
+    )
+}
+metrics.register(*AUTH_RESULTS.values())
+
+
+class InvalidToken(Exception):
+    """서명 / 만료 / 형식 오류 (401)."""
+
+
+class _CannotVerifyLocally(Exception):
+    """로컬 검증 키가 없음 → 원격 확인으로 넘김."""
+
+
+class TokenUser:
+    """검증된 JWT 클레임에서 만든 사용자 (supabase User 와 같은 속성 이름)."""
+
+    def __init__(self, claims: dict):
+        self.claims = claims
+        self.id = claims.get("sub")
+        self.email = claims.get("email")
+        self.phone = claims.get("phone")
+        self.role = claims.get("role")
+        self.user_metadata = claims.get("user_metadata") or {}
+        self.app_metadata = claims.get("app_metadata") or {}
+
+    def __repr__(self):
+        return f"TokenUser(id={self.id!r}, email={self.email!r})"
+
+
+# ======================================================================
+# JWKS 캐시
+# ======================================================================
+def _supabase_url() -> str:
+    url = os.getenv("SUPABASE_URL")
+    if url:
+        return url.rstrip("/")
+    from database import SUPABASE_URL
+    return SUPABASE_URL.rstrip("/")
+
+
+class _JWKS:
+    def __init__(self):
+        self.keys: Dict[str, dict] = {}
+        self.fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fetch(self):
+        url = f"{_supabase_url()}/auth/v1/.well-known/jwks.json"
+        res = httpx.get(url, timeout=5.0)
+        res.raise_for_status()
+        self.keys = {k.get("kid"): k for k in res.json().get("keys", [])}
+        self.fetched_at = time.monotonic()
+        log.info("JWKS 갱신: 키 %d개", len(self.keys))
+
+    def get(self, kid: Optional[str]) -> dict:
+        age = time.monotonic() - self.fetched_at
+        key = self.keys.get(kid)
+        if key is not None and age < JWKS_TTL:
+            return key
+        with self._lock:
+            age = time.monotonic() - self.fetched_at
+            key = self.keys.get(kid)
+            # 만료됐거나, 모르는 kid (키 교체) 인데 최근에 받은 적이 없으면 다시 받는다
+            if age >= JWKS_TTL or (key is None and age >= JWKS_MIN_REFRESH):
+                try:
+                    self._fetch()
+                except Exception as e:
+                    if key is None:
+                        raise _CannotVerifyLocally(f"JWKS 조회 실패: {e}")
+                    log.warning("JWKS 갱신 실패 (이전 키 사용): %s", e)
+                key = self.keys.get(kid, key)
+        if key is None:
+            raise _CannotVerifyLocally(f"JWKS 에 없는 kid: {kid}")
+        return key
+
+
+_jwks = _JWKS()
+
+
+# ======================================================================
+# 검증
+# ======================================================================
+def decode(token: str) -> dict:
+    """서명 / exp / aud / iss 검증 후 클레임. 키가 없으면 _CannotVerifyLocally."""
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError as e:
+        raise InvalidToken(f"잘못된 토큰 형식: {e}")
+    alg = header.get("alg")
+    if alg == "HS256":
+        if not JWT_SECRET:
+            raise _CannotVerifyLocally("SUPABASE_JWT_SECRET 미설정")
+        key = JWT_SECRET
+    elif alg in ASYMMETRIC_ALGS:
+        key = _jwks.get(header.get("kid"))
+    else:
+        raise InvalidToken(f"지원하지 않는 서명 알고리즘: {alg}")
+    try:
+        return jwt.decode(
+            token, key, algorithms=[alg], audience=AUDIENCE, issuer=f"{_supabase_url()}/auth/v1",
+            options={"leeway": LEEWAY},
+        )
+    except JWTError as e:
+        raise InvalidToken(str(e))
+
+
+_cache: "OrderedDict[str, tuple]" = OrderedDict()   # token → (user, 캐시 만료 시각)
+_cache_lock = threading.Lock()
+
+
+def _cache_get(token: str):
+    now = time.time()
+    with _cache_lock:
+        hit = _cache.get(token)
+        if hit is None:
+            return None
+        if hit[1] <= now:
+            del _cache[token]
+            return None
+        _cache.move_to_end(token)
+        return hit[0]
+
+
+def _cache_put(token: str, user, exp: Optional[float]):
+    until = time.time() + TOKEN_CACHE_SECONDS
+    if exp is not None:
+        until = min(until, float(exp))
+    with _cache_lock:
+        _cache[token] = (user, until)
+        _cache.move_to_end(token)
+        while len(_cache) > TOKEN_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def verify(token: str, remote: Optional[Callable[[str], object]] = None):
+    """
+    Bearer 토큰 → 사용자 (TokenUser, 원격 확인이면 supabase User).
+    실패하면 InvalidToken. remote 는 로컬 검증이 불가능할 때만 호출한다.
+    """
+    if not token:
+        AUTH_RESULTS["rejected"].inc()
+        raise InvalidToken("토큰이 없습니다")
+    user = _cache_get(token) if ENABLED else None
+    if user is not None:
+        AUTH_RESULTS["cache_hit"].inc()
+        return user
+
+    claims = None
+    if ENABLED:
+        try:
+            claims = decode(token)
+        except InvalidToken:
+            AUTH_RESULTS["rejected"].inc()
+            raise
+        except _CannotVerifyLocally as e:
+            if remote is None:
+                AUTH_RESULTS["rejected"].inc()
+                raise InvalidToken(str(e))
+            log.debug("로컬 검증 불가 → 원격 확인: %s", e)
+
+    if claims is not None:
+        user = TokenUser(claims)
+        AUTH_RESULTS["local"].inc()
+        _cache_put(token, user, claims.get("exp"))
+        return user
+
+    if remote is None:
+        AUTH_RESULTS["rejected"].inc()
+        raise InvalidToken("토큰을 확인할 수 없습니다")
+    try:
+        user = remote(token)
+    except Exception as e:
+        AUTH_RESULTS["rejected"].inc()
+        raise InvalidToken(str(e))
+    if not user:
+        AUTH_RESULTS["rejected"].inc()
+        raise InvalidToken("Token không hợp lệ")
+    AUTH_RESULTS["remote"].inc()
+    if ENABLED:
+        try:
+            exp = jwt.get_unverified_claims(token).get("exp")
+        except JWTError:
+            exp = None
+        _cache_put(token, user, exp)
+    return user
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -1,20 +1,44 @@
 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.security import OAuth2PasswordBearer
 from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional
+import os
 import re
+import asyncio
+import anyio
+from datetime import date
 import schemas 
 from database import supabase 
 import random 
 from fastapi import FastAPI, Depends, HTTPException, status, Query, APIRouter
 import pandas as pd
 from build_member_stats import build_member_stats
+import build_party_summary as party_summary
+import build_user_stats as user_stats
 from sqlalchemy.orm import Session
 from util_common import compute_score_prob, compute_speech_length
 from predict_bill_pass_probability2 import predict_bill_pass_probability
 import ast
 from pydantic import BaseModel
+import metrics
+import query_trace
+import compression
+import search_index
+import suggest
+import fuzzy
+import speech_search
+import coop_classifier
+import micro_batch
+import jwt_verify
+import write_behind
+from fast_json import FastJSONResponse
+from app_logging import get_logger, setup_logging, shutdown_logging, RequestContextMiddleware
+
+# LOG_LEVEL=INFO(기본) 에서는 행 샘플/ID 목록 같은 DEBUG 출력이 나가지 않는다
+setup_logging()
+log = get_logger("main")
 
 TABLE_PREVIEW_NAMES = [
     "bill_detail_score",
@@ -68,14 +92,33 @@ class BillPredictionOutput(BaseModel):
     evidence_bills: List[BillEvidenceOutput]
 
 
+def _warm_classifier():
+    try:
+        coop_classifier.get_classifier()
+    except Exception as e:
+        log.warning("협력도 분류기 로드 실패 → /sentiment 비활성: %s", e)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("🚀 Server đang khởi động...")
-    print("✅ Đã kết nối Supabase!")
+    # 같은 프로세스에서 앱을 다시 시작하면 (테스트 / 벤치) 이전 종료 때 멈춘 로그 리스너를 다시 띄운다
+    setup_logging()
+    log.info("🚀 Server đang khởi động...")
+    log.info("✅ Đã kết nối Supabase!")
+    sentiment_batcher.start()
+    user_log_buffer.start()
+    # 첫 /sentiment 요청이 모델 로드를 기다리지 않도록 미리 로드 (실패해도 서버는 뜨고 /sentiment 만 503)
+    await anyio.to_thread.run_sync(_warm_classifier)
     yield
-    print("🔥 Server đã tắt.")
-
-app = FastAPI(lifespan=lifespan)
+    # 대기 중인 /sentiment 추론을 끝내고, 밀린 user_logs 를 모두 쓴 뒤 종료
+    sentiment_batcher.stop()
+    user_log_buffer.stop()
+    log.info("🔥 Server đã tắt.")
+    shutdown_logging()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+# 라우트별 지연시간 라벨(경로 템플릿) + 직렬화 구간 측정 → /metrics
+app.router.route_class = metrics.TimedRoute
 router = APIRouter()
 
 # --- CẤU HÌNH CORS ---
@@ -90,17 +133,63 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 응답 압축 (br/gzip, COMPRESS_* 환경변수) — MetricsMiddleware 안쪽이라 응답 크기는 압축 후 바이트
+app.add_middleware(compression.CompressionMiddleware)
+# 요청별 Supabase 쿼리 추적 (중복/N+1 감지) — 라우트 라벨을 쓰므로 MetricsMiddleware 안쪽
+app.add_middleware(query_trace.QueryTraceMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+# X-Request-ID 부여/전파 + 요청 단위 DEBUG 샘플링 (가장 바깥 미들웨어)
+app.add_middleware(RequestContextMiddleware)
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus 스크레이프용: 라우트별 지연시간/요청·응답 크기/구간(supabase·pandas·serialize) 히스토그램."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type=metrics.CONTENT_TYPE)
+
+
+# /api/debug/* 는 DEBUG_ENDPOINTS=1 일 때만 열린다 (기본: 404, 운영 배포에서는 켜지 않는다)
+DEBUG_ENDPOINTS = os.getenv("DEBUG_ENDPOINTS", "0") == "1"
+
+
+def _debug_endpoints_enabled():
+    if not DEBUG_ENDPOINTS:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@app.get("/api/debug/search-index", include_in_schema=False, dependencies=[Depends(_debug_endpoints_enabled)])
+def search_index_stats(rebuild: bool = False):
+    """
+    인메모리 검색 인덱스 상태 (이 요청 안에서 인덱스를 만들지 않는다).
+    rebuild=true 면 현재 인덱스를 버리고, 다음 검색 요청이 새로 만든다.
+    """
+    if rebuild:
+        search_index.invalidate()
+    idx = search_index.current()
+    return {"enabled": search_index.ENABLED, "index": idx.stats() if idx is not None else None}
+
+
+@app.get("/api/debug/query-stats", include_in_schema=False, dependencies=[Depends(_debug_endpoints_enabled)])
+def query_stats(reset: bool = False):
+    """라우트별 요청당 Supabase 쿼리 수/시간 + 중복·N+1 패턴 누적 통계."""
+    out = query_trace.stats()
+    if reset:
+        query_trace.reset_stats()
+    return out
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # --- AUTH HELPER ---
+def _remote_user(token: str):
+    user = supabase.auth.get_user(token)
+    return user.user if user else None
+
+
 def get_current_user(token: str = Depends(oauth2_scheme)):
+    # 서명/만료를 로컬에서 검증 (jwt_verify.py), 검증 키가 없을 때만 supabase.auth.get_user 로 확인
     try:
-        user = supabase.auth.get_user(token)
-        if not user:
-             raise HTTPException(status_code=401, detail="Token không hợp lệ")
-        return user.user
-    except Exception as e:
+        return jwt_verify.verify(token, remote=_remote_user)
+    except jwt_verify.InvalidToken as e:
         raise HTTPException(status_code=401, detail=str(e))
     
 def get_committee_maps():
@@ -108,7 +197,7 @@ def get_committee_maps():
     res = supabase.table("committees").select("*").execute()
     rows = res.data or []
 
-    print("DEBUG committees rows sample:", rows[:5])
+    log.debug("committees rows sample: %s", rows[:5])
 
     name_to_id = {}
     id_to_name = {}
@@ -124,13 +213,13 @@ def get_committee_maps():
         try:
             c_id_int = int(c_id)
         except Exception:
-            print("DEBUG invalid committee_id from committees:", c_id)
+            log.debug("invalid committee_id from committees: %r", c_id)
             continue
 
         id_to_name[c_id_int] = name
         name_to_id[name] = c_id_int
 
-    print("DEBUG id_to_name_map sample:", list(id_to_name.items())[:5])
+    log.debug("id_to_name_map sample: %s", list(id_to_name.items())[:5])
     return name_to_id, id_to_name
 
 
@@ -254,10 +343,10 @@ def _fetch_table_paginated(table_name: str, select_cols: str = "*", batch_size:
             all_data.extend(batch_data)
             offset += batch_size
             
-            print(f"[INFO] {table_name}: 배치 {batch_count} 로드 완료 ({len(batch_data)} 행, 누적: {len(all_data)} 행)")
+            log.debug("%s: 배치 %d 로드 완료 (%d 행, 누적: %d 행)", table_name, batch_count, len(batch_data), len(all_data))
             
         except Exception as e:
-            print(f"[WARN] {table_name} 배치 {batch_count} 로드 실패: {e}")
+            log.warning("%s 배치 %d 로드 실패: %s", table_name, batch_count, e)
             break
     
     return all_data
@@ -309,7 +398,7 @@ def get_all_legislators():
                         "start": start_dt,
                     }
         except Exception as e:
-            print("WARN: failed to build party_history map:", e)
+            log.warning("failed to build party_history map: %s", e)
             latest_party_map = {}
 
         results = []
@@ -406,7 +495,7 @@ def get_all_legislators():
         return results
 
     except Exception as e:
-        print("Lỗi lấy danh sách:", e)
+        log.exception("Lỗi lấy danh sách: %s", e)
         return []
 
 
@@ -447,7 +536,7 @@ def get_filters():
             "methods": ["지역구", "비례대표"],
         }
     except Exception as e:
-        print("Lỗi Filter:", e)
+        log.exception("Lỗi Filter: %s", e)
         # Trả về mảng rỗng để FE không bị crash
         return {
             "parties": [], "committees": [], "genders": [], 
@@ -458,139 +547,85 @@ def get_filters():
 # ==========================================
 # 1-1. 정당 협력도 요약 API
 # ==========================================
+_PARTY_SUMMARY_COLUMNS = ", ".join(party_summary.SUMMARY_FIELDS)
+
+
+def _live_party_summary(party_id: int) -> Optional[dict]:
+    """party_summary 에 행이 없을 때(빌드 전) 랭킹 테이블에서 바로 계산."""
+    party_res = supabase.table("parties").select("party_name").eq("party_id", party_id).execute()
+    if not party_res.data:
+        return None
+    party_name = party_res.data[0].get("party_name")
+
+    def _rows(table: str) -> list:
+        try:
+            return supabase.table(table).select("*").eq("party_name", party_name).execute().data or []
+        except Exception as e:
+            log.warning("%s 조회 실패: %s", table, e)
+            return []
+
+    totals = _rows("party_total_score")
+    return party_summary.summarize_party(
+        party_id, party_name, totals[0] if totals else None,
+        _rows("party_member_ranking_unique"), _rows("party_bill_ranking"),
+    )
+
+
+def _stored_party_summaries(party_id: Optional[int] = None) -> list:
+    """party_summary 행 (party_id 를 주면 그 정당만). 테이블이 없거나 조회 실패면 빈 목록."""
+    try:
+        q = supabase.table(party_summary.SUMMARY_TABLE).select(_PARTY_SUMMARY_COLUMNS)
+        if party_id is not None:
+            q = q.eq("party_id", party_id).limit(1)
+        return q.order("party_id").execute().data or []
+    except Exception as e:
+        log.warning("party_summary 조회 실패: %s", e)
+        return []
+
+
+@app.get("/api/parties/summary")
+def get_all_party_summaries():
+    """
+    전체 정당 요약을 한 번에 반환한다 (party_summary 테이블 한 번 조회).
+    테이블이 없거나 비어 있으면 랭킹 테이블로부터 계산한다.
+    """
+    try:
+        rows = _stored_party_summaries()
+        if not rows:
+            log.warning("party_summary 없음 → 랭킹 테이블에서 계산")
+            rows = [
+                {k: r[k] for k in party_summary.SUMMARY_FIELDS}
+                for r in party_summary.build_party_summary(party_summary.load_tables(supabase))
+            ]
+        return FastJSONResponse({"count": len(rows), "parties": rows})
+    except Exception as e:
+        log.exception("Error in get_all_party_summaries: %s", e)
+        raise HTTPException(status_code=500, detail="정당 분석 중 오류가 발생했습니다.")
+
+
 @app.get("/api/parties/{party_id}/summary")
 def get_party_summary(party_id: int):
     """
-    정당 ID로 조회:
+    정당 ID로 조회 (build_party_summary.py 가 미리 계산한 party_summary 한 행):
       - 정당 총 협력도
       - 협력도 상위/하위 5명의 의원
       - 정당 주요 법안 찬성 상위/하위 5개
     """
     try:
-        # 1. parties 테이블에서 party_name 조회
-        party_res = supabase.table("parties").select("party_name").eq("party_id", party_id).execute()
-        if not party_res.data:
-            raise HTTPException(status_code=404, detail="정당을 찾을 수 없습니다.")
-        
-        party_name = party_res.data[0].get("party_name")
+        rows = _stored_party_summaries(party_id)
+        if rows:
+            return rows[0]
 
-        # 2. party_total_score 테이블에서 정당 총 협력도 조회
-        total_cooperation = None
-        analyzed_members = 0
-        
-        try:
-            total_score_res = supabase.table("party_total_score").select("*").eq("party_name", party_name).execute()
-            if total_score_res.data:
-                party_row = total_score_res.data[0]
-                total_cooperation = {
-                    "avg_score_prob": party_row.get("avg_score_prob"),
-                    "adjusted_score_prob": party_row.get("adjusted_score_prob"),
-                    "original_stance": party_row.get("original_stance"),
-                    "adjusted_stance": party_row.get("adjusted_stance"),
-                }
-                analyzed_members = party_row.get("n_members", 0)
-            else:
-                total_cooperation = {
-                    "status": "분석 불가",
-                    "message": "정당 협력도 데이터가 없습니다."
-                }
-        except Exception as e:
-            print(f"WARN: party_total_score 조회 실패: {e}")
-            total_cooperation = {
-                "status": "분석 불가",
-                "message": "정당 협력도 데이터 조회 중 오류가 발생했습니다."
-            }
-
-        # 3. party_member_ranking_unique 테이블에서 의원 랭킹 조회
-        member_top5 = []
-        member_bottom5 = []
-        
-        try:
-            member_rank_res = supabase.table("party_member_ranking_unique").select("*").eq("party_name", party_name).execute()
-            party_members = member_rank_res.data or []
-
-            if party_members:
-                # 상위 5명
-                member_top5 = sorted(party_members, key=lambda x: x.get("bayesian_score", 0), reverse=True)[:5]
-                # 하위 5명
-                member_bottom5 = sorted(party_members, key=lambda x: x.get("bayesian_score", 0))[:5]
-                
-                # analyzed_members가 아직 0이면 party_members 수로 설정
-                if analyzed_members == 0:
-                    analyzed_members = len(party_members)
-        except Exception as e:
-            print(f"WARN: party_member_ranking_unique 조회 실패: {e}")
-
-        # 4. party_bill_ranking 테이블에서 법안 랭킹 조회
-        bill_top5 = []
-        bill_bottom5 = []
-        
-        try:
-            bill_rank_res = supabase.table("party_bill_ranking").select("*").eq("party_name", party_name).execute()
-            party_bills = bill_rank_res.data or []
-
-            if party_bills:
-                # 같은 이름의 법안을 하나로 통합 (가장 높은 bayesian_score 사용)
-                bill_name_map = {}
-                for bill in party_bills:
-                    bill_name = bill.get("bill_name")
-                    if not bill_name:
-                        continue
-                    
-                    current_score = bill.get("bayesian_score", 0)
-                    
-                    if bill_name not in bill_name_map:
-                        bill_name_map[bill_name] = bill
-                    else:
-                        # 기존 법안보다 점수가 높으면 교체
-                        existing_score = bill_name_map[bill_name].get("bayesian_score", 0)
-                        if current_score > existing_score:
-                            bill_name_map[bill_name] = bill
-                
-                # 통합된 법안 리스트
-                unique_bills = list(bill_name_map.values())
-                
-                # 점수로 정렬 (내림차순/오름차순)
-                sorted_desc = sorted(unique_bills, key=lambda x: x.get("bayesian_score", 0), reverse=True)
-                sorted_asc = sorted(unique_bills, key=lambda x: x.get("bayesian_score", 0))
-                
-                # 상위 5개 (같은 점수는 하나만 포함)
-                prev_score = None
-                for bill in sorted_desc:
-                    current_score = bill.get("bayesian_score", 0)
-                    if prev_score is None or current_score != prev_score:
-                        bill_top5.append(bill)
-                        prev_score = current_score
-                        if len(bill_top5) >= 5:
-                            break
-                
-                # 하위 5개 (같은 점수는 하나만 포함)
-                prev_score = None
-                for bill in sorted_asc:
-                    current_score = bill.get("bayesian_score", 0)
-                    if prev_score is None or current_score != prev_score:
-                        bill_bottom5.append(bill)
-                        prev_score = current_score
-                        if len(bill_bottom5) >= 5:
-                            break
-        except Exception as e:
-            print(f"WARN: party_bill_ranking 조회 실패: {e}")
-
-        return {
-            "party_id": party_id,
-            "party_name": party_name,
-            "total_cooperation": total_cooperation,
-            "analyzed_members": analyzed_members,
-            "member_top5": member_top5,
-            "member_bottom5": member_bottom5,
-            "bill_top5": bill_top5,
-            "bill_bottom5": bill_bottom5,
-        }
+        log.warning("party_summary 에 party_id=%s 없음 → 랭킹 테이블에서 계산", party_id)
+        summary = _live_party_summary(party_id)
+        if summary is None:
+            raise HTTPException(status_code=404, detail="정당을 찾을 수 없습니다.")
+        return summary
 
     except HTTPException as http_ex:
         raise http_ex
     except Exception as e:
-        print("Error in get_party_summary:", e)
+        log.exception("Error in get_party_summary: %s", e)
         raise HTTPException(status_code=500, detail="정당 분석 중 오류가 발생했습니다.")
 
 
@@ -618,13 +653,13 @@ def get_parties_total_score():
         response = supabase.table("party_total_score").select("*").execute()
         result = response.data or []
         
-        return {
+        return FastJSONResponse({
             "count": len(result),
             "parties": result
-        }
+        })
     
     except Exception as e:
-        print("Error in get_parties_total_score:", e)
+        log.exception("Error in get_parties_total_score: %s", e)
         raise HTTPException(status_code=500, detail=f"정당 협력도 조회 중 오류: {str(e)}")
 
     
@@ -637,9 +672,9 @@ def get_parties_member_ranking():
         # party_member_ranking_unique 테이블에서 직접 조회
         response = supabase.table("party_member_ranking_unique").select("*").execute()
         result = response.data or []
-        return {"count": len(result), "members": result}
+        return FastJSONResponse({"count": len(result), "members": result})
     except Exception as e:
-        print("Error in get_parties_member_ranking:", e)
+        log.exception("Error in get_parties_member_ranking: %s", e)
         raise HTTPException(status_code=500, detail=f"정당별 의원 랭킹 조회 중 오류: {str(e)}")
 
 
@@ -652,9 +687,9 @@ def get_parties_bill_ranking():
         # party_bill_ranking 테이블에서 직접 조회
         response = supabase.table("party_bill_ranking").select("*").execute()
         result = response.data or []
-        return {"count": len(result), "bills": result}
+        return FastJSONResponse({"count": len(result), "bills": result})
     except Exception as e:
-        print("Error in get_parties_bill_ranking:", e)
+        log.exception("Error in get_parties_bill_ranking: %s", e)
         raise HTTPException(status_code=500, detail=f"정당별 법안 랭킹 조회 중 오류: {str(e)}")
 
 
@@ -668,8 +703,20 @@ def search_analysis(data: schemas.SearchInput):
         name_to_id_map, id_to_name_map = get_committee_maps()
         query = supabase.table('dimension').select("*")
 
+        member_order = None   # 이름 검색 순위 (완전 일치 > 접두 > 포함 > 오타 허용 후보)
         if data.query:
-            query = query.ilike('name', f"%{data.query}%")
+            idx = _indexed(data.query)
+            if idx is None:
+                query = query.ilike('name', f"%{data.query}%")
+            else:
+                member_ids = [r.get("member_id") for r in idx.search(data.query, [("legislator", "name")])["legislator"]]
+                if not member_ids:
+                    # 정확히 포함하는 이름이 없으면 자모 편집 거리로 오타 허용 검색
+                    member_ids = [r.get("member_id") for _, r in fuzzy.legislators(data.query)]
+                if not member_ids:
+                    return {"profile": None, "results": [], "ai_summary": "Không tìm thấy kết quả phù hợp."}
+                member_order = {mid: i for i, mid in enumerate(member_ids)}
+                query = query.in_('member_id', member_ids)
         
         if getattr(data, 'party', None) and data.party not in ["all", "소속정당 전체", "전체"]:
             query = query.eq('party', data.party)
@@ -700,31 +747,16 @@ def search_analysis(data: schemas.SearchInput):
         
         if not found: 
             return {"profile": None, "results": [], "ai_summary": "Không tìm thấy kết quả phù hợp."}
-        
+
+        # 여러 명이 걸리면 임의의 첫 행 대신 이름이 가장 잘 맞는 의원
+        if member_order is not None:
+            found.sort(key=lambda r: member_order.get(r.get("member_id"), len(member_order)))
+        elif data.query:
+            found.sort(key=lambda r: _name_match_rank(r.get("name"), data.query))
         target = found[0]
 
         member_pk = target.get("member_id") or target.get("id")
 
-        history_res = (
-            supabase.table("committees_history")
-            .select("committee, start_date, end_date")
-            .eq("member_id", member_pk)
-            .order("start_date", desc=True) # Mới nhất lên đầu
-            .execute()
-        )
-        
-        # Format dữ liệu cho khớp với Frontend (name, startDate, endDate)
-        raw_history = history_res.data or []
-        formatted_committees = []
-        
-        for h in raw_history:
-            formatted_committees.append({
-                "name": h.get("committee"),
-                "startDate": h.get("start_date"),
-                "endDate": h.get("end_date")
-            })
-
-
         history_res = (
             supabase.table("committees_history")
             .select("committee, start_date, end_date")
@@ -783,7 +815,7 @@ def search_analysis(data: schemas.SearchInput):
         }
 
     except Exception as e:
-        print("Lỗi Search:", e)
+        log.exception("Lỗi Search: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -836,7 +868,7 @@ def search_analysis(data: schemas.SearchInput):
 @app.get("/api/legislators/{member_id}/bills")
 def get_legislator_bills(member_id: int):
     try:
-        print("DEBUG /bills member_id =", member_id)
+        log.debug("/bills member_id = %s", member_id)
 
         # 1️⃣ member_bill_stats 에서 member_id 로 조회
         stats_res = (
@@ -847,15 +879,15 @@ def get_legislator_bills(member_id: int):
         )
 
         rows = stats_res.data or []
-        print("DEBUG rows count =", len(rows))
+        log.debug("rows count = %d", len(rows))
         
         # ---------------------------------------------------------
         # [추가] 2️⃣ bills 테이블에서 bill_name 가져오기 (Look up)
         # ---------------------------------------------------------
         # row에 있는 'bill_id'를 사용하여 수집
         bill_ids_raw = [r.get("bill_id") for r in rows]
-        print("DEBUG extracted bill_ids_raw =", bill_ids_raw)
-        print("DEBUG bill_ids_raw numbers =", len(bill_ids_raw))
+        log.debug("extracted bill_ids_raw = %s", bill_ids_raw)
+        log.debug("bill_ids_raw numbers = %d", len(bill_ids_raw))
 
         # 숫자가 아닌 bill_id(예: "None", "", None 등) 제거 + int로 변환
         valid_bill_ids: list[int] = []
@@ -867,15 +899,15 @@ def get_legislator_bills(member_id: int):
 
             # "None", "", 알 수 없는 문자열 등은 전부 제외
             if not s.isdigit():
-                print(f"WARN: skip invalid bill_id value: {s!r}")
+                log.warning("skip invalid bill_id value: %r", s)
                 continue
 
             valid_bill_ids.append(int(s))
 
         # 중복 제거
         bill_ids_for_query = sorted(set(valid_bill_ids))
-        print("DEBUG cleaned bill_ids_for_query =", bill_ids_for_query)
-        print( "DEBUG bill_ids_for_query count =", len(bill_ids_for_query))
+        log.debug("cleaned bill_ids_for_query = %s", bill_ids_for_query)
+        log.debug("bill_ids_for_query count = %d", len(bill_ids_for_query))
 
         
         bill_name_map: dict[str, str] = {}
@@ -895,10 +927,10 @@ def get_legislator_bills(member_id: int):
                     b_name = b_item.get("bill_name")
                     bill_name_map[b_id] = b_name
 
-                print("DEBUG fetched bill_name count =", len(bill_name_map))
+                log.debug("fetched bill_name count = %d", len(bill_name_map))
 
             except Exception as e:
-                print("Error fetching bill names in get_legislator_bills:", e)
+                log.warning("Error fetching bill names in get_legislator_bills: %s", e)
         # ---------------------------------------------------------
 
         # ---------------------------------------------------------
@@ -924,9 +956,9 @@ def get_legislator_bills(member_id: int):
                         "adjusted_stance": item.get("adjusted_stance")
                     }
                 
-                print("DEBUG fetched bill_member_score count =", len(bill_member_score_map))
+                log.debug("fetched bill_member_score count = %d", len(bill_member_score_map))
             except Exception as e:
-                print("Error fetching bill_member_score:", e)
+                log.warning("Error fetching bill_member_score: %s", e)
         # ---------------------------------------------------------
 
         bills = []
@@ -1025,7 +1057,7 @@ def get_legislator_bills(member_id: int):
         return {"ai_summary": ai_summary, "bills": bills}
 
     except Exception as e:
-        print("Error get_legislator_bills:", repr(e))
+        log.exception("Error get_legislator_bills: %r", e)
         raise HTTPException(status_code=500, detail=str(e))
  #수정 X
     
@@ -1040,8 +1072,8 @@ def get_speeches(
     실제 발언 리스트를 Supabase의 public.speeches 테이블에서 가져오는 API
     """
     try:
-        print("DEBUG /api/speeches member_id =", member_id, "meeting_id =", meeting_id)
-        print("DEBUG /api/speeches bill_name =", (bill_name or "")[:80])
+        log.debug("/api/speeches member_id = %s, meeting_id = %s", member_id, meeting_id)
+        log.debug("/api/speeches bill_name = %s", (bill_name or "")[:80])
 
         # 👈 tên bảng đúng: public.speeches
         query = (
@@ -1059,11 +1091,11 @@ def get_speeches(
                 head = bill_name.strip().split("\n")[0][:40]
                 query = query.ilike("bills", f"%{head}%")
             except Exception as e:
-                print("DEBUG skip bill_name filter:", repr(e))
+                log.debug("skip bill_name filter: %r", e)
 
         res = query.order("speech_id", desc=False).execute()
         rows = res.data or []
-        print("DEBUG speeches count =", len(rows))
+        log.debug("speeches count = %d", len(rows))
 
         speeches = []
         for idx, row in enumerate(rows, start=1):
@@ -1077,17 +1109,44 @@ def get_speeches(
                 "score": 50,          # tạm thời mock
             })
 
-        return {"speeches": speeches}
+        return FastJSONResponse({"speeches": speeches})
 
     except Exception as e:
-        print("Error /api/speeches:", repr(e))
+        log.exception("Error /api/speeches: %r", e)
         raise HTTPException(status_code=500, detail=f"/api/speeches failed: {e}")
 
+@app.get("/api/speeches/search")
+def search_speeches(
+    q: str = Query(..., min_length=1, description="검색어 (발언 본문)"),
+    member_id: Optional[int] = Query(None),
+    party: Optional[str] = Query(None, description="정당명"),
+    committee: Optional[str] = Query(None, description="위원회명"),
+    date_from: Optional[date] = Query(None, description="회의일 시작 (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="회의일 끝 (YYYY-MM-DD)"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+):
+    """
+    발언 전문 검색 (BM25, speech_search.py 로 만든 디스크 색인).
+    snippet 은 HTML 이스케이프된 본문 일부이며 검색어가 <mark> 로 감싸져 있다.
+    """
+    idx = speech_search.get_index()
+    if idx is None:
+        raise HTTPException(status_code=503, detail="발언 검색 색인이 없습니다. `python speech_search.py build` 를 먼저 실행하세요.")
+    try:
+        with metrics.phase("search"):
+            res = idx.search(q, member_id, party, committee, date_from, date_to, limit, offset)
+        return {"query": q, "total": res["total"], "limit": limit, "offset": offset, "results": res["results"]}
+    except Exception as e:
+        log.exception("Error /api/speeches/search: %r", e)
+        raise HTTPException(status_code=500, detail=f"/api/speeches/search failed: {e}")
+
+
 # [수정] 특정 의원 발언 데이터 조회용 API (구조 개선: 데이터 가공 + AI 요약)
 @app.get("/api/build_stat/{member_id}")
 def get_speeches_by_member(member_id: int):
     try:
-        print(f"DEBUG /api/build_stat/{member_id}")
+        log.debug("/api/build_stat/%s", member_id)
 
         # 1. DB에서 해당 member_id의 speeches 조회
         response = (
@@ -1097,7 +1156,7 @@ def get_speeches_by_member(member_id: int):
             .execute()
         )
         rows = response.data or []
-        print(f"DEBUG speeches rows count = {len(rows)}")
+        log.debug("speeches rows count = %d", len(rows))
 
         # speeches 가 하나도 없으면 빈 결과
         if not rows:
@@ -1108,34 +1167,124 @@ def get_speeches_by_member(member_id: int):
                 "message": "해당 의원의 발언 데이터가 없습니다.",
             }
 
-        # 2. pandas DataFrame 으로 변환
-        df = pd.DataFrame(rows)
+        with metrics.phase("pandas"):
+            # 2. pandas DataFrame 으로 변환
+            df = pd.DataFrame(rows)
 
-        # 3. build_member_stats 호출 (현재 DataFrame 기준으로 의원별 통계 계산)
-        stats_df = build_member_stats(df)
+            # 3. build_member_stats 호출 (현재 DataFrame 기준으로 의원별 통계 계산)
+            stats_df = build_member_stats(df)
 
-        if stats_df.empty:
-            stats_dict = None
-        else:
-            # 이 API는 한 명의 member_id만 조회하므로 첫 행만 사용
-            stats_dict = stats_df.iloc[0].to_dict()
+            if stats_df.empty:
+                stats_dict = None
+            else:
+                # 이 API는 한 명의 member_id만 조회하므로 첫 행만 사용
+                # (numpy 스칼라 / NaN 은 FastJSONResponse 가 그대로 직렬화)
+                stats_dict = stats_df.iloc[0].to_dict()
 
         # 4. 결과 반환
-        return {
+        return FastJSONResponse({
             "member_id": member_id,
             "stats": stats_dict,
             "speeches": rows,  # 필요 없으면 제거해도 됨
-        }
+        })
 
     except Exception as e:
-        print(f"Error fetching speeches for member {member_id}:", e)
+        log.exception("Error fetching speeches for member %s: %s", member_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _member_bill_agg(rows):
+    """speeches 행 → 의원 × 법안 통계 DataFrame. 집계할 법안 발언이 없으면 (None, 메시지)."""
+    # 2. DataFrame 변환
+    df = pd.DataFrame(rows)
+
+    # ---------------------------------------------------------
+    # 로직 적용 (build_member_bill_stats.py 참조)
+    # ---------------------------------------------------------
+
+    # (A) 확률 컬럼 보정
+    def get_prob(x, key):
+        if isinstance(x, dict):
+            return x.get(key, 0.0)
+        return 1.0 if key == "neutral" else 0.0
+
+    if "prob_coop" not in df.columns or df["prob_coop"].isna().all():
+        if "sentiment_prob" in df.columns:
+            df["prob_noncoop"] = df["sentiment_prob"].apply(lambda x: get_prob(x, "noncoop"))
+            df["prob_coop"]    = df["sentiment_prob"].apply(lambda x: get_prob(x, "coop"))
+            df["prob_neutral"] = df["sentiment_prob"].apply(lambda x: get_prob(x, "neutral"))
+        else:
+            df["prob_noncoop"] = 0.0
+            df["prob_coop"] = 0.0
+            df["prob_neutral"] = 1.0
+
+    # (B) score_prob 및 발언 길이 계산
+    if "score_prob" not in df.columns or df["score_prob"].isna().all():
+        df["score_prob"] = df.apply(lambda r: compute_score_prob(r.get("prob_coop", 0), r.get("prob_noncoop", 0)), axis=1)
+
+    if "speech_length" not in df.columns:
+        df["speech_length"] = df["speech_text"].apply(compute_speech_length)
+
+    # (C) Bill Review 컬럼 준비 및 Explode -> 'bill_id'로 이름 변경 [수정됨]
+    target_bill_col = None
+    for cand in ["bill_review", "bills", "bill_numbers"]:
+        if cand in df.columns:
+            target_bill_col = cand
+            break
+
+    if target_bill_col:
+        def parse_bill_list(val):
+            if isinstance(val, list):
+                return val
+            if isinstance(val, str):
+                try:
+                    parsed = ast.literal_eval(val)
+                    if isinstance(parsed, list):
+                        return parsed
+                    return [val]
+                except:
+                    return [val]
+            return []
+
+        # 여기서 컬럼명을 'bill_id'로 지정하여 저장
+        df["bill_id"] = df[target_bill_col].apply(parse_bill_list)
+    
+        df = df.explode("bill_id")
+        df = df[df["bill_id"].notna()]
+        df = df[df["bill_id"] != ""]
+    else:
+        return None, "법안 정보 컬럼을 찾을 수 없습니다."
+
+    if df.empty:
+        return None, "유효한 법안 발언 데이터가 없습니다."
+
+    # (D) 의원 × 법안 단위 통계 집계 ('bill_review' -> 'bill_id'로 변경)
+    if "member_name" not in df.columns:
+        df["member_name"] = ""
+
+    agg = df.groupby(["member_id", "member_name", "bill_id"]).agg(
+        n_speeches=("speech_id", "count"),
+        total_speech_length_bill=("speech_length", "sum"),
+        avg_speech_length_bill=("speech_length", "mean"),
+        score_prob_mean=("score_prob", "mean")
+    ).reset_index()
+
+    # (E) Stance 판단
+    def stance(score):
+        if score > 0.15:
+            return "협력"
+        elif score < -0.15:
+            return "비협력"
+        return "중립"
+
+    agg["stance"] = agg["score_prob_mean"].apply(stance)
+    return agg, None
+
+
 # 의안번호 따로, 의안이름 따로.
 @app.get("/api/member_bill_stat/{member_id}")
 def get_member_bill_stats_api(member_id: int):
     try:
-        print(f"DEBUG /api/member_bill_stat/{member_id}")
+        log.debug("/api/member_bill_stat/%s", member_id)
 
         # 1. DB에서 해당 member_id의 speeches 조회
         response = (
@@ -1153,97 +1302,18 @@ def get_member_bill_stats_api(member_id: int):
                 "message": "해당 의원의 발언 데이터가 없습니다."
             }
 
-        # 2. DataFrame 변환
-        df = pd.DataFrame(rows)
-
-        # ---------------------------------------------------------
-        # 로직 적용 (build_member_bill_stats.py 참조)
-        # ---------------------------------------------------------
-        
-        # (A) 확률 컬럼 보정
-        def get_prob(x, key):
-            if isinstance(x, dict):
-                return x.get(key, 0.0)
-            return 1.0 if key == "neutral" else 0.0
-
-        if "prob_coop" not in df.columns or df["prob_coop"].isna().all():
-            if "sentiment_prob" in df.columns:
-                df["prob_noncoop"] = df["sentiment_prob"].apply(lambda x: get_prob(x, "noncoop"))
-                df["prob_coop"]    = df["sentiment_prob"].apply(lambda x: get_prob(x, "coop"))
-                df["prob_neutral"] = df["sentiment_prob"].apply(lambda x: get_prob(x, "neutral"))
-            else:
-                df["prob_noncoop"] = 0.0
-                df["prob_coop"] = 0.0
-                df["prob_neutral"] = 1.0
-
-        # (B) score_prob 및 발언 길이 계산
-        if "score_prob" not in df.columns or df["score_prob"].isna().all():
-            df["score_prob"] = df.apply(lambda r: compute_score_prob(r.get("prob_coop", 0), r.get("prob_noncoop", 0)), axis=1)
-        
-        if "speech_length" not in df.columns:
-            df["speech_length"] = df["speech_text"].apply(compute_speech_length)
-
-        # (C) Bill Review 컬럼 준비 및 Explode -> 'bill_id'로 이름 변경 [수정됨]
-        target_bill_col = None
-        for cand in ["bill_review", "bills", "bill_numbers"]:
-            if cand in df.columns:
-                target_bill_col = cand
-                break
-        
-        if target_bill_col:
-            def parse_bill_list(val):
-                if isinstance(val, list):
-                    return val
-                if isinstance(val, str):
-                    try:
-                        parsed = ast.literal_eval(val)
-                        if isinstance(parsed, list):
-                            return parsed
-                        return [val]
-                    except:
-                        return [val]
-                return []
-
-            # 여기서 컬럼명을 'bill_id'로 지정하여 저장
-            df["bill_id"] = df[target_bill_col].apply(parse_bill_list)
-            
-            df = df.explode("bill_id")
-            df = df[df["bill_id"].notna()]
-            df = df[df["bill_id"] != ""]
-        else:
-            return {"member_id": member_id, "bill_stats": [], "message": "법안 정보 컬럼을 찾을 수 없습니다."}
-
-        if df.empty:
-             return {"member_id": member_id, "bill_stats": [], "message": "유효한 법안 발언 데이터가 없습니다."}
-
-        # (D) 의원 × 법안 단위 통계 집계 ('bill_review' -> 'bill_id'로 변경)
-        if "member_name" not in df.columns:
-            df["member_name"] = ""
-
-        agg = df.groupby(["member_id", "member_name", "bill_id"]).agg(
-            n_speeches=("speech_id", "count"),
-            total_speech_length_bill=("speech_length", "sum"),
-            avg_speech_length_bill=("speech_length", "mean"),
-            score_prob_mean=("score_prob", "mean")
-        ).reset_index()
-
-        # (E) Stance 판단
-        def stance(score):
-            if score > 0.15:
-                return "협력"
-            elif score < -0.15:
-                return "비협력"
-            return "중립"
-
-        agg["stance"] = agg["score_prob_mean"].apply(stance)
+        with metrics.phase("pandas"):
+            agg, message = _member_bill_agg(rows)
+        if agg is None:
+            return {"member_id": member_id, "bill_stats": [], "message": message}
 
         # ---------------------------------------------------------
         # [추가] bills 테이블에서 bill_name 가져오기
         # ---------------------------------------------------------
         # 1. 현재 집계된 데이터에 있는 모든 bill_id 추출
         unique_bill_ids = agg["bill_id"].unique().tolist()
-        print(unique_bill_ids[:10])
-        print(f"DEBUG unique_bill_ids count = {len(unique_bill_ids)}")
+        log.debug("unique_bill_ids sample: %s", unique_bill_ids[:10])
+        log.debug("unique_bill_ids count = %d", len(unique_bill_ids))
 
         # 2. Supabase bills 테이블 조회 (bill_id가 일치하는 것들)
         if unique_bill_ids:
@@ -1267,25 +1337,24 @@ def get_member_bill_stats_api(member_id: int):
                 agg["bill_name"] = agg["bill_id"].astype(str).map(bill_name_map).fillna("법안명 없음")
             
             except Exception as e:
-                print("Error fetching bill names:", e)
+                log.warning("Error fetching bill names: %s", e)
                 agg["bill_name"] = "조회 실패"
         else:
             agg["bill_name"] = "-"
 
-        # (F) 정렬
-        agg = agg.sort_values(["bill_id"])
-
-        # 3. 결과 반환
-        result_data = agg.to_dict(orient="records")
+        with metrics.phase("pandas"):
+            # (F) 정렬
+            agg = agg.sort_values(["bill_id"])
 
-        return {
+        # 3. 결과 반환 (DataFrame 그대로 → FastJSONResponse 가 한 번에 직렬화, NaN → null)
+        return FastJSONResponse({
             "member_id": member_id,
-            "count": len(result_data),
-            "bill_stats": result_data
-        }
+            "count": len(agg),
+            "bill_stats": agg
+        })
 
     except Exception as e:
-        print(f"Error calculating bill stats for member {member_id}:", e)
+        log.exception("Error calculating bill stats for member %s: %s", member_id, e)
         raise HTTPException(status_code=500, detail=str(e))
     
 # [추가] 특정 의원의 상세 정보(기본정보 + 상임위/정당 이력 + 대표 발의 법안) 조회 API
@@ -1293,7 +1362,7 @@ def get_member_bill_stats_api(member_id: int):
 def get_legislator_detail(member_id: int):
 
     try:
-        print(f"DEBUG /api/legislators/{member_id}/detail")
+        log.debug("/api/legislators/%s/detail", member_id)
 
         # 1. 기본 정보 조회 (dimension 테이블)
         # ---------------------------------------------------------
@@ -1410,14 +1479,14 @@ def get_legislator_detail(member_id: int):
     except HTTPException as http_ex:
         raise http_ex
     except Exception as e:
-        print(f"Error fetching legislator detail for {member_id}:", e)
+        log.exception("Error fetching legislator detail for %s: %s", member_id, e)
         raise HTTPException(status_code=500, detail=str(e))
     
 # [추가] 특정 의원의 상임위 활동 이력 조회 API
 @app.get("/api/legislators/{member_id}/committees_history")
 def get_member_committee_history(member_id: int):
     try:
-        print(f"DEBUG /api/legislators/{member_id}/committees_history")
+        log.debug("/api/legislators/%s/committees_history", member_id)
 
         # committees_history 테이블 조회
         # start_date 기준 내림차순 정렬 (최신 활동이 먼저 나오도록)
@@ -1438,7 +1507,7 @@ def get_member_committee_history(member_id: int):
         }
 
     except Exception as e:
-        print(f"Error fetching committee history for {member_id}:", e)
+        log.exception("Error fetching committee history for %s: %s", member_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1446,7 +1515,7 @@ def get_member_committee_history(member_id: int):
 @app.get("/api/legislators/{member_id}/bills/{bill_id}/speeches")
 def get_member_bill_speeches_detail(member_id: int, bill_id: str):
     try:
-        print(f"DEBUG /api/legislators/{member_id}/bills/{bill_id}/speeches")
+        log.debug("/api/legislators/%s/bills/%s/speeches", member_id, bill_id)
 
         # 1. 법안 이름 조회
         bill_name = "법안명 없음"
@@ -1455,7 +1524,7 @@ def get_member_bill_speeches_detail(member_id: int, bill_id: str):
             if bill_res.data:
                 bill_name = bill_res.data[0].get("bill_name", "법안명 없음")
         except Exception as e:
-            print(f"Warning: Failed to fetch bill name for {bill_id}: {e}")
+            log.warning("Failed to fetch bill name for %s: %s", bill_id, e)
 
         # 2. 해당 의원의 발언 조회 (Supabase 레벨에서 bill_id 필터링 시도)
         import re
@@ -1471,9 +1540,9 @@ def get_member_bill_speeches_detail(member_id: int, bill_id: str):
                 .execute()
             )
             rows = response.data or []
-            print(f"DEBUG: Supabase .ilike() 필터링 결과: {len(rows)}개 발언")
+            log.debug("Supabase .ilike() 필터링 결과: %d개 발언", len(rows))
         except Exception as e:
-            print(f"DEBUG: Supabase .ilike() 필터링 실패, 전체 조회 후 Python 필터링: {e}")
+            log.debug("Supabase .ilike() 필터링 실패, 전체 조회 후 Python 필터링: %s", e)
             # .ilike() 실패시 전체 조회
             response = supabase.table("speeches").select("*").eq("member_id", member_id).execute()
             rows = response.data or []
@@ -1579,7 +1648,7 @@ def get_member_bill_speeches_detail(member_id: int, bill_id: str):
         }
 
     except Exception as e:
-        print(f"Error fetching speeches for member {member_id}, bill {bill_id}:", e)
+        log.exception("Error fetching speeches for member %s, bill %s: %s", member_id, bill_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1587,6 +1656,11 @@ def get_member_bill_speeches_detail(member_id: int, bill_id: str):
 # 2. AUTHENTICATION & AUTO LOGGING
 # ==========================================
 
+# user_logs 는 요청 안에서 바로 쓰지 않고 모아서 일괄 insert (write_behind.py, WRITE_BEHIND_* 환경변수)
+user_log_buffer = write_behind.WriteBehindBuffer("user_logs", lambda: supabase)
+# 쓴 묶음만큼 대시보드 카운터(user_stats) / 일별 집계(user_activity_daily) 증가
+user_log_buffer.on_flush.append(lambda rows: user_stats.record_activity(supabase, rows))
+
 @app.post("/register", response_model=schemas.UserOut)
 def register_user(user: schemas.UserCreate):
     try:
@@ -1611,11 +1685,11 @@ def register_user(user: schemas.UserCreate):
                 "target_name": "Tạo tài khoản",
                 "details": f"Chào mừng {user.full_name or user.username} gia nhập hệ thống!"
             }
-            # Ghi vào bảng user_logs
-            supabase.table("user_logs").insert(welcome_log).execute()
-            print("✅ Đã ghi log đăng ký.")
+            # Ghi vào bảng user_logs (write-behind)
+            user_log_buffer.add(welcome_log)
+            log.info("✅ Đã ghi log đăng ký.")
         except Exception as log_error:
-            print(f"⚠️ Lỗi ghi log đăng ký: {log_error}")
+            log.warning("⚠️ Lỗi ghi log đăng ký: %s", log_error)
         # ============================================================
 
         return {
@@ -1645,10 +1719,10 @@ def login_for_access_token(user_data: schemas.UserLogin):
                     "target_name": "Đăng nhập",
                     "details": "Đăng nhập hệ thống thành công"
                 }
-                supabase.table("user_logs").insert(login_log).execute()
-                print(f"✅ Đã ghi log đăng nhập: {user_data.email}")
+                user_log_buffer.add(login_log)
+                log.info("✅ Đã ghi log đăng nhập: %s", user_data.email)
         except Exception as log_error:
-            print(f"⚠️ Lỗi ghi log đăng nhập: {log_error}")
+            log.warning("⚠️ Lỗi ghi log đăng nhập: %s", log_error)
         # ============================================================
 
         return {
@@ -1664,9 +1738,36 @@ def login_for_access_token(user_data: schemas.UserLogin):
 
 # ... (Các API AI khác giữ nguyên) ...
 
+# 협력도 분류기: 동시 요청을 마이크로 배치로 모아 한 번에 추론 (micro_batch.py, INFER_* 환경변수)
+# 런타임은 COOP_RUNTIME (torch / torch-int8 / onnx / onnx-int8) 으로 선택
+SENTIMENT_LABELS = {"noncoop": "비협력", "coop": "협력", "neutral": "중립"}
+sentiment_batcher = micro_batch.MicroBatcher(
+    "sentiment", lambda texts: coop_classifier.get_classifier().predict_proba(texts)
+)
+
+
 @app.post("/sentiment", response_model=schemas.SentimentOutput)
-def analyze_sentiment(data_in: schemas.AnalysisInput, current_user = Depends(get_current_user)):
-    return {"label": "협력", "confidence_score": 0.95}
+async def analyze_sentiment(data_in: schemas.AnalysisInput, current_user = Depends(get_current_user)):
+    if coop_classifier.load_error() is not None:
+        raise HTTPException(status_code=503, detail="감성 분석 모델을 사용할 수 없습니다.")
+    try:
+        fut = sentiment_batcher.submit(data_in.speech_text)
+    except micro_batch.QueueFull:
+        raise HTTPException(status_code=503, detail="감성 분석 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+    try:
+        probs = await asyncio.wait_for(asyncio.wrap_future(fut), timeout=micro_batch.TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="감성 분석 시간이 초과되었습니다.")
+    except Exception as e:
+        log.warning("sentiment 추론 실패: %s", e)
+        raise HTTPException(status_code=503, detail="감성 분석 모델을 사용할 수 없습니다.")
+    probabilities = {label: round(float(p), 4) for label, p in zip(coop_classifier.LABELS, probs)}
+    best = max(probabilities, key=probabilities.get)
+    return {
+        "label": SENTIMENT_LABELS[best],
+        "confidence_score": probabilities[best],
+        "probabilities": probabilities,
+    }
 
 @app.post("/prediction", response_model=schemas.PredictionOutput)
 def predict_legislation(data_in: schemas.AnalysisInput, current_user = Depends(get_current_user)):
@@ -1687,6 +1788,85 @@ def read_root():
 # ==========================================
 # 통합 검색 API (의원 → 법안 순서)
 # ==========================================
+def _indexed(q: Optional[str]) -> Optional[search_index.SearchIndex]:
+    """검색어에 쓸 인메모리 인덱스 (꺼져 있거나 ilike 와일드카드가 있으면 None → DB ilike)."""
+    if not q or search_index.has_wildcards(q):
+        return None
+    return search_index.get_index()
+
+
+def _live_rows(table: str, key: str, rows: List[dict]) -> List[dict]:
+    """
+    인덱스가 찾은 행 → 같은 키의 현재 DB 행 (인덱스 순서 유지, 그새 지워진 행은 빠짐).
+    인덱스 버전은 행 수 / 최대 키만 보므로 제자리 수정(정당·위원회 변경 등)은 반영되지 않는다
+    → 어떤 행인지만 인덱스로 정하고 내용은 DB 에서 읽는다.
+    """
+    ids = [r.get(key) for r in rows if r.get(key) is not None]
+    if not ids:
+        return []
+    res = supabase.table(table).select("*").in_(key, ids).execute()
+    live = {str(r.get(key)): r for r in (res.data or [])}
+    return [live[str(i)] for i in ids if str(i) in live]
+
+
+def _name_match_rank(name: Optional[str], q: str) -> tuple:
+    """ilike 결과 정렬용: 완전 일치 > 접두 일치 > 포함, 짧은 이름 우선."""
+    name, q = (name or "").lower(), q.strip().lower()
+    return (0 if name == q else 1 if name.startswith(q) else 2, len(name))
+
+
+@app.get("/api/suggest")
+def suggest_api(
+    q: str = Query(..., description="입력 중인 검색어 (초성 가능: ㅇㄱㅈㄴ)"),
+    limit: int = Query(10, ge=1, le=suggest.MAX_LIMIT),
+    types: Optional[str] = Query(None, description="legislator,party,committee,bill 중 쉼표 구분"),
+):
+    """
+    검색창 자동완성 (키 입력마다 호출).
+    의원 이름 / 정당명 / 위원회명 / 법안명 접두 일치 + 초성 일치, DB 조회 없이 메모리에서 응답.
+    """
+    type_set = {t.strip() for t in types.split(",") if t.strip()} if types else None
+    if type_set and not type_set <= set(suggest.TYPE_PRIORITY):
+        raise HTTPException(status_code=400, detail=f"types 는 {', '.join(suggest.TYPE_PRIORITY)} 중에서 선택")
+    try:
+        return {"query": q, "suggestions": suggest.suggest(q, limit, type_set)}
+    except Exception as e:
+        log.exception("Error in suggest_api: %s", e)
+        return {"query": q, "suggestions": []}
+
+
+def _unified_legislator(member_data: dict) -> dict:
+    member_id = member_data.get("member_id") or member_data.get("id")
+
+    # 위원회 이름 매핑
+    _, id_to_name_map = get_committee_maps()
+    committee_id = member_data.get("committee_id")
+    committee_name = id_to_name_map.get(committee_id, "소속 위원회 없음")
+
+    return {
+        "member_id": member_id,
+        "name": member_data.get("name"),
+        "party": member_data.get("party"),
+        "committee": committee_name,
+        "region": member_data.get("district") or member_data.get("region"),
+        "gender": member_data.get("gender"),
+        "count": member_data.get("elected_time"),
+        "method": member_data.get("elected_type"),
+        "img": member_data.get("img") or member_data.get("image_url") or ""
+    }
+
+
+def _unified_bill(b: dict) -> dict:
+    return {
+        "bill_id": b.get("bill_id"),
+        "bill_number": b.get("bill_number"),
+        "bill_name": b.get("bill_name"),
+        "proposer": b.get("proposer"),
+        "propose_date": b.get("propose_date"),
+        "committee": b.get("committee")
+    }
+
+
 @app.get("/api/unified-search")
 def unified_search(query: str = Query(..., description="검색어 (의원명 또는 법안명)")):
     """
@@ -1695,6 +1875,7 @@ def unified_search(query: str = Query(..., description="검색어 (의원명 또
     검색 순서:
       1. 의원 이름으로 검색 (dimension 테이블)
       2. 결과가 없으면 법안명으로 검색 (bills 테이블)
+      3. 둘 다 없으면 오타 허용 검색 (fuzzy.py, 자모 편집 거리) → fuzzy: true
     
     반환:
       - type: "legislator" | "bill" | "none"
@@ -1707,67 +1888,69 @@ def unified_search(query: str = Query(..., description="검색어 (의원명 또
             return {"type": "none", "data": None, "message": "검색어를 입력해주세요."}
         
         # 1. 의원 이름으로 검색 (부분 일치)
-        legislator_res = (
-            supabase.table("dimension")
-            .select("*")
-            .ilike("name", f"%{query_str}%")
-            .limit(1)
-            .execute()
-        )
-        
-        if legislator_res.data and len(legislator_res.data) > 0:
-            member_data = legislator_res.data[0]
-            member_id = member_data.get("member_id") or member_data.get("id")
-            
-            # 위원회 이름 매핑
-            _, id_to_name_map = get_committee_maps()
-            committee_id = member_data.get("committee_id")
-            committee_name = id_to_name_map.get(committee_id, "소속 위원회 없음")
-            
+        #    인덱스가 있으면 의원/법안을 한 번에 찾고 (순위순), 없으면 ilike 로 차례대로 조회
+        idx = _indexed(query_str)
+        if idx is not None:
+            hits = idx.search(query_str, [("legislator", "name"), ("bill", "bill_name")], limit=10)
+            legislator_rows = _live_rows("dimension", "member_id", hits["legislator"][:1])
+            bill_rows = None if legislator_rows else _live_rows("bills", "bill_id", hits["bill"])
+        else:
+            legislator_rows = (
+                supabase.table("dimension")
+                .select("*")
+                .ilike("name", f"%{query_str}%")
+                .limit(1)
+                .execute()
+            ).data or []
+            bill_rows = None
+
+        if legislator_rows:
+            member_data = legislator_rows[0]
             return {
                 "type": "legislator",
-                "data": {
-                    "member_id": member_id,
-                    "name": member_data.get("name"),
-                    "party": member_data.get("party"),
-                    "committee": committee_name,
-                    "region": member_data.get("district") or member_data.get("region"),
-                    "gender": member_data.get("gender"),
-                    "count": member_data.get("elected_time"),
-                    "method": member_data.get("elected_type"),
-                    "img": member_data.get("img") or member_data.get("image_url") or ""
-                },
+                "data": _unified_legislator(member_data),
                 "message": f"의원 '{member_data.get('name')}'을(를) 찾았습니다."
             }
         
         # 2. 법안명으로 검색 (부분 일치)
-        bill_res = (
-            supabase.table("bills")
-            .select("*")
-            .ilike("bill_name", f"%{query_str}%")
-            .limit(10)
-            .execute()
-        )
-        
-        if bill_res.data and len(bill_res.data) > 0:
-            bills = []
-            for b in bill_res.data:
-                bills.append({
-                    "bill_id": b.get("bill_id"),
-                    "bill_number": b.get("bill_number"),
-                    "bill_name": b.get("bill_name"),
-                    "proposer": b.get("proposer"),
-                    "propose_date": b.get("propose_date"),
-                    "committee": b.get("committee")
-                })
-            
+        if bill_rows is None:
+            bill_rows = (
+                supabase.table("bills")
+                .select("*")
+                .ilike("bill_name", f"%{query_str}%")
+                .limit(10)
+                .execute()
+            ).data or []
+
+        if bill_rows:
+            bills = [_unified_bill(b) for b in bill_rows]
             return {
                 "type": "bill",
                 "data": bills,
                 "message": f"법안 {len(bills)}건을 찾았습니다."
             }
         
-        # 3. 검색 결과 없음
+        # 3. 정확히 맞는 결과가 없으면 오타 허용 검색 (자모 편집 거리, 인덱스가 있을 때만)
+        if idx is not None:
+            near_members = _live_rows("dimension", "member_id", [r for _, r in fuzzy.legislators(query_str, limit=1)])
+            if near_members:
+                member_data = near_members[0]
+                return {
+                    "type": "legislator",
+                    "data": _unified_legislator(member_data),
+                    "fuzzy": True,
+                    "message": f"'{query_str}'와(과) 비슷한 의원 '{member_data.get('name')}'을(를) 찾았습니다."
+                }
+            near_bills = _live_rows("bills", "bill_id", [b for _, b in fuzzy.bills(query_str, limit=10)])
+            if near_bills:
+                return {
+                    "type": "bill",
+                    "data": [_unified_bill(b) for b in near_bills],
+                    "fuzzy": True,
+                    "message": f"'{query_str}'와(과) 비슷한 법안 {len(near_bills)}건을 찾았습니다."
+                }
+
+        # 4. 검색 결과 없음
         return {
             "type": "none",
             "data": None,
@@ -1775,7 +1958,7 @@ def unified_search(query: str = Query(..., description="검색어 (의원명 또
         }
     
     except Exception as e:
-        print(f"Error in unified_search: {e}")
+        log.exception("Error in unified_search: %s", e)
         raise HTTPException(status_code=500, detail=f"통합 검색 중 오류 발생: {str(e)}")
 
 
@@ -1808,23 +1991,44 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
         if req.proposer_type:
             search_conditions["proposer_type"] = req.proposer_type
         
-        print(f"[법안 검색] 조건: {search_conditions}")
+        log.debug("[법안 검색] 조건: %s", search_conditions)
 
         # --- 2단계: bills 테이블에서 법안 검색 ---
-        query = supabase.table("bills").select("*")
+        text_terms = [("bill_name", req.bill_name), ("proposer_name", req.proposer)]
+        text_terms = [(f, v) for f, v in text_terms if v]
+        idx = _indexed(" ".join(v for _, v in text_terms)) if text_terms else None
+
+        if idx is not None:
+            # 부분 일치 조건은 인메모리 인덱스로, 나머지 정확 일치 조건은 같은 행에서 거른다
+            bills_data = None
+            for field, value in text_terms:
+                found = idx.matches("bill", field, value)
+                if bills_data is None:
+                    bills_data = found
+                else:
+                    keep = {id(b) for b in found}
+                    bills_data = [b for b in bills_data if id(b) in keep]
+            if req.bill_number:
+                bills_data = [b for b in bills_data if str(b.get("bill_id")) == str(req.bill_number).strip()]
+            # 내용(제안 유형 등)은 현재 DB 행 기준
+            bills_data = _live_rows("bills", "bill_id", bills_data)
+            if req.proposer_type:
+                bills_data = [b for b in bills_data if b.get("proposer_type") == req.proposer_type]
+        else:
+            query = supabase.table("bills").select("*")
 
-        # 4개 조건 적용
-        if req.bill_number:
-            query = query.eq("bill_id", req.bill_number)
-        if req.bill_name:
-            query = query.ilike("bill_name", f"%{req.bill_name}%")
-        if req.proposer:
-            query = query.ilike("proposer_name", f"%{req.proposer}%")
-        if req.proposer_type:
-            query = query.eq("proposer_type", req.proposer_type)
+            # 4개 조건 적용
+            if req.bill_number:
+                query = query.eq("bill_id", req.bill_number)
+            if req.bill_name:
+                query = query.ilike("bill_name", f"%{req.bill_name}%")
+            if req.proposer:
+                query = query.ilike("proposer_name", f"%{req.proposer}%")
+            if req.proposer_type:
+                query = query.eq("proposer_type", req.proposer_type)
 
-        bills_res = query.execute()
-        bills_data = bills_res.data or []
+            bills_res = query.execute()
+            bills_data = bills_res.data or []
 
         if not bills_data:
             return {
@@ -1834,7 +2038,7 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
                 "message": "검색 조건에 맞는 법안을 찾을 수 없습니다."
             }
 
-        print(f"[법안 검색] 총 {len(bills_data)}건 발견")
+        log.info("[법안 검색] 총 %d건 발견", len(bills_data))
 
         # --- 2-1단계: bill_detail_score에서 평가 데이터 조회 및 정렬 ---
         bill_ids = [bill.get("bill_id") for bill in bills_data if bill.get("bill_id")]
@@ -1856,9 +2060,9 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
                         "avg_score_prob": score_row.get("avg_score_prob", 0),
                         "bayesian_score": score_row.get("bayesian_score", 0)
                     }
-                print(f"[법안 평가 조회] {len(bill_score_map)}개 법안에 평가 데이터 존재")
+                log.debug("[법안 평가 조회] %d개 법안에 평가 데이터 존재", len(bill_score_map))
             except Exception as e:
-                print(f"WARN: bill_detail_score 조회 실패: {e}")
+                log.warning("bill_detail_score 조회 실패: %s", e)
         
         # 평가 데이터 기준으로 정렬: 평가 있는 법안 우선, 그 중에서도 발언 수 많은 순
         def bill_sort_key(bill):
@@ -1869,7 +2073,7 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
             return (-has_score, -speeches)  # 평가 있는 것 먼저, 발언 많은 것 먼저
         
         bills_data.sort(key=bill_sort_key)
-        print(f"[법안 정렬] 평가된 법안 우선 정렬 완료")
+        log.debug("[법안 정렬] 평가된 법안 우선 정렬 완료")
 
         # --- 3단계: 검색된 모든 법안의 통계를 한번에 조회 (최적화) ---
         
@@ -1881,14 +2085,14 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
                 "message": "유효한 법안 ID를 찾을 수 없습니다."
             }
         
-        print(f"[통계 조회] {len(bill_ids)}개 법안의 데이터를 조회합니다.")
+        log.debug("[통계 조회] %d개 법안의 데이터를 조회합니다.", len(bill_ids))
         
         # --- 3-1단계: bill_party_score 테이블에서 정당별 점수 조회 (최적화) ---
         party_scores_by_bill: dict[str, list[dict]] = {}
         if bill_ids:
             try:
-                print(f"[정당별 점수 조회] {len(bill_ids)}개 법안의 정당별 점수를 조회합니다.")
-                print(f"  샘플 bill_ids (처음 3개): {bill_ids[:3]}")
+                log.debug("[정당별 점수 조회] %d개 법안의 정당별 점수를 조회합니다.", len(bill_ids))
+                log.debug("  샘플 bill_ids (처음 3개): %s", bill_ids[:3])
                 party_score_res = (
                     supabase.table("bill_party_score")
                     .select("bill_number, party_name, speech_count, avg_score_prob, bayesian_score, original_stance")
@@ -1896,9 +2100,9 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
                     .execute()
                 )
                 
-                print(f"  조회된 전체 행 수: {len(party_score_res.data or [])}")
+                log.debug("  조회된 전체 행 수: %d", len(party_score_res.data or []))
                 if party_score_res.data:
-                    print(f"  첫 번째 행 샘플: {party_score_res.data[0]}")
+                    log.debug("  첫 번째 행 샘플: %s", party_score_res.data[0])
                 
                 for ps_row in (party_score_res.data or []):
                     bid = str(ps_row.get("bill_number"))
@@ -1906,15 +2110,15 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
                         party_scores_by_bill[bid] = []
                     party_scores_by_bill[bid].append(ps_row)
                 
-                print(f"[정당별 점수 조회] {len(party_scores_by_bill)}개 법안에 정당 데이터 존재")
+                log.debug("[정당별 점수 조회] %d개 법안에 정당 데이터 존재", len(party_scores_by_bill))
             except Exception as e:
-                print(f"WARN: bill_party_score 조회 실패: {e}")
+                log.warning("bill_party_score 조회 실패: %s", e)
 
         # --- 3-2단계: bill_member_score 테이블에서 개인별 점수/발언 수 조회 ---
         member_scores_by_bill: dict[str, list[dict]] = {}
         if bill_ids:
             try:
-                print(f"[개인별 점수 조회] {len(bill_ids)}개 법안의 개인별 점수를 조회합니다.")
+                log.debug("[개인별 점수 조회] %d개 법안의 개인별 점수를 조회합니다.", len(bill_ids))
                 member_score_res = (
                     supabase.table("bill_member_score")
                     .select("bill_number, member_id, member_name, party_name, speech_count, bayesian_score, avg_score_prob")
@@ -1922,18 +2126,18 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
                     .execute()
                 )
                 
-                print(f"  조회된 전체 행 수: {len(member_score_res.data or [])}")
+                log.debug("  조회된 전체 행 수: %d", len(member_score_res.data or []))
                 if member_score_res.data:
-                    print(f"  첫 번째 행 샘플: {member_score_res.data[0]}")
+                    log.debug("  첫 번째 행 샘플: %s", member_score_res.data[0])
                 
                 for ms_row in (member_score_res.data or []):
                     bid = str(ms_row.get("bill_number"))
                     if bid not in member_scores_by_bill:
                         member_scores_by_bill[bid] = []
                     member_scores_by_bill[bid].append(ms_row)
-                print(f"[개인별 점수 조회] {len(member_scores_by_bill)}개 법안에 개인 데이터 존재")
+                log.debug("[개인별 점수 조회] %d개 법안에 개인 데이터 존재", len(member_scores_by_bill))
             except Exception as e:
-                print(f"WARN: bill_member_score 조회 실패: {e}")
+                log.warning("bill_member_score 조회 실패: %s", e)
         
         # --- 4단계: 각 법안별 통계 계산 ---
         analysis_results = []
@@ -1943,7 +2147,7 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
             bill_id = bill.get("bill_id")
             bill_name = bill.get("bill_name")
             
-            print(f"[법안 분석] {bill_name} (ID: {bill_id})")
+            log.debug("[법안 분석] %s (ID: %s)", bill_name, bill_id)
             
             # bill_party_score에서 정당별 점수 가져오기 (우선 사용)
             party_score_rows = party_scores_by_bill.get(str(bill_id), [])
@@ -1953,7 +2157,7 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
             
             # 데이터가 전혀 없으면 기본 정보만 포함
             if not party_score_rows and not member_score_rows:
-                print(f"  - 데이터 없음, 기본 정보만 포함")
+                log.debug("  - 데이터 없음, 기본 정보만 포함")
                 analysis_results.append({
                     "bill_info": bill,
                     "stats": {
@@ -1974,7 +2178,7 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
             
             # [1단계] bill_party_score 사용 - 정당별 협력도
             if party_score_rows:
-                print(f"  - bill_party_score 사용: {len(party_score_rows)}개 정당")
+                log.debug("  - bill_party_score 사용: %d개 정당", len(party_score_rows))
                 
                 for ps_row in party_score_rows:
                     party_name = ps_row.get("party_name")
@@ -1997,14 +2201,14 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
                                 "stance": ps_row.get("original_stance", "중립")
                             })
                         except (ValueError, TypeError) as e:
-                            print(f"  WARN: bayesian_score 변환 실패: {bayesian}, {e}")
+                            log.warning("bayesian_score 변환 실패: %s, %s", bayesian, e)
                 
                 party_breakdown.sort(key=lambda x: x['avg_score'], reverse=True)
-                print(f"    정당별 분석 완료: {len(party_breakdown)}개 정당")
+                log.debug("    정당별 분석 완료: %d개 정당", len(party_breakdown))
             
             # [2단계] bill_member_score 사용 - 개인별 협력도
             if member_score_rows:
-                print(f"  - bill_member_score 사용: {len(member_score_rows)}명")
+                log.debug("  - bill_member_score 사용: %d명", len(member_score_rows))
                 
                 for r in member_score_rows:
                     n_speeches = r.get("speech_count", 0)
@@ -2023,12 +2227,12 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
                 
                 # 협력도 높은 순으로 정렬
                 individual_members.sort(key=lambda x: x['score'] if x['score'] is not None else 0, reverse=True)
-                print(f"    개인별 분석 완료: {len(individual_members)}명")
+                log.debug("    개인별 분석 완료: %d명", len(individual_members))
             
             # 평균 협력도 계산
             avg_cooperation = total_score_sum / count_for_score if count_for_score > 0 else 0.0
             
-            print(f"  - 최종 통계: speeches={total_speeches}, cooperation={avg_cooperation:.4f}, parties={len(party_breakdown)}, members={len(individual_members)}")
+            log.debug("  - 최종 통계: speeches=%s, cooperation=%.4f, parties=%d, members=%d", total_speeches, avg_cooperation, len(party_breakdown), len(individual_members))
             
             # 분석 완료 여부 판단
             if total_speeches > 0 or party_breakdown or individual_members:
@@ -2055,7 +2259,7 @@ def analyze_bill_centric(req: schemas.BillSearchInput):
         }
 
     except Exception as e:
-        print("Error in Bill Analysis:", e)
+        log.exception("Error in Bill Analysis: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # [추가] public 스키마의 각 테이블에서 5개 행씩 미리보기 제공
@@ -2067,7 +2271,7 @@ def _fetch_table_preview(table_name: str, limit: int):
         res = supabase.table(table_name).select("*").limit(limit).execute()
         return res.data or []
     except Exception as e:
-        print(f"Error fetching preview for {table_name}:", e)
+        log.warning("Error fetching preview for %s: %s", table_name, e)
         return {"error": str(e)}
 
 
@@ -2102,7 +2306,7 @@ def get_committee_summary(committee_id: int):
     }
     """
     try:
-        print(f"DEBUG /api/committee-summary/{committee_id}")
+        log.debug("/api/committee-summary/%s", committee_id)
 
         # 0. committees 테이블에서 committee_id 조회 (있으면 함께 리턴)
         committee_name = None
@@ -2114,12 +2318,12 @@ def get_committee_summary(committee_id: int):
                 .execute()
             )
             com_rows = com_res.data or []
-            print(com_res)
+            log.debug("committees 조회 결과: %s", com_res)
             if com_rows:
                 committee_name = com_rows[0].get("committee")
         except Exception as e:
             # committees 테이블이 없거나 조회 실패해도 치명적이지 않으므로 로그만 남기고 계속 진행
-            print(f"WARN: committees 조회 실패: {e}")
+            log.warning("committees 조회 실패: %s", e)
 
         # 1. committee_total_score 에서 bayesian_score 조회
         score_res = (
@@ -2176,7 +2380,7 @@ def get_committee_summary(committee_id: int):
                             member["party_id"] = party_map[mid]["party_id"]
                             member["party_name"] = party_map[mid]["party_name"]
                 except Exception as e:
-                    print(f"WARN: dimension 조회 실패 (party 정보): {e}")
+                    log.warning("dimension 조회 실패 (party 정보): %s", e)
 
         # 3. committee_bill_ranking: rank_in_committee 기준 상위 5개 법안
         bill_res = (
@@ -2215,7 +2419,7 @@ def get_committee_summary(committee_id: int):
         # 이미 의미 있는 HTTPException 을 만든 경우 그대로 raise
         raise
     except Exception as e:
-        print(f"Error in /api/committee-summary/{committee_name}:", e)
+        log.exception("Error in /api/committee-summary/%s: %s", committee_name, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -2243,7 +2447,7 @@ def predict_bill_pass(data: BillKeywordInput):
         if not keyword:
             raise HTTPException(status_code=400, detail="법안 키워드를 입력해주세요.")
         
-        print(f"[INFO] /api/predict/bill-pass 요청: keyword='{keyword}'")
+        log.info("/api/predict/bill-pass 요청: keyword=%r", keyword)
         
         # predict_bill_pass_probability 함수 호출
         result = predict_bill_pass_probability(keyword)
@@ -2270,49 +2474,84 @@ def predict_bill_pass(data: BillKeywordInput):
     except HTTPException as http_ex:
         raise http_ex
     except Exception as e:
-        print(f"Error in /api/predict/bill-pass: {e}")
+        log.exception("Error in /api/predict/bill-pass: %s", e)
         raise HTTPException(status_code=500, detail=f"법안 예측 중 오류: {str(e)}")
 
 # API Dashboard
 # Thay thế hàm get_user_dashboard cũ trong main.py bằng đoạn này:
 
+_USER_STATS_COLUMNS = ", ".join(user_stats.STATS_FIELDS)
+
+
+def _live_user_stats(user_id: str) -> dict:
+    """user_stats 에 행이 없을 때(재계산 전) 원본 테이블에서 바로 계산."""
+    # 1. Lấy thống kê (Dùng count='exact', head=True để chỉ lấy số lượng, không lấy data cho nhẹ)
+    logs_count_res = supabase.table("user_logs").select("*", count="exact", head=True).eq("user_id", user_id).execute()
+    saved_count_res = supabase.table("user_bookmarks").select("*", count="exact", head=True).eq("user_id", user_id).execute()
+
+    # 2. Lấy 5 hoạt động gần nhất
+    logs_res = (
+        supabase.table("user_logs")
+        .select("*")
+        .eq("user_id", user_id)
+        .order("created_at", desc=True)
+        .limit(user_stats.RECENT_N)
+        .execute()
+    )
+
+    # 3. Lấy bookmark
+    bookmarks_res = (
+        supabase.table("user_bookmarks")
+        .select("*")
+        .eq("user_id", user_id)
+        .order("created_at", desc=True)
+        .execute()
+    )
+    # Fix lỗi: Nếu count / data là None thì gán 0 / list rỗng
+    return {
+        "total_activities": logs_count_res.count or 0,
+        "total_saved": saved_count_res.count or 0,
+        "recent_activities": logs_res.data or [],
+        "saved_items": bookmarks_res.data or [],
+    }
+
+
+def _stored_user_stats(user_id: str) -> Optional[dict]:
+    """user_stats 한 행 (없으면 seed 후 다시 읽음). 테이블 / 함수가 없으면 예외."""
+    def _read():
+        res = (
+            supabase.table(user_stats.STATS_TABLE)
+            .select(_USER_STATS_COLUMNS)
+            .eq("user_id", user_id)
+            .limit(1)
+            .execute()
+        )
+        return res.data[0] if res.data else None
+
+    row = _read()
+    if row is None:
+        user_stats.seed(supabase, user_id)
+        row = _read()
+    return row
+
+
 @app.get("/api/dashboard/me", response_model=schemas.DashboardData)
 def get_user_dashboard(current_user = Depends(get_current_user)):
     """
     Lấy dữ liệu tổng hợp cho trang Dashboard (Phiên bản Fix lỗi 500)
+    user_stats 한 행 조회 (build_user_stats.py, 로그 / 북마크 쓰기 때 증가분 반영).
+    행이 없으면 원본 테이블에서 한 번 만들고(seed), user_stats 를 쓸 수 없으면 원본 테이블에서 계산한다.
     """
     user_id = current_user.id
     
     try:
-        # 1. Lấy thống kê (Dùng count='exact', head=True để chỉ lấy số lượng, không lấy data cho nhẹ)
-        logs_count_res = supabase.table("user_logs").select("*", count="exact", head=True).eq("user_id", user_id).execute()
-        total_activities = logs_count_res.count if logs_count_res.count is not None else 0
-        
-        saved_count_res = supabase.table("user_bookmarks").select("*", count="exact", head=True).eq("user_id", user_id).execute()
-        total_saved = saved_count_res.count if saved_count_res.count is not None else 0
-
-        # 2. Lấy 5 hoạt động gần nhất
-        logs_res = (
-            supabase.table("user_logs")
-            .select("*")
-            .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .limit(5)
-            .execute()
-        )
-        # Fix lỗi: Nếu data là None thì gán list rỗng
-        recent_logs = logs_res.data if logs_res.data else []
-
-        # 3. Lấy bookmark
-        bookmarks_res = (
-            supabase.table("user_bookmarks")
-            .select("*")
-            .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .execute()
-        )
-        # Fix lỗi: Nếu data là None thì gán list rỗng
-        saved_items = bookmarks_res.data if bookmarks_res.data else []
+        try:
+            stats = _stored_user_stats(user_id)
+        except Exception as e:
+            log.warning("user_stats 조회 실패 → 원본 테이블에서 계산: %s", e)
+            stats = None
+        if stats is None:
+            stats = _live_user_stats(user_id)
 
         # 4. Trả về (Đảm bảo đúng format Pydantic)
         return {
@@ -2322,17 +2561,17 @@ def get_user_dashboard(current_user = Depends(get_current_user)):
                 "plan": "Free Plan"
             },
             "stats": {
-                "total_activities": total_activities,
-                "total_saved": total_saved,
+                "total_activities": stats.get("total_activities") or 0,
+                "total_saved": stats.get("total_saved") or 0,
                 "trend": "Active"
             },
-            "recent_activities": recent_logs,
-            "saved_bills": saved_items
+            "recent_activities": stats.get("recent_activities") or [],
+            "saved_bills": stats.get("saved_items") or []
         }
 
     except Exception as e:
         # In lỗi chi tiết ra terminal để debug nếu vẫn bị
-        print(f"🔥 Dashboard Error Details: {str(e)}")
+        log.exception("🔥 Dashboard Error Details: %s", e)
         # Trả về dữ liệu rỗng thay vì lỗi 500 để App không bị sập
         return {
             "user_info": {"email": current_user.email, "name": "User", "plan": "Error"},
@@ -2347,21 +2586,29 @@ def get_user_dashboard(current_user = Depends(get_current_user)):
 # ==========================================
 
 @app.post("/api/log/activity")
-def log_user_activity(log: schemas.UserLogInput, current_user = Depends(get_current_user)):
+def log_user_activity(log_in: schemas.UserLogInput, current_user = Depends(get_current_user)):
     try:
         data = {
             "user_id": current_user.id,
-            "activity_type": log.activity_type,
-            "target_name": log.target_name,
-            "details": log.details
+            "activity_type": log_in.activity_type,
+            "target_name": log_in.target_name,
+            "details": log_in.details
         }
-        supabase.table("user_logs").insert(data).execute()
+        user_log_buffer.add(data)
         return {"status": "success"}
     except Exception as e:
-        print("Log Error:", e)
+        log.warning("Log Error: %s", e)
         return {"status": "error"}
 
 
+def _record_bookmark(user_id: str, delta: int, item: dict):
+    # 북마크 자체는 이미 저장됨 → 통계 갱신 실패는 로그만 (build_user_stats.py 로 재계산)
+    try:
+        user_stats.record_bookmark(supabase, user_id, delta, item)
+    except Exception as e:
+        log.warning("user_stats 북마크 반영 실패: %s", e)
+
+
 @app.post("/api/bookmark")
 def toggle_bookmark(item: schemas.BookmarkInput, current_user = Depends(get_current_user)):
     """
@@ -2382,6 +2629,7 @@ def toggle_bookmark(item: schemas.BookmarkInput, current_user = Depends(get_curr
         if existing.data:
             # Nếu có rồi -> Xóa (Un-bookmark)
             supabase.table("user_bookmarks").delete().eq("id", existing.data[0]['id']).execute()
+            _record_bookmark(user_id, -1, existing.data[0])
             return {"status": "removed", "msg": "Bookmark removed"}
         else:
             # Chưa có -> Thêm mới
@@ -2393,11 +2641,12 @@ def toggle_bookmark(item: schemas.BookmarkInput, current_user = Depends(get_curr
                 "score": item.score,
                 "status": "Tracking"
             }
-            supabase.table("user_bookmarks").insert(data).execute()
+            res = supabase.table("user_bookmarks").insert(data).execute()
+            _record_bookmark(user_id, 1, (res.data or [data])[0])
             return {"status": "added", "msg": "Bookmark added"}
             
     except Exception as e:
-        print("Bookmark Error:", e)
+        log.warning("Bookmark Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
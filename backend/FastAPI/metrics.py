@@ -0,0 +1,373 @@
+"""
+metrics.py
+----------------------------------------------------------
+API 지연시간 계측 + Prometheus 텍스트 포맷(/metrics) 출력.
+
+구성
+1) MetricsMiddleware (순수 ASGI)
+   - 라우트(경로 템플릿) × 메서드 × 상태코드별 지연시간 히스토그램
+   - 요청/응답 바이트 크기 히스토그램
+2) 요청 단위 구간(phase) 분해 — contextvar 에 요청별 누적 시간 저장
+   - supabase  : instrument_supabase() 가 감싼 클라이언트의 .execute() 시간
+   - pandas    : 엔드포인트 안에서 `with phase("pandas"):` 로 감싼 구간
+   - search    : 발언 검색(BM25) 색인 조회 — `with phase("search"):`
+   - serialize : 엔드포인트 반환 ~ 응답 시작 (response_model 검증 + JSON 인코딩/렌더)
+   - compress  : compression.CompressionMiddleware 의 응답 압축 (serialize 에서는 뺀다)
+3) TimedRoute : app.router.route_class 로 지정하면 라우트 템플릿 라벨과
+   엔드포인트 종료 시각을 기록한다 (라벨 카디널리티가 경로 파라미터로 늘어나지 않도록).
+
+사용 (main.py)
+    app.router.route_class = metrics.TimedRoute
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return PlainTextResponse(metrics.render_prometheus(), media_type=metrics.CONTENT_TYPE)
+"""
+import time
+import inspect
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from fastapi.routing import APIRoute
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+
+PHASES = ("supabase", "pandas", "search", "serialize", "compress")
+
+# /metrics 자체 호출은 집계하지 않음
+EXCLUDED_PATHS = {"/metrics"}
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# ======================================================================
+# Prometheus 히스토그램 / 게이지
+# ======================================================================
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_num(x: float) -> str:
+    if x == float("inf"):
+        return "+Inf"
+    return repr(float(x)) if not float(x).is_integer() else str(int(x))
+
+
+class Histogram:
+    """라벨별 누적 버킷 히스토그램 (스레드 안전)."""
+
+    def __init__(self, name: str, help_text: str, buckets, labelnames: Tuple[str, ...]):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.labelnames = labelnames
+        self._series: Dict[Tuple[str, ...], list] = {}   # labels → [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    s[i] += 1
+            s[-2] += value
+            s[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for labels, s in items:
+            for i, b in enumerate(self.buckets):
+                le = _fmt_labels(self.labelnames, labels, f'le="{_fmt_num(b)}"')
+                lines.append(f"{self.name}_bucket{le} {s[i]}")
+            inf = _fmt_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {s[-1]}")
+            lbl = _fmt_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{lbl} {_fmt_num(s[-2])}")
+            lines.append(f"{self.name}_count{lbl} {s[-1]}")
+        return lines
+
+
+class Gauge:
+    TYPE = "gauge"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n: int = 1):
+        with self._lock:
+            self.value += n
+
+    def dec(self, n: int = 1):
+        with self._lock:
+            self.value -= n
+
+    def set(self, value):
+        with self._lock:
+            self.value = value
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.TYPE}", f"{self.name} {self.value}"]
+
+
+class Counter(Gauge):
+    """증가만 하는 누적 카운터 (inc 만 사용)."""
+    TYPE = "counter"
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "요청 처리 시간(초)", LATENCY_BUCKETS, ("method", "route", "status"))
+REQUEST_SIZE = Histogram(
+    "http_request_size_bytes", "요청 본문 크기(바이트)", SIZE_BUCKETS, ("method", "route"))
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "응답 본문 크기(바이트)", SIZE_BUCKETS, ("method", "route"))
+PHASE_LATENCY = Histogram(
+    "http_request_phase_seconds", "요청 1건 안에서 구간별 누적 시간(초)", LATENCY_BUCKETS, ("route", "phase"))
+SUPABASE_LATENCY = Histogram(
+    "supabase_query_duration_seconds", "Supabase 쿼리 1회 .execute() 시간(초)", LATENCY_BUCKETS, ("table",))
+IN_PROGRESS = Gauge("http_requests_in_progress", "처리 중인 요청 수")
+
+REGISTRY = [REQUEST_LATENCY, REQUEST_SIZE, RESPONSE_SIZE, PHASE_LATENCY, SUPABASE_LATENCY, IN_PROGRESS]
+
+
+def register(*collectors):
+    """다른 모듈의 히스토그램/게이지를 /metrics 출력에 추가."""
+    REGISTRY.extend(c for c in collectors if c not in REGISTRY)
+
+
+def render_prometheus() -> str:
+    lines = []
+    for m in REGISTRY:
+        lines.extend(m.render())
+    return "\n".join(lines) + "\n"
+
+
+# ======================================================================
+# 요청 컨텍스트 / 구간 타이머
+# ======================================================================
+# 요청마다 {"route": str|None, "phases": {phase: 초}, "endpoint_done": perf_counter|None}
+# 동기 엔드포인트는 threadpool 에서 돌지만 컨텍스트가 복사되므로 같은 dict 를 공유한다.
+_request_ctx: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("metrics_request", default=None)
+
+
+def current_route() -> Optional[str]:
+    """현재 요청의 라우트 템플릿 (TimedRoute 가 기록, 라우트 매칭 전이면 None)."""
+    ctx = _request_ctx.get()
+    return ctx["route"] if ctx is not None else None
+
+
+def endpoint_running() -> bool:
+    """요청 처리 중이고 아직 엔드포인트 함수가 끝나지 않았으면 True (응답 직렬화 위치 구분용)."""
+    ctx = _request_ctx.get()
+    return ctx is not None and ctx["endpoint_done"] is None
+
+
+def add_phase(name: str, seconds: float):
+    ctx = _request_ctx.get()
+    if ctx is not None:
+        ctx["phases"][name] = ctx["phases"].get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name: str):
+    """with phase("pandas"): ... → 현재 요청의 해당 구간 시간에 더한다."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase(name, time.perf_counter() - t0)
+
+
+# ======================================================================
+# Supabase 클라이언트 계측
+# ======================================================================
+# .execute() 직후 호출되는 훅: hook(table, steps, result, seconds, error)
+# (query_trace.py 가 요청별 쿼리 추적을 위해 등록)
+QUERY_HOOKS = []
+
+
+class _TimedQuery:
+    """
+    postgrest 빌더 체인을 감싸 .execute() 시간을 측정 (나머지는 그대로 위임).
+    체인 호출 내역(steps)은 ((메서드, args, kwargs), ...) 로 들고 다니며 훅에 넘긴다.
+    """
+
+    __slots__ = ("_q", "_label", "_steps")
+
+    def __init__(self, q, label: str, steps: tuple = ()):
+        self._q = q
+        self._label = label
+        self._steps = steps
+
+    def __getattr__(self, name):
+        attr = getattr(self._q, name)
+        if name == "execute":
+            return self._execute
+        if callable(attr):
+            @functools.wraps(attr)
+            def chain(*args, **kwargs):
+                out = attr(*args, **kwargs)
+                if hasattr(out, "execute"):
+                    return _TimedQuery(out, self._label, self._steps + ((name, args, kwargs),))
+                return out
+            return chain
+        # .not_ 같은 프로퍼티도 빌더를 돌려줌
+        if hasattr(attr, "execute"):
+            return _TimedQuery(attr, self._label, self._steps + ((name, (), {}),))
+        return attr
+
+    def _execute(self, *args, **kwargs):
+        result, error = None, None
+        t0 = time.perf_counter()
+        try:
+            result = self._q.execute(*args, **kwargs)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            dt = time.perf_counter() - t0
+            SUPABASE_LATENCY.observe(dt, self._label)
+            add_phase("supabase", dt)
+            for hook in QUERY_HOOKS:
+                hook(self._label, self._steps, result, dt, error)
+
+
+class TimedSupabase:
+    """supabase.Client 프록시: table()/from_()/rpc() 결과의 .execute() 를 계측."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name: str):
+        return _TimedQuery(self._client.table(name), name)
+
+    def from_(self, name: str):
+        return self.table(name)
+
+    def rpc(self, fn: str, *args, **kwargs):
+        return _TimedQuery(self._client.rpc(fn, *args, **kwargs), f"rpc:{fn}")
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def instrument_supabase(client):
+    return TimedSupabase(client)
+
+
+# ======================================================================
+# 라우트 클래스: 라벨(경로 템플릿) + 엔드포인트 종료 시각 기록
+# ======================================================================
+def _mark_endpoint_done():
+    ctx = _request_ctx.get()
+    if ctx is not None:
+        ctx["endpoint_done"] = time.perf_counter()
+
+
+def _wrap_endpoint(endpoint):
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _mark_endpoint_done()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                _mark_endpoint_done()
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _wrap_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        label = self.path_format
+
+        async def timed_handler(request):
+            ctx = _request_ctx.get()
+            if ctx is not None:
+                ctx["route"] = label
+            return await handler(request)
+
+        return timed_handler
+
+
+# ======================================================================
+# ASGI 미들웨어
+# ======================================================================
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        ctx = {"route": None, "phases": {}, "endpoint_done": None}
+        token = _request_ctx.set(ctx)
+        state = {"status": 500, "req_bytes": 0, "resp_bytes": 0}
+        content_length = dict(scope.get("headers") or []).get(b"content-length")
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                state["req_bytes"] += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                if ctx["endpoint_done"] is not None:
+                    # 압축 미들웨어는 본문 압축이 끝난 뒤 시작 메시지를 보내므로 그 시간은 제외
+                    spent = time.perf_counter() - ctx["endpoint_done"] - ctx["phases"].get("compress", 0.0)
+                    add_phase("serialize", max(spent, 0.0))
+            elif message["type"] == "http.response.body":
+                state["resp_bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        IN_PROGRESS.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - t0
+            IN_PROGRESS.dec()
+            _request_ctx.reset(token)
+
+            method = scope.get("method", "")
+            route = ctx["route"] or UNMATCHED_ROUTE
+            REQUEST_LATENCY.observe(elapsed, method, route, str(state["status"]))
+            # 본문을 읽지 않은 엔드포인트도 있으므로 Content-Length 가 있으면 우선
+            req_bytes = int(content_length) if content_length and content_length.isdigit() else state["req_bytes"]
+            REQUEST_SIZE.observe(req_bytes, method, route)
+            RESPONSE_SIZE.observe(state["resp_bytes"], method, route)
+            for name in PHASES:
+                PHASE_LATENCY.observe(ctx["phases"].get(name, 0.0), route, name)
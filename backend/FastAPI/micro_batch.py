@@ -0,0 +1,146 @@
+"""
+micro_batch.py
+----------------------------------------------------------
+동시 요청을 모아 한 번에 추론하는 in-process 마이크로 배처 (/sentiment).
+
+요청마다 모델 forward 를 한 번씩 돌리면 CPU 가 배치 1 짜리 행렬 연산에 대부분을 쓴다.
+MicroBatcher 는 요청 큐 + 추론 스레드 하나로
+  - 첫 요청이 들어온 뒤 max_wait 동안 (또는 max_batch 개가 찰 때까지) 더 모아서
+  - predict_fn(입력 목록) 을 한 번 호출하고
+  - 결과를 각 요청의 Future 로 돌려준다.
+한가할 때는 max_wait 만큼만 늦어지고, 붐빌 때는 배치가 커져 처리량이 오른다.
+
+  - 큐가 max_queue 를 넘으면 QueueFull (→ 503). 기다리다 끊긴 요청(Future 취소)은 추론에서 뺀다.
+  - predict_fn 이 예외를 내면 그 배치의 모든 요청에 같은 예외.
+  - stop() 은 새 요청을 막고 남은 큐를 처리한 뒤 끝낸다 (lifespan 종료 시).
+
+지표 (/metrics, 이름 앞에 <name>_)
+  queue_depth (gauge) / batch_size (histogram) / queue_wait_seconds / batch_seconds / rejected_total
+
+설정 (환경변수)
+  INFER_MAX_BATCH=32  INFER_MAX_WAIT_MS=5  INFER_MAX_QUEUE=1024  INFER_TIMEOUT=30
+
+사용
+    batcher = MicroBatcher("sentiment", lambda texts: clf.predict_proba(texts))
+    probs = await asyncio.wrap_future(batcher.submit(text))
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Optional, Sequence
+
+import metrics
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+MAX_BATCH = int(os.getenv("INFER_MAX_BATCH", "32"))
+MAX_WAIT = float(os.getenv("INFER_MAX_WAIT_MS", "5")) / 1000
+MAX_QUEUE = int(os.getenv("INFER_MAX_QUEUE", "1024"))
+TIMEOUT = float(os.getenv("INFER_TIMEOUT", "30"))
+
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class QueueFull(Exception):
+    """대기열이 가득 참 (과부하)."""
+
+
+class MicroBatcher:
+    def __init__(self, name: str, predict_fn: Callable[[list], Sequence], max_batch: int = MAX_BATCH,
+                 max_wait: float = MAX_WAIT, max_queue: int = MAX_QUEUE):
+        self.name = name
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self._queue = deque()           # (입력, Future, 들어온 시각)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.queue_depth = metrics.Gauge(f"{name}_queue_depth", "추론 대기열 길이")
+        self.batch_size = metrics.Histogram(f"{name}_batch_size", "추론 1회 배치 크기", BATCH_BUCKETS, ())
+        self.queue_wait = metrics.Histogram(
+            f"{name}_queue_wait_seconds", "요청이 배치에 들어가기까지 기다린 시간(초)", metrics.LATENCY_BUCKETS, ())
+        self.batch_seconds = metrics.Histogram(
+            f"{name}_batch_seconds", "배치 1회 추론 시간(초)", metrics.LATENCY_BUCKETS, ())
+        self.rejected = metrics.Counter(f"{name}_rejected_total", "대기열이 가득 차 거절한 요청 수")
+        metrics.register(self.queue_depth, self.batch_size, self.queue_wait, self.batch_seconds, self.rejected)
+
+    # ------------------------------------------------------------------
+    def start(self):
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name=f"{self.name}-batcher", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        """새 요청을 막고 남은 대기열을 처리한 뒤 종료."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, item) -> Future:
+        fut: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"{self.name} 배처가 종료되었습니다")
+            if len(self._queue) >= self.max_queue:
+                self.rejected.inc()
+                raise QueueFull(f"{self.name} 대기열 초과 ({self.max_queue})")
+            self._queue.append((item, fut, time.perf_counter()))
+            self.queue_depth.set(len(self._queue))
+            self._cond.notify()
+        if self._thread is None:
+            self.start()
+        return fut
+
+    # ------------------------------------------------------------------
+    def _next_batch(self) -> Optional[list]:
+        """첫 요청 후 max_wait 또는 max_batch 까지 모은 배치 (종료 + 빈 큐면 None)."""
+        with self._cond:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            deadline = self._queue[0][2] + self.max_wait
+            while len(self._queue) < self.max_batch and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            n = min(self.max_batch, len(self._queue))
+            batch = [self._queue.popleft() for _ in range(n)]
+            self.queue_depth.set(len(self._queue))
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            now = time.perf_counter()
+            # 기다리다 취소된 요청은 빼고 추론
+            live = [(item, fut) for item, fut, t in batch if fut.set_running_or_notify_cancel()]
+            for _, _, t in batch:
+                self.queue_wait.observe(now - t)
+            if not live:
+                continue
+            self.batch_size.observe(len(live))
+            try:
+                results = self.predict_fn([item for item, _ in live])
+            except Exception as e:
+                log.warning("%s 배치 추론 실패 (%d건): %s", self.name, len(live), e)
+                for _, fut in live:
+                    fut.set_exception(e)
+                continue
+            finally:
+                self.batch_seconds.observe(time.perf_counter() - now)
+            for (_, fut), res in zip(live, results):
+                fut.set_result(res)
@@ -0,0 +1,240 @@
+"""
+query_trace.py
+----------------------------------------------------------
+요청 단위 Supabase 쿼리 추적 + 중복/N+1 패턴 감지.
+
+metrics.py 의 Supabase 프록시가 .execute() 마다 훅을 부르면, 현재 요청의
+추적 목록에 (테이블, 체인 호출 내역, 행 수, 소요 시간) 을 쌓는다.
+응답 직전에 목록을 분석해
+  - duplicate : 테이블/필터/값까지 똑같은 쿼리가 2번 이상
+  - n+1       : 값만 다르고 모양(테이블 + 메서드 + 컬럼)이 같은 쿼리가 N_PLUS_ONE_MIN 번 이상
+                (ex: for bill_id in ids: supabase.table("bills").eq("bill_id", bill_id) ...)
+를 찾아 디버그 헤더, 경고 로그, 라우트별 누적 통계에 남긴다.
+
+- X-Query-Trace 헤더 : QUERY_TRACE_HEADER=1 이거나 요청에 X-Debug-Queries 헤더가 있을 때만
+    "n=4; ms=81.2; dup=committees_history.select(...).eq(member_id,?)x2; n+1=bills...x12"
+- 누적 통계        : stats() → GET /api/debug/query-stats (DEBUG_ENDPOINTS=1 일 때만)
+"""
+import os
+import threading
+import contextvars
+from collections import Counter
+from typing import Optional
+from urllib.parse import quote
+
+import metrics
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+# 값 인자를 버리고 컬럼만 모양(shape)에 남기는 필터 메서드
+FILTER_METHODS = {
+    "eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "is_", "in_",
+    "contains", "contained_by", "overlaps", "text_search", "filter", "match", "or_",
+}
+N_PLUS_ONE_MIN = 3
+MAX_HEADER_LEN = 2000
+
+TRACE_HEADER = b"x-query-trace"
+DEBUG_REQUEST_HEADER = b"x-debug-queries"
+
+_trace_var: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("query_trace", default=None)
+
+
+# ======================================================================
+# 쿼리 서술 / 모양
+# ======================================================================
+def _short(v, limit: int = 40) -> str:
+    if isinstance(v, (list, tuple, set)):
+        return f"[{len(v)}]"
+    s = str(v)
+    return s if len(s) <= limit else s[: limit - 3] + "..."
+
+
+def _fmt_step(name: str, args, kwargs, keep_values: bool) -> str:
+    if name in FILTER_METHODS and not keep_values:
+        if name in ("or_", "match", "filter") or not args:
+            parts = ["?"]
+        else:
+            parts = [str(args[0])] + ["?"] * (len(args) - 1)
+    else:
+        parts = [_short(a) for a in args]
+    parts += [f"{k}={_short(v)}" for k, v in kwargs.items()]
+    return f"{name}({','.join(parts)})"
+
+
+def describe(table: str, steps) -> str:
+    """table.select(*).eq(member_id,5) — 값까지 포함 (중복 판정 키)."""
+    return ".".join([table] + [_fmt_step(n, a, k, True) for n, a, k in steps])
+
+
+def shape(table: str, steps) -> str:
+    """table.select(*).eq(member_id,?) — 필터 값 제거 (N+1 판정 키)."""
+    return ".".join([table] + [_fmt_step(n, a, k, False) for n, a, k in steps])
+
+
+def _row_count(result) -> int:
+    data = getattr(result, "data", None)
+    if isinstance(data, list):
+        return len(data)
+    return 1 if data else 0
+
+
+def _on_query(table, steps, result, seconds, error):
+    trace = _trace_var.get()
+    if trace is None:   # 요청 밖(스크립트, 시작 시점 등)은 추적하지 않음
+        return
+    trace.append({
+        "table": table,
+        "query": describe(table, steps),
+        "shape": shape(table, steps),
+        "rows": _row_count(result) if error is None else None,
+        "ms": round(seconds * 1000, 2),
+        "error": type(error).__name__ if error is not None else None,
+    })
+
+
+metrics.QUERY_HOOKS.append(_on_query)
+
+
+# ======================================================================
+# 분석
+# ======================================================================
+def analyze(trace: list) -> dict:
+    by_query = Counter(q["query"] for q in trace)
+    by_shape = Counter(q["shape"] for q in trace)
+    distinct_per_shape = Counter()
+    for qs in {(q["shape"], q["query"]) for q in trace}:
+        distinct_per_shape[qs[0]] += 1
+
+    duplicates = [{"query": q, "times": n} for q, n in by_query.items() if n > 1]
+    n_plus_one = [
+        {"shape": s, "times": n, "distinct": distinct_per_shape[s]}
+        for s, n in by_shape.items()
+        if n >= N_PLUS_ONE_MIN and distinct_per_shape[s] >= N_PLUS_ONE_MIN
+    ]
+    return {
+        "count": len(trace),
+        "ms": round(sum(q["ms"] for q in trace), 2),
+        "rows": sum(q["rows"] or 0 for q in trace),
+        "duplicates": duplicates,
+        "n_plus_one": n_plus_one,
+    }
+
+
+def header_value(summary: dict) -> str:
+    parts = [f"n={summary['count']}", f"ms={summary['ms']}", f"rows={summary['rows']}"]
+    parts += [f"dup={d['query']}x{d['times']}" for d in summary["duplicates"]]
+    parts += [f"n+1={d['shape']}x{d['times']}" for d in summary["n_plus_one"]]
+    value = "; ".join(parts)
+    if len(value) > MAX_HEADER_LEN:
+        value = value[: MAX_HEADER_LEN - 3] + "..."
+    # 헤더는 latin-1 만 허용 → 한글 필터 값 등은 퍼센트 인코딩
+    return quote(value, safe=" =;:,.()*?[]+-_<>/|")
+
+
+# ======================================================================
+# 라우트별 누적 통계
+# ======================================================================
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record_stats(route: str, summary: dict):
+    with _stats_lock:
+        st = _stats.get(route)
+        if st is None:
+            st = _stats[route] = {
+                "requests": 0, "queries": 0, "ms": 0.0, "rows": 0,
+                "max_queries": 0, "dup_requests": 0, "n_plus_one_requests": 0,
+                "patterns": Counter(),
+            }
+        st["requests"] += 1
+        st["queries"] += summary["count"]
+        st["ms"] += summary["ms"]
+        st["rows"] += summary["rows"]
+        st["max_queries"] = max(st["max_queries"], summary["count"])
+        if summary["duplicates"]:
+            st["dup_requests"] += 1
+        if summary["n_plus_one"]:
+            st["n_plus_one_requests"] += 1
+        for d in summary["duplicates"]:
+            st["patterns"]["dup " + d["query"]] += 1
+        for d in summary["n_plus_one"]:
+            st["patterns"]["n+1 " + d["shape"]] += 1
+
+
+def stats(top: int = 5) -> dict:
+    """라우트별 요청당 평균 쿼리 수/시간과 자주 나온 중복·N+1 패턴 (요청당 쿼리 수 내림차순)."""
+    with _stats_lock:
+        rows = []
+        for route, st in _stats.items():
+            n = st["requests"] or 1
+            rows.append({
+                "route": route,
+                "requests": st["requests"],
+                "avg_queries": round(st["queries"] / n, 2),
+                "max_queries": st["max_queries"],
+                "avg_query_ms": round(st["ms"] / n, 2),
+                "avg_rows": round(st["rows"] / n, 1),
+                "dup_requests": st["dup_requests"],
+                "n_plus_one_requests": st["n_plus_one_requests"],
+                "top_patterns": [{"pattern": p, "requests": c} for p, c in st["patterns"].most_common(top)],
+            })
+    rows.sort(key=lambda r: r["avg_queries"], reverse=True)
+    return {"n_plus_one_min": N_PLUS_ONE_MIN, "routes": rows}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+# ======================================================================
+# ASGI 미들웨어
+# ======================================================================
+class QueryTraceMiddleware:
+    """
+    요청마다 추적 목록을 열고, 응답 시작 시 분석 → (옵션) X-Query-Trace 헤더,
+    요청 종료 시 라우트별 통계 누적 + 중복/N+1 경고 로그.
+    metrics.MetricsMiddleware 안쪽에 두어야 라우트 라벨을 쓸 수 있다.
+    """
+
+    def __init__(self, app, always_header: Optional[bool] = None):
+        self.app = app
+        if always_header is None:
+            always_header = os.getenv("QUERY_TRACE_HEADER", "0") == "1"
+        self.always_header = always_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in metrics.EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        trace = []
+        token = _trace_var.set(trace)
+        want_header = self.always_header or any(k == DEBUG_REQUEST_HEADER for k, _ in scope.get("headers") or [])
+        result = {}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                result["summary"] = analyze(trace)
+                if want_header:
+                    message["headers"] = list(message.get("headers") or []) + [
+                        (TRACE_HEADER, header_value(result["summary"]).encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _trace_var.reset(token)
+            summary = result.get("summary") or analyze(trace)
+            route = metrics.current_route() or metrics.UNMATCHED_ROUTE
+            _record_stats(route, summary)
+            if summary["duplicates"] or summary["n_plus_one"]:
+                log.warning(
+                    "쿼리 패턴 경고 %s: 중복 %d건, N+1 %d건",
+                    route, len(summary["duplicates"]), len(summary["n_plus_one"]),
+                    extra={"duplicates": summary["duplicates"], "n_plus_one": summary["n_plus_one"]},
+                )
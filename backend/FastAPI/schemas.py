@@ -8,6 +8,7 @@ class AnalysisInput(BaseModel):
 class SentimentOutput(BaseModel):
     label: str
     confidence_score: float
+    probabilities: Optional[Dict[str, float]] = None   # noncoop / coop / neutral
 
 class PredictionOutput(BaseModel):
     label: str
@@ -18,6 +19,7 @@ class UserCreate(BaseModel):
     email: EmailStr         
     username: str           
     password: str
+    full_name: Optional[str] = None
 
 class UserLogin(BaseModel):
     email: EmailStr
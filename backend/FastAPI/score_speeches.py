@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+score_speeches.py
+----------------------------------------------------------
+📌 목적:
+수집/분할 결과 JSON (speeches_*.json) 의 발언마다 협력도 확률
+prob_noncoop / prob_coop / prob_neutral 을 채운다 (coop_classifier.py, CPU).
+build_member_stats / build_party_* 가 읽는 speeches 컬럼이 이 결과다.
+
+📌 처리 방식
+  1) 채점: 입력 파일을 하나씩 읽어 (전체를 메모리에 올리지 않음) 아직 채점하지 않은 본문만 모은다.
+     - 본문 해시(text_hash, 공백 정리 후 sha1) 기준으로 중복 제거 + SQLite 캐시 확인
+       → "네.", "동의합니다." 같은 반복 발언과 이전 실행에서 채점한 본문은 다시 계산하지 않는다.
+     - --chunk 개씩 모아 토큰 길이순 배치로 추론 (coop_classifier.plan_batches)
+     - --workers N : 해시를 N 조각으로 나눠 프로세스 N 개가 나눠 채점 (스레드는 코어 수 / N)
+       --shard i/n : 여러 번 실행해서 나눌 때 (같은 캐시 파일 공유)
+  2) 쓰기: 캐시에서 확률을 읽어 발언에 필드를 추가한 JSON 을 --out-dir 에 저장
+     (--upsert 면 Supabase speeches 의 확률 컬럼도 speech_id 기준으로 갱신)
+
+캐시는 (모델 id, 본문 해시) 가 키라서 모델을 바꾸면 (COOP_MODEL / COOP_MODEL_ID) 새로 채점한다.
+--runtime (torch / torch-int8 / onnx / onnx-int8) 별로도 따로 캐시한다.
+본문이 비어 있는 발언은 모델을 거치지 않고 중립 (0, 0, 1) 으로 둔다.
+
+📌 사용
+    python score_speeches.py ../../data/division_out/speeches_triggerdeliber_*.json
+    python score_speeches.py "./out/*.json" --workers 4 --out-dir ./output_scores/json
+    python score_speeches.py "./out/*.json" --shard 0/2 --no-write      # 다른 터미널에서 --shard 1/2
+    python score_speeches.py "./out/*.json" --upsert                    # Supabase speeches 갱신
+    python score_speeches.py "./out/*.json" --runtime onnx-int8         # 양자화 모델로 채점
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing as mp
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import coop_classifier
+from coop_classifier import PROB_COLUMNS, text_hash
+
+CACHE_FILE = "./output_scores/coop_scores.sqlite"
+OUT_DIR = "./output_scores/json"
+CHUNK = 2048            # 한 번에 추론할 고유 본문 수 (이 안에서 길이순 정렬)
+UPSERT_BATCH = 500
+EMPTY_PROBS = (0.0, 0.0, 1.0)   # 본문 없음 → 중립
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    model         TEXT NOT NULL,
+    text_hash     TEXT NOT NULL,
+    prob_noncoop  REAL NOT NULL,
+    prob_coop     REAL NOT NULL,
+    prob_neutral  REAL NOT NULL,
+    scored_at     TEXT,
+    PRIMARY KEY (model, text_hash)
+) WITHOUT ROWID
+"""
+
+
+# ---------------------------------------------------------
+# ✔ 채점 캐시 (SQLite, 프로세스 여러 개가 같이 씀)
+# ---------------------------------------------------------
+class ScoreCache:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, Tuple[float, float, float]]:
+        out = {}
+        hashes = list(hashes)
+        for i in range(0, len(hashes), 500):
+            part = hashes[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT text_hash, prob_noncoop, prob_coop, prob_neutral FROM scores "
+                f"WHERE model = ? AND text_hash IN ({','.join('?' * len(part))})",
+                (model, *part),
+            ).fetchall()
+            out.update((h, (a, b, c)) for h, a, b, c in rows)
+        return out
+
+    def put_many(self, model: str, rows: Sequence[Tuple[str, Sequence[float]]]):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?)",
+                [(model, h, float(p[0]), float(p[1]), float(p[2]), now) for h, p in rows],
+            )
+
+
+# ---------------------------------------------------------
+# ✔ 입력 (파일 단위 스트리밍)
+# ---------------------------------------------------------
+def expand_inputs(patterns: Sequence[str]) -> List[str]:
+    paths = []
+    for p in patterns:
+        paths.extend(sorted(glob.glob(p)) or ([p] if os.path.exists(p) else []))
+    return list(dict.fromkeys(paths))
+
+
+def iter_speeches(paths: Sequence[str]) -> Iterator[Tuple[str, List[dict]]]:
+    """(파일, 발언 목록) 을 파일 하나씩."""
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        yield path, data if isinstance(data, list) else data.get("speeches", [])
+
+
+def _in_shard(h: str, shard: int, n_shards: int) -> bool:
+    return n_shards <= 1 or int(h[:8], 16) % n_shards == shard
+
+
+# ---------------------------------------------------------
+# ✔ 1) 채점
+# ---------------------------------------------------------
+def score_shard(paths: Sequence[str], cache_path: str, shard: int = 0, n_shards: int = 1,
+                chunk: int = CHUNK, num_threads: Optional[int] = None, classifier=None,
+                runtime: str = coop_classifier.RUNTIME) -> dict:
+    """담당 조각의 미채점 본문을 채점해 캐시에 넣는다 → 통계."""
+    clf = classifier or coop_classifier.CoopClassifier(num_threads=num_threads, runtime=runtime)
+    cache = ScoreCache(cache_path)
+    stats = {"shard": shard, "speeches": 0, "unique": 0, "cached": 0, "scored": 0, "seconds": 0.0}
+    t0 = time.perf_counter()
+    seen, pending = set(), {}
+
+    def flush():
+        if not pending:
+            return
+        hashes = list(pending)
+        probs = clf.predict_proba([pending[h] for h in hashes])
+        cache.put_many(clf.model_id, list(zip(hashes, probs)))
+        stats["scored"] += len(hashes)
+        pending.clear()
+
+    try:
+        for _, speeches in iter_speeches(paths):
+            fresh = {}
+            for s in speeches:
+                text = s.get("speech_text")
+                if not text or not str(text).strip():
+                    continue
+                stats["speeches"] += 1
+                h = text_hash(text)
+                if h in seen or not _in_shard(h, shard, n_shards):
+                    continue
+                seen.add(h)
+                fresh[h] = str(text)
+            stats["unique"] += len(fresh)
+            done = cache.get_many(clf.model_id, fresh)
+            stats["cached"] += len(done)
+            for h, text in fresh.items():
+                if h not in done:
+                    pending[h] = text
+            if len(pending) >= chunk:
+                flush()
+        flush()
+    finally:
+        cache.close()
+    stats["seconds"] = round(time.perf_counter() - t0, 2)
+    return stats
+
+
+def _score_worker(args) -> dict:
+    paths, cache_path, shard, n_shards, chunk, num_threads, runtime = args
+    return score_shard(paths, cache_path, shard, n_shards, chunk, num_threads, runtime=runtime)
+
+
+def score_all(paths: Sequence[str], cache_path: str, workers: int = 1, shard: Optional[Tuple[int, int]] = None,
+              chunk: int = CHUNK, runtime: str = coop_classifier.RUNTIME) -> List[dict]:
+    if shard is not None:
+        return [score_shard(paths, cache_path, shard[0], shard[1], chunk, runtime=runtime)]
+    if workers <= 1:
+        return [score_shard(paths, cache_path, chunk=chunk, runtime=runtime)]
+    # 프로세스마다 모델을 따로 로드 → torch 스레드는 코어를 나눠 쓴다
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    jobs = [(list(paths), cache_path, i, workers, chunk, threads, runtime) for i in range(workers)]
+    with mp.get_context("spawn").Pool(workers) as pool:
+        return pool.map(_score_worker, jobs)
+
+
+# ---------------------------------------------------------
+# ✔ 2) 확률 컬럼 쓰기
+# ---------------------------------------------------------
+def attach_probs(speeches: List[dict], scores: Dict[str, Tuple[float, float, float]]) -> int:
+    """발언에 prob_* 를 채운다 → 캐시에 없어 못 채운 발언 수."""
+    missing = 0
+    for s in speeches:
+        text = s.get("speech_text")
+        if not text or not str(text).strip():
+            probs = EMPTY_PROBS
+        else:
+            probs = scores.get(text_hash(text))
+            if probs is None:
+                missing += 1
+                continue
+        for col, p in zip(PROB_COLUMNS, probs):
+            s[col] = round(float(p), 6)
+    return missing
+
+
+def write_outputs(paths: Sequence[str], cache_path: str, model_id: str, out_dir: Optional[str],
+                  upsert: bool = False) -> dict:
+    cache = ScoreCache(cache_path)
+    client = None
+    if upsert:
+        from database import supabase as client
+    stats = {"files": 0, "speeches": 0, "missing": 0, "upserted": 0}
+    try:
+        for path, speeches in iter_speeches(paths):
+            hashes = {text_hash(s.get("speech_text")) for s in speeches if s.get("speech_text")}
+            stats["missing"] += attach_probs(speeches, cache.get_many(model_id, hashes))
+            stats["files"] += 1
+            stats["speeches"] += len(speeches)
+            if out_dir:
+                os.makedirs(out_dir, exist_ok=True)
+                with open(os.path.join(out_dir, os.path.basename(path)), "w", encoding="utf-8") as f:
+                    json.dump(speeches, f, ensure_ascii=False, indent=2)
+            if client is not None:
+                rows = [
+                    {"speech_id": s["speech_id"], **{c: s[c] for c in PROB_COLUMNS}}
+                    for s in speeches if s.get("speech_id") is not None and PROB_COLUMNS[0] in s
+                ]
+                for i in range(0, len(rows), UPSERT_BATCH):
+                    client.table("speeches").upsert(rows[i:i + UPSERT_BATCH], on_conflict="speech_id").execute()
+                stats["upserted"] += len(rows)
+    finally:
+        cache.close()
+    return stats
+
+
+# ---------------------------------------------------------
+# ✔ CLI
+# ---------------------------------------------------------
+def _parse_shard(val: str) -> Tuple[int, int]:
+    i, n = (int(x) for x in val.split("/"))
+    if not 0 <= i < n:
+        raise argparse.ArgumentTypeError("--shard 는 i/n (0 <= i < n)")
+    return i, n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="발언 협력도 일괄 채점 → prob_noncoop / prob_coop / prob_neutral")
+    parser.add_argument("inputs", nargs="+", help="speeches JSON 파일 또는 glob 패턴")
+    parser.add_argument("--cache", default=CACHE_FILE, help="채점 캐시 SQLite 경로")
+    parser.add_argument("--out-dir", default=OUT_DIR, help="확률 컬럼을 추가한 JSON 저장 위치")
+    parser.add_argument("--workers", type=int, default=1, help="채점 프로세스 수")
+    parser.add_argument("--shard", type=_parse_shard, help="이 실행이 맡을 조각 i/n (여러 번 실행해서 나눌 때)")
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="한 번에 추론할 고유 본문 수")
+    parser.add_argument("--runtime", choices=coop_classifier.RUNTIMES, default=coop_classifier.RUNTIME,
+                        help="추론 런타임 (기본 COOP_RUNTIME 또는 torch)")
+    parser.add_argument("--no-write", action="store_true", help="채점만 하고 JSON / Supabase 에 쓰지 않음")
+    parser.add_argument("--upsert", action="store_true", help="Supabase speeches 확률 컬럼 갱신")
+    args = parser.parse_args()
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("입력 파일이 없습니다")
+    print(f"📂 입력 {len(paths)}개 파일, 모델 {coop_classifier.MODEL_PATH} [{args.runtime}]")
+
+    for st in score_all(paths, args.cache, args.workers, args.shard, args.chunk, args.runtime):
+        rate = st["scored"] / st["seconds"] if st["seconds"] else 0.0
+        print(f"  조각 {st['shard']}: 발언 {st['speeches']} / 고유 {st['unique']} / 캐시 {st['cached']} / "
+              f"채점 {st['scored']} ({st['seconds']}s, {rate:.1f}건/s)")
+
+    if args.no_write or args.shard is not None:
+        return
+    st = write_outputs(paths, args.cache, coop_classifier.model_id(runtime=args.runtime), args.out_dir, args.upsert)
+    print(f"✅ {st['files']}개 파일 / 발언 {st['speeches']}건 저장 (캐시 없음 {st['missing']}건, upsert {st['upserted']}건)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+search_index.py
+----------------------------------------------------------
+의원 이름 / 법안명 / 대표발의자 (+ 정당명 / 위원회명) 에 대한 인메모리 글자 bigram 역색인.
+
+기존 검색 API 는 요청마다 Supabase 에 ilike '%검색어%' 를 보내는데,
+인덱스를 탈 수 없는 부분 문자열 스캔이다. unified-search 는 의원 → 법안 순으로
+두 번 왕복하기도 한다. 이 모듈은 dimension / bills 를 한 번 읽어
+  - 필드별로 (소문자) 글자 bigram → 행 번호 집합 (1글자 검색어용 unigram 포함)
+  - 검색: 검색어 bigram 들의 교집합 → 실제 부분 문자열인지 확인 (= ilike '%q%' 와 같은 결과)
+  - 순위: 완전 일치 > 접두 일치 > 포함, 짧은 문자열 우선, 같으면 원래 행 순서
+로 여러 엔티티를 한 번에 찾는다. 읽어 둔 행은 suggest.py (자동완성) 도 같이 쓴다.
+
+데이터 버전 (행 수 + 최대 id) 은 SEARCH_INDEX_CHECK_SECONDS(기본 60초) 마다 백그라운드에서
+확인하고, 바뀌었으면 새 인덱스를 만들어 교체한다 (교체 전까지는 이전 인덱스로 응답).
+버전은 제자리 수정(정당 / 위원회 / 사진 변경 등)을 모르므로, API 응답 내용은 인덱스 행이 아니라
+찾은 키로 DB 에서 다시 읽은 행을 쓴다 (main._live_rows).
+Supabase 를 못 읽으면 None 을 돌려주고, 호출 쪽은 기존 ilike 쿼리로 대체한다.
+SEARCH_INDEX=0 이면 끈다.
+
+사용
+    import search_index
+    idx = search_index.get_index()
+    if idx is not None:
+        hits = idx.search("국민", [("legislator", "name"), ("bill", "bill_name")], limit=10)
+        member_ids = idx.ids("legislator", "name", "김")
+"""
+import os
+import time
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+ENABLED = os.getenv("SEARCH_INDEX", "1") != "0"
+CHECK_SECONDS = float(os.getenv("SEARCH_INDEX_CHECK_SECONDS", "60"))
+PAGE_SIZE = 1000
+
+# 엔티티 → (테이블, 키 컬럼, 색인 필드)
+ENTITIES = {
+    "legislator": ("dimension", "member_id", ("name",)),
+    "bill": ("bills", "bill_id", ("bill_name", "proposer_name")),
+    "party": ("parties", "party_id", ("party_name",)),
+    "committee": ("committees", "committee_id", ("committee",)),
+}
+
+
+# ======================================================================
+# 필드 색인
+# ======================================================================
+def _grams(text: str) -> set:
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def _query_grams(q: str) -> set:
+    if len(q) == 1:
+        return {q}
+    return {q[i:i + 2] for i in range(len(q) - 1)}
+
+
+class _FieldIndex:
+    def __init__(self, values: Sequence[Optional[str]]):
+        self.texts = [str(v).lower() if v is not None else "" for v in values]
+        self.postings: Dict[str, set] = {}
+        for pos, text in enumerate(self.texts):
+            for g in _grams(text):
+                self.postings.setdefault(g, set()).add(pos)
+
+    def find(self, q: str) -> List[Tuple[tuple, int]]:
+        """부분 문자열로 q 를 포함하는 행 → [(순위 키, 행 번호)] (순서 없음)."""
+        q = q.lower()
+        if not q:   # ilike '%%' → 전체
+            return [((2, len(t), pos), pos) for pos, t in enumerate(self.texts)]
+        lists = []
+        for g in _query_grams(q):
+            p = self.postings.get(g)
+            if not p:
+                return []
+            lists.append(p)
+        lists.sort(key=len)
+        candidates = lists[0].intersection(*lists[1:]) if len(lists) > 1 else lists[0]
+        out = []
+        for pos in candidates:
+            text = self.texts[pos]
+            at = text.find(q)
+            if at < 0:
+                continue
+            kind = 0 if text == q else 1 if at == 0 else 2
+            out.append(((kind, len(text), pos), pos))
+        return out
+
+
+# ======================================================================
+# 전체 인덱스
+# ======================================================================
+class SearchIndex:
+    def __init__(self, rows: Dict[str, List[dict]], version: tuple = ()):
+        self.version = version
+        self.rows = rows
+        self.fields: Dict[Tuple[str, str], _FieldIndex] = {}
+        for entity, (_, _, fields) in ENTITIES.items():
+            for f in fields:
+                self.fields[(entity, f)] = _FieldIndex([r.get(f) for r in rows.get(entity, [])])
+        self.built_at = time.time()
+
+    def _rank(self, entity: str, fields: Iterable[str], q: str) -> List[int]:
+        best: Dict[int, tuple] = {}
+        for f in fields:
+            for key, pos in self.fields[(entity, f)].find(q):
+                if pos not in best or key < best[pos]:
+                    best[pos] = key
+        return sorted(best, key=best.__getitem__)
+
+    def search(self, q: str, targets: Sequence[Tuple[str, str]], limit: Optional[int] = None) -> Dict[str, List[dict]]:
+        """targets=[(엔티티, 필드), ...] 를 한 번에 검색 → {엔티티: [행, ...]} (순위순)."""
+        q = q.strip()
+        by_entity: Dict[str, List[str]] = {}
+        for entity, field in targets:
+            by_entity.setdefault(entity, []).append(field)
+        out = {}
+        for entity, fields in by_entity.items():
+            positions = self._rank(entity, fields, q) if q else []
+            if limit is not None:
+                positions = positions[:limit]
+            rows = self.rows.get(entity, [])
+            out[entity] = [rows[p] for p in positions]
+        return out
+
+    def matches(self, entity: str, field: str, q: str) -> List[dict]:
+        """ilike '%q%' 와 같은 행 집합 (원래 행 순서)."""
+        rows = self.rows.get(entity, [])
+        return [rows[p] for p in sorted(pos for _, pos in self.fields[(entity, field)].find(q))]
+
+    def ids(self, entity: str, field: str, q: str) -> List:
+        key = ENTITIES[entity][1]
+        return [r.get(key) for r in self.matches(entity, field, q)]
+
+    def stats(self) -> dict:
+        return {
+            "version": list(self.version),
+            "built_at": self.built_at,
+            "rows": {e: len(r) for e, r in self.rows.items()},
+            "grams": {f"{e}.{f}": len(ix.postings) for (e, f), ix in self.fields.items()},
+        }
+
+
+# ======================================================================
+# Supabase 로딩 / 버전 확인
+# ======================================================================
+def _client():
+    from database import supabase
+    return supabase
+
+
+def _fetch_all(table: str, key: str) -> List[dict]:
+    client, rows, start = _client(), [], 0
+    while True:
+        chunk = (
+            client.table(table).select("*").order(key).range(start, start + PAGE_SIZE - 1).execute().data or []
+        )
+        rows.extend(chunk)
+        if len(chunk) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+def data_version() -> tuple:
+    """(테이블별 행 수, 최대 키) — 적재/삭제가 있으면 바뀐다."""
+    client, version = _client(), []
+    for table, key, _ in ENTITIES.values():
+        count = client.table(table).select(key, count="exact", head=True).execute().count
+        last = client.table(table).select(key).order(key, desc=True).limit(1).execute().data or []
+        version.append((table, count, last[0].get(key) if last else None))
+    return tuple(version)
+
+
+def build() -> SearchIndex:
+    t0 = time.perf_counter()
+    version = data_version()
+    rows = {entity: _fetch_all(table, key) for entity, (table, key, _) in ENTITIES.items()}
+    idx = SearchIndex(rows, version)
+    log.info(
+        "검색 인덱스 생성: 의원 %d명, 법안 %d건 (%.2fs)",
+        len(rows["legislator"]), len(rows["bill"]), time.perf_counter() - t0,
+    )
+    return idx
+
+
+_index: Optional[SearchIndex] = None
+_checked_at = 0.0
+_failed_at: Optional[float] = None
+_lock = threading.Lock()
+_refreshing = threading.Event()
+
+
+def _refresh():
+    global _index
+    try:
+        version = data_version()
+        if _index is None or version != _index.version:
+            _index = build()
+    except Exception as e:
+        log.warning("검색 인덱스 갱신 실패 (이전 인덱스 유지): %s", e)
+    finally:
+        _refreshing.clear()
+
+
+def get_index() -> Optional[SearchIndex]:
+    """현재 인덱스. 처음엔 동기 생성, 이후엔 CHECK_SECONDS 마다 백그라운드로 버전 확인."""
+    global _index, _checked_at, _failed_at
+    if not ENABLED:
+        return None
+    if _index is None:
+        # 생성에 실패했으면 CHECK_SECONDS 동안은 다시 시도하지 않고 ilike 로
+        if _failed_at is not None and time.monotonic() - _failed_at < CHECK_SECONDS:
+            return None
+        with _lock:
+            if _index is None:
+                try:
+                    _index = build()
+                except Exception as e:
+                    _failed_at = time.monotonic()
+                    log.warning("검색 인덱스 생성 실패 → ilike 쿼리 사용: %s", e)
+                    return None
+                _checked_at, _failed_at = time.monotonic(), None
+        return _index
+    if time.monotonic() - _checked_at >= CHECK_SECONDS and not _refreshing.is_set():
+        _checked_at = time.monotonic()
+        _refreshing.set()
+        threading.Thread(target=_refresh, name="search-index-refresh", daemon=True).start()
+    return _index
+
+
+def current() -> Optional[SearchIndex]:
+    """이미 만들어진 인덱스 (없으면 None, 새로 만들지 않음)."""
+    return _index
+
+
+def invalidate():
+    """다음 get_index() 에서 새로 만든다 (데이터를 통째로 바꾼 뒤 / 테스트용)."""
+    global _index, _failed_at
+    with _lock:
+        _index, _failed_at = None, None
+
+
+def has_wildcards(q: str) -> bool:
+    """ilike 와일드카드(%, _)가 들어간 검색어는 인덱스 대신 DB 로 (의미가 다름)."""
+    return "%" in q or "_" in q
@@ -0,0 +1,628 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+speech_search.py
+----------------------------------------------------------
+발언(speech_text) 전문 검색: 디스크 기반, 메모리 매핑 BM25 역색인.
+
+/api/speeches 는 의원 / 회의 / 법안명 ilike 로만 거를 수 있어서
+"누가 무슨 말을 했는지" 를 찾을 수 없다. 이 모듈은 발언 전체를 색인해
+/api/speeches/search 에서 검색어 + 의원 / 정당 / 위원회 / 날짜 필터로 BM25 순위와
+하이라이트 스니펫을 돌려준다.
+
+토큰화
+  - 소문자화 후 한글/영문/숫자 연속 구간만 사용, 구간마다 글자 bigram (1글자 구간은 unigram)
+    → 형태소 분석기 없이 조사/어미가 붙은 형태도 부분 일치로 잡힌다.
+  - 검색어도 같은 방식으로 토큰화한다 (단어당 2글자 이상 권장).
+
+디스크 구조 (SPEECH_INDEX_DIR, 기본 ./speech_index)
+  manifest.json                  세그먼트 목록 + 색인된 meeting_id → 세그먼트
+  seg_00001/
+    meta.json                    문서 수 / 총 토큰 수 / 정당·위원회 코드표 / 의원 이름
+    terms.npy        <U2  [T]    정렬된 토큰
+    term_off.npy     int64[T+1]  토큰별 postings 구간
+    post_doc.npy     int32[P]    세그먼트 내 문서 번호
+    post_tf.npy      uint16[P]   토큰 빈도
+    doc_len.npy      int32[D]    문서 길이 (토큰 수)
+    speech_id.npy / member_id.npy / meeting_id.npy  int64[D]
+    date.npy         int32[D]    yyyymmdd (0 = 미상)
+    party.npy / committee.npy  int16[D]  코드 (-1 = 미상)
+    text.bin / text_off.npy      UTF-8 원문 (스니펫용)
+  모든 배열은 np.load(mmap_mode="r") 로 열어서 프로세스 메모리에 통째로 올리지 않는다.
+
+증분 색인
+  - build: meetings 테이블의 회의 중 manifest 에 없는 것만 읽어 새 세그먼트로 추가
+    (회의 단위로 쌓다가 --segment-docs 를 넘으면 세그먼트를 닫는다)
+  - compact: 세그먼트를 하나로 합친다 (세그먼트가 많아지면 검색이 세그먼트 수만큼 느려짐)
+  - 이미 색인된 회의의 발언이 바뀌었으면 --rebuild 로 처음부터 다시 만든다.
+  - API 프로세스는 manifest 수정 시각이 바뀌면 자동으로 다시 연다.
+
+사용
+    python speech_search.py build                     # Supabase → 새 회의만 색인
+    python speech_search.py build --rebuild
+    python speech_search.py compact
+    python speech_search.py search "탄소중립" --party 더불어민주당 --limit 5
+    python speech_search.py stats
+"""
+import os
+import re
+import json
+import html
+import math
+import time
+import heapq
+import shutil
+import argparse
+import threading
+from collections import Counter
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+INDEX_DIR = Path(os.getenv("SPEECH_INDEX_DIR", Path(__file__).resolve().parent / "speech_index"))
+SEGMENT_DOCS = 200_000
+RELOAD_CHECK_SECONDS = 5.0
+K1, B = 1.2, 0.75
+SNIPPET_CHARS = 160
+PAGE_SIZE = 1000
+
+_RE_RUN = re.compile(r"[0-9a-z가-힣]+")
+
+
+# ======================================================================
+# 토큰화
+# ======================================================================
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for run in _RE_RUN.findall(str(text or "").lower()):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _date_int(value) -> int:
+    if not value:
+        return 0
+    s = str(value)[:10].replace("-", "")
+    return int(s) if s.isdigit() and len(s) == 8 else 0
+
+
+def _int_or(value, default: int = -1) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# ======================================================================
+# 세그먼트 쓰기
+# ======================================================================
+class SegmentWriter:
+    """문서를 모아 한 세그먼트 디렉터리로 쓴다."""
+
+    def __init__(self):
+        self.docs: List[dict] = []
+        self.parties: Dict[str, int] = {}
+        self.committees: Dict[str, int] = {}
+        self.members: Dict[str, str] = {}
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _code(self, table: Dict[str, int], value) -> int:
+        if not value:
+            return -1
+        return table.setdefault(str(value), len(table))
+
+    def add(self, speech: dict, party: Optional[str], committee: Optional[str], meeting_date, member_name=None):
+        mid = _int_or(speech.get("member_id"))
+        if mid >= 0 and member_name:
+            self.members[str(mid)] = member_name
+        self.docs.append({
+            "speech_id": _int_or(speech.get("speech_id")),
+            "member_id": mid,
+            "meeting_id": _int_or(speech.get("meeting_id")),
+            "date": _date_int(meeting_date),
+            "party": self._code(self.parties, party),
+            "committee": self._code(self.committees, committee),
+            "text": speech.get("speech_text") or "",
+        })
+
+    def write(self, path: Path):
+        tmp = path.with_name(path.name + ".tmp")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+
+        terms_l, docs_l, tfs_l, doc_len = [], [], [], []
+        for d, doc in enumerate(self.docs):
+            counts = Counter(tokenize(doc["text"]))
+            doc_len.append(sum(counts.values()))
+            terms_l.extend(counts.keys())
+            docs_l.extend([d] * len(counts))
+            tfs_l.extend(min(c, 65535) for c in counts.values())
+        _write_postings(
+            tmp,
+            np.array(terms_l, dtype="<U2"),
+            np.array(docs_l, dtype=np.int32),
+            np.array(tfs_l, dtype=np.uint16),
+        )
+
+        cols = {k: [doc[k] for doc in self.docs] for k in ("speech_id", "member_id", "meeting_id")}
+        for k, v in cols.items():
+            np.save(tmp / f"{k}.npy", np.array(v, dtype=np.int64))
+        np.save(tmp / "doc_len.npy", np.array(doc_len, dtype=np.int32))
+        np.save(tmp / "date.npy", np.array([doc["date"] for doc in self.docs], dtype=np.int32))
+        np.save(tmp / "party.npy", np.array([doc["party"] for doc in self.docs], dtype=np.int16))
+        np.save(tmp / "committee.npy", np.array([doc["committee"] for doc in self.docs], dtype=np.int16))
+
+        encoded = [doc["text"].encode("utf-8") for doc in self.docs]
+        (tmp / "text.bin").write_bytes(b"".join(encoded))
+        np.save(tmp / "text_off.npy", np.concatenate([[0], np.cumsum([len(e) for e in encoded])]).astype(np.int64))
+
+        _write_meta(tmp, len(self.docs), int(sum(doc_len)), self.parties, self.committees, self.members)
+        if path.exists():
+            shutil.rmtree(path)
+        tmp.rename(path)
+
+
+def _write_postings(path: Path, terms: np.ndarray, docs: np.ndarray, tfs: np.ndarray):
+    """(토큰, 문서, 빈도) 3열 → 토큰 정렬 postings (토큰 내 문서 번호 오름차순)."""
+    order = np.lexsort((docs, terms))
+    terms, docs, tfs = terms[order], docs[order], tfs[order]
+    uniq, starts = np.unique(terms, return_index=True)
+    np.save(path / "terms.npy", uniq.astype("<U2"))
+    np.save(path / "term_off.npy", np.append(starts, len(terms)).astype(np.int64))
+    np.save(path / "post_doc.npy", docs.astype(np.int32))
+    np.save(path / "post_tf.npy", tfs.astype(np.uint16))
+
+
+def _write_meta(path: Path, n_docs: int, total_len: int, parties, committees, members):
+    meta = {
+        "n_docs": n_docs,
+        "total_len": total_len,
+        "parties": sorted(parties, key=parties.get),
+        "committees": sorted(committees, key=committees.get),
+        "members": members,
+    }
+    (path / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+
+# ======================================================================
+# 세그먼트 읽기 / 검색
+# ======================================================================
+class Segment:
+    ARRAYS = (
+        "terms", "term_off", "post_doc", "post_tf", "doc_len", "speech_id",
+        "member_id", "meeting_id", "date", "party", "committee", "text_off",
+    )
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        for name in self.ARRAYS:
+            setattr(self, name, np.load(path / f"{name}.npy", mmap_mode="r"))
+        # 빈 파일은 memmap 할 수 없다
+        self.text = np.memmap(path / "text.bin", dtype=np.uint8, mode="r") if (path / "text.bin").stat().st_size else None
+        self.party_code = {p: i for i, p in enumerate(self.meta["parties"])}
+        self.committee_code = {c: i for i, c in enumerate(self.meta["committees"])}
+        self.n_docs = self.meta["n_docs"]
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        i = int(np.searchsorted(self.terms, term))
+        if i >= len(self.terms) or self.terms[i] != term:
+            return _EMPTY_I32, _EMPTY_U16
+        lo, hi = int(self.term_off[i]), int(self.term_off[i + 1])
+        return self.post_doc[lo:hi], self.post_tf[lo:hi]
+
+    def doc_text(self, d: int) -> str:
+        if self.text is None:
+            return ""
+        lo, hi = int(self.text_off[d]), int(self.text_off[d + 1])
+        return bytes(self.text[lo:hi]).decode("utf-8", errors="replace")
+
+    def filter_mask(self, member_id=None, party=None, committee=None, date_from=0, date_to=0):
+        """필터 조건 → bool 마스크 (조건 없음 = None, 세그먼트에 해당 값이 없으면 False)."""
+        mask = None
+
+        def _and(m):
+            nonlocal mask
+            mask = m if mask is None else (mask & m)
+
+        if member_id is not None:
+            _and(np.asarray(self.member_id) == member_id)
+        if party:
+            if party not in self.party_code:
+                return False
+            _and(np.asarray(self.party) == self.party_code[party])
+        if committee:
+            if committee not in self.committee_code:
+                return False
+            _and(np.asarray(self.committee) == self.committee_code[committee])
+        if date_from:
+            _and(np.asarray(self.date) >= date_from)
+        if date_to:
+            _and(np.asarray(self.date) <= date_to)
+        return mask
+
+
+_EMPTY_I32 = np.zeros(0, dtype=np.int32)
+_EMPTY_U16 = np.zeros(0, dtype=np.uint16)
+
+
+class SpeechIndex:
+    def __init__(self, root: Path):
+        self.root = root
+        manifest = json.loads((root / "manifest.json").read_text(encoding="utf-8"))
+        self.manifest = manifest
+        self.segments = [Segment(root / name) for name in manifest["segments"]]
+        self.n_docs = sum(s.n_docs for s in self.segments)
+        total = sum(s.meta["total_len"] for s in self.segments)
+        self.avgdl = total / self.n_docs if self.n_docs else 0.0
+        # BM25 길이 정규화 항은 색인이 바뀌기 전까지 고정 → 세그먼트마다 한 번만 계산
+        for seg in self.segments:
+            seg.norm = K1 * (1 - B + B * np.asarray(seg.doc_len, dtype=np.float32) / np.float32(self.avgdl or 1.0))
+
+    def search(
+        self,
+        q: str,
+        member_id: Optional[int] = None,
+        party: Optional[str] = None,
+        committee: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> dict:
+        terms = sorted(set(tokenize(q)))
+        if not terms or not self.n_docs:
+            return {"total": 0, "results": []}
+
+        per_seg = [{t: seg.postings(t) for t in terms} for seg in self.segments]
+        df = {t: sum(len(p[t][0]) for p in per_seg) for t in terms}
+        idf = {t: math.log(1 + (self.n_docs - df[t] + 0.5) / (df[t] + 0.5)) for t in terms if df[t]}
+        if not idf:
+            return {"total": 0, "results": []}
+
+        want = offset + limit
+        heap: List[Tuple[float, int, int]] = []   # (점수, -세그먼트, -문서) 최소 힙
+        total = 0
+        d_from, d_to = _date_int(date_from), _date_int(date_to)
+        for si, (seg, posts) in enumerate(zip(self.segments, per_seg)):
+            mask = seg.filter_mask(member_id, party, committee, d_from, d_to)
+            if mask is False:
+                continue
+            scores = np.zeros(seg.n_docs, dtype=np.float32)
+            norm = seg.norm
+            for t, w in idf.items():
+                docs, tfs = posts[t]
+                if not len(docs):
+                    continue
+                tf = np.asarray(tfs, dtype=np.float32)
+                scores[docs] += w * tf * (K1 + 1) / (tf + norm[docs])
+            if mask is not None:
+                scores[~mask] = 0
+            hits = np.flatnonzero(scores)
+            total += len(hits)
+            if not len(hits):
+                continue
+            if len(hits) > want:
+                # want 번째 점수 이상만 남긴다 (동점은 모두 남겨서 힙에서 순서를 정함 → 세그먼트 구성과 무관)
+                cut = np.partition(scores[hits], len(hits) - want)[len(hits) - want]
+                hits = hits[scores[hits] >= cut]
+            for d in hits:
+                item = (float(scores[d]), -si, -int(d))
+                if len(heap) < want:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        ranked = sorted(heap, reverse=True)[offset:want]
+        words = [w for w in _RE_RUN.findall(q.lower()) if w]
+        results = []
+        for score, neg_si, neg_d in ranked:
+            seg, d = self.segments[-neg_si], -neg_d
+            party_code, committee_code = int(seg.party[d]), int(seg.committee[d])
+            mid = int(seg.member_id[d])
+            results.append({
+                "speech_id": int(seg.speech_id[d]),
+                "meeting_id": int(seg.meeting_id[d]),
+                "member_id": mid if mid >= 0 else None,
+                "member_name": seg.meta["members"].get(str(mid)),
+                "party": seg.meta["parties"][party_code] if party_code >= 0 else None,
+                "committee": seg.meta["committees"][committee_code] if committee_code >= 0 else None,
+                "date": _fmt_date(int(seg.date[d])),
+                "score": round(score, 4),
+                "snippet": snippet(seg.doc_text(d), words),
+            })
+        return {"total": total, "results": results}
+
+    def stats(self) -> dict:
+        return {
+            "segments": len(self.segments),
+            "docs": self.n_docs,
+            "meetings": len(self.manifest.get("meetings", {})),
+            "avg_doc_len": round(self.avgdl, 1),
+            "built_at": self.manifest.get("updated_at"),
+        }
+
+
+def _fmt_date(v: int) -> Optional[str]:
+    if not v:
+        return None
+    s = str(v)
+    return f"{s[:4]}-{s[4:6]}-{s[6:]}"
+
+
+# ======================================================================
+# 스니펫 / 하이라이트
+# ======================================================================
+def snippet(text: str, words: List[str], width: int = SNIPPET_CHARS) -> str:
+    """
+    검색어가 가장 많이 모인 구간을 width 글자로 자르고, 검색어(없으면 bigram) 를 <mark> 로 감싼다.
+    원문은 HTML 이스케이프한다.
+    """
+    low = text.lower()
+    spans = []
+    for w in sorted(set(words), key=len, reverse=True):
+        pieces = [w] if w in low else [w[i:i + 2] for i in range(len(w) - 1)] or [w]
+        for p in pieces:
+            start = low.find(p)
+            while start >= 0:
+                spans.append((start, start + len(p)))
+                start = low.find(p, start + len(p))
+    if not spans:
+        return html.escape(text[:width]) + ("…" if len(text) > width else "")
+
+    spans.sort()
+    # 창 안에 들어오는 하이라이트 수가 가장 많은 시작점 (투 포인터)
+    best_start, best_n, j = spans[0][0], 0, 0
+    for i, (s, _) in enumerate(spans):
+        while spans[j][0] < s - width // 2:
+            j += 1
+        if i - j + 1 > best_n:
+            best_n, best_start = i - j + 1, spans[j][0]
+    lo = max(0, min(best_start - width // 4, len(text) - width))
+    hi = min(len(text), lo + width)
+
+    out, pos = [], lo
+    for s, e in spans:
+        if e <= pos or s >= hi:
+            continue
+        s = max(s, pos)
+        e = min(e, hi)
+        out.append(html.escape(text[pos:s]))
+        out.append(f"<mark>{html.escape(text[s:e])}</mark>")
+        pos = e
+    out.append(html.escape(text[pos:hi]))
+    return ("…" if lo > 0 else "") + "".join(out) + ("…" if hi < len(text) else "")
+
+
+# ======================================================================
+# 로딩 (API 프로세스)
+# ======================================================================
+_index: Optional[SpeechIndex] = None
+_index_mtime: Optional[float] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_index() -> Optional[SpeechIndex]:
+    """색인이 없으면 None. manifest 가 바뀌었으면 다시 연다 (RELOAD_CHECK_SECONDS 간격으로 확인)."""
+    global _index, _index_mtime, _checked_at
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < RELOAD_CHECK_SECONDS:
+        return _index
+    with _lock:
+        _checked_at = now
+        manifest = INDEX_DIR / "manifest.json"
+        try:
+            mtime = manifest.stat().st_mtime
+        except FileNotFoundError:
+            _index, _index_mtime = None, None
+            return None
+        if _index is None or mtime != _index_mtime:
+            _index, _index_mtime = SpeechIndex(INDEX_DIR), mtime
+            log.info("발언 검색 색인 열기: %s", _index.stats())
+    return _index
+
+
+def reset():
+    """다음 get_index() 에서 다시 연다 (INDEX_DIR 를 바꾼 뒤 / 테스트용)."""
+    global _index, _index_mtime
+    with _lock:
+        _index, _index_mtime = None, None
+
+
+# ======================================================================
+# 색인 생성 (CLI)
+# ======================================================================
+def _load_manifest(root: Path) -> dict:
+    path = root / "manifest.json"
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {"segments": [], "meetings": {}, "next_segment": 1}
+
+
+def _save_manifest(root: Path, manifest: dict):
+    manifest["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    tmp = root / "manifest.json.tmp"
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, root / "manifest.json")
+
+
+def _fetch_pages(query_fn) -> Iterable[dict]:
+    start = 0
+    while True:
+        chunk = query_fn().range(start, start + PAGE_SIZE - 1).execute().data or []
+        yield from chunk
+        if len(chunk) < PAGE_SIZE:
+            return
+        start += PAGE_SIZE
+
+
+def build(client, root: Path = None, segment_docs: int = SEGMENT_DOCS, rebuild: bool = False,
+          max_meetings: Optional[int] = None) -> dict:
+    """manifest 에 없는 회의만 읽어 세그먼트를 추가한다. 반환: {"meetings": n, "docs": n, "segments": [...]}"""
+    root = Path(root or INDEX_DIR)
+    if rebuild and root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(root)
+
+    members = {
+        str(r.get("member_id")): (r.get("party"), r.get("name"))
+        for r in _fetch_pages(lambda: client.table("dimension").select("member_id, party, name").order("member_id"))
+    }
+    meetings = [
+        m for m in _fetch_pages(
+            lambda: client.table("meetings").select("meeting_id, meeting_category, meeting_date").order("meeting_id")
+        )
+        if str(m.get("meeting_id")) not in manifest["meetings"]
+    ]
+    if max_meetings is not None:
+        meetings = meetings[:max_meetings]
+
+    added = {"meetings": 0, "docs": 0, "segments": []}
+    writer, pending = SegmentWriter(), []
+
+    def _flush():
+        nonlocal writer, pending
+        if not pending:
+            return
+        name = f"seg_{manifest['next_segment']:05d}"
+        manifest["next_segment"] += 1
+        writer.write(root / name)
+        manifest["segments"].append(name)
+        for mid in pending:
+            manifest["meetings"][mid] = name
+        _save_manifest(root, manifest)
+        log.info("세그먼트 %s: 회의 %d개, 발언 %d건", name, len(pending), len(writer))
+        added["segments"].append(name)
+        writer, pending = SegmentWriter(), []
+
+    for m in meetings:
+        meeting_id = m.get("meeting_id")
+        rows = _fetch_pages(
+            lambda: client.table("speeches").select("speech_id, meeting_id, member_id, speech_text")
+            .eq("meeting_id", meeting_id).order("speech_id")
+        )
+        for s in rows:
+            party, name = members.get(str(s.get("member_id")), (None, None))
+            writer.add(s, party, m.get("meeting_category"), m.get("meeting_date"), name)
+            added["docs"] += 1
+        pending.append(str(meeting_id))
+        added["meetings"] += 1
+        if len(writer) >= segment_docs:
+            _flush()
+    _flush()
+    return added
+
+
+def compact(root: Path = None) -> Optional[str]:
+    """모든 세그먼트를 하나로 합친다 (postings 는 (토큰, 문서) 순으로 다시 정렬)."""
+    root = Path(root or INDEX_DIR)
+    manifest = _load_manifest(root)
+    if len(manifest["segments"]) <= 1:
+        return None
+    segs = [Segment(root / name) for name in manifest["segments"]]
+    name = f"seg_{manifest['next_segment']:05d}"
+    tmp = root / (name + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir()
+
+    parties, committees, members = {}, {}, {}
+    terms, docs, tfs = [], [], []
+    cols = {k: [] for k in ("doc_len", "speech_id", "member_id", "meeting_id", "date", "party", "committee")}
+    texts, base = [], 0
+    for seg in segs:
+        counts = np.diff(np.asarray(seg.term_off))
+        terms.append(np.repeat(np.asarray(seg.terms), counts))
+        docs.append(np.asarray(seg.post_doc, dtype=np.int64) + base)
+        tfs.append(np.asarray(seg.post_tf))
+        for k in ("doc_len", "speech_id", "member_id", "meeting_id", "date"):
+            cols[k].append(np.asarray(getattr(seg, k)))
+        # 세그먼트별 코드 → 합친 코드표 (마지막 원소 -1 은 미상 코드 -1 을 그대로 매핑)
+        for k, src, table in (("party", seg.meta["parties"], parties), ("committee", seg.meta["committees"], committees)):
+            remap = np.array([table.setdefault(v, len(table)) for v in src] + [-1], dtype=np.int16)
+            cols[k].append(remap[np.asarray(getattr(seg, k))])
+        members.update(seg.meta["members"])
+        if seg.text is not None:
+            texts.append(bytes(seg.text))
+        base += seg.n_docs
+
+    _write_postings(tmp, np.concatenate(terms), np.concatenate(docs).astype(np.int32), np.concatenate(tfs))
+    for k, parts in cols.items():
+        np.save(tmp / f"{k}.npy", np.concatenate(parts))
+    (tmp / "text.bin").write_bytes(b"".join(texts))
+    offsets = [np.zeros(1, dtype=np.int64)]
+    shift = 0
+    for seg in segs:
+        offsets.append(np.asarray(seg.text_off[1:], dtype=np.int64) + shift)
+        shift += int(seg.text_off[-1])
+    np.save(tmp / "text_off.npy", np.concatenate(offsets))
+    _write_meta(tmp, base, sum(s.meta["total_len"] for s in segs),
+                {p: i for i, p in enumerate(parties)}, {c: i for i, c in enumerate(committees)}, members)
+    tmp.rename(root / name)
+
+    old = manifest["segments"]
+    manifest["segments"] = [name]
+    manifest["meetings"] = {m: name for m in manifest["meetings"]}
+    manifest["next_segment"] += 1
+    _save_manifest(root, manifest)
+    del segs
+    for o in old:
+        shutil.rmtree(root / o, ignore_errors=True)
+    return name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="발언 BM25 색인 생성 / 검색")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="새 회의만 색인 (증분)")
+    p_build.add_argument("--rebuild", action="store_true", help="기존 색인을 지우고 처음부터")
+    p_build.add_argument("--segment-docs", type=int, default=SEGMENT_DOCS)
+    p_build.add_argument("--max-meetings", type=int, default=None)
+    sub.add_parser("compact", help="세그먼트 병합")
+    sub.add_parser("stats", help="색인 현황")
+    p_search = sub.add_parser("search", help="검색 테스트")
+    p_search.add_argument("query")
+    p_search.add_argument("--member-id", type=int)
+    p_search.add_argument("--party")
+    p_search.add_argument("--committee")
+    p_search.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        from database import supabase
+        res = build(supabase, segment_docs=args.segment_docs, rebuild=args.rebuild, max_meetings=args.max_meetings)
+        print(f"✅ 회의 {res['meetings']}개, 발언 {res['docs']}건 색인 → 세그먼트 {res['segments']}")
+    elif args.cmd == "compact":
+        name = compact()
+        print(f"✅ 병합 완료: {name}" if name else "병합할 세그먼트가 없습니다.")
+    else:
+        idx = get_index()
+        if idx is None:
+            print(f"색인이 없습니다: {INDEX_DIR}")
+            return
+        if args.cmd == "stats":
+            print(json.dumps(idx.stats(), ensure_ascii=False, indent=2))
+            return
+        t0 = time.perf_counter()
+        res = idx.search(args.query, args.member_id, args.party, args.committee, limit=args.limit)
+        print(f"{res['total']}건 ({(time.perf_counter() - t0) * 1000:.1f} ms)")
+        for r in res["results"]:
+            print(f"- [{r['score']}] {r['date']} {r['member_name']}({r['party']}) {r['committee']}: {r['snippet']}")
+
+
+if __name__ == "__main__":
+    main()
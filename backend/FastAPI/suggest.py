@@ -0,0 +1,235 @@
+"""
+suggest.py
+----------------------------------------------------------
+/api/suggest 자동완성: 의원 이름 / 정당명 / 위원회명 / 법안명 접두 검색 + 초성 검색.
+
+검색창에서 키 입력마다 호출되므로 요청당 DB 왕복 없이 메모리에서 끝낸다.
+search_index.py 가 읽어 둔 행(dimension / parties / committees / bills)으로 만들고,
+검색 인덱스가 새로 만들어지면 (데이터 버전 변경) 같이 다시 만든다.
+
+구조 (배열 기반 trie)
+  - 키: 라벨을 소문자 + 공백 제거한 문자열. 띄어쓰기 단위 단어 시작마다 접미 키를 하나씩 더 둔다
+        ("인공지능 산업 육성법" → "인공지능산업육성법", "산업육성법", "육성법")
+  - 초성 키: 같은 키의 한글 음절을 초성으로 바꾼 것 ("ㅇㄱㅈㄴㅅㅇㅇㅅㅂ")
+  - 키 공간마다 (정렬된 키 배열, 엔트리 번호 배열). trie 의 한 노드 = 정렬 배열의 연속 구간이므로
+    접두 검색은 bisect 두 번으로 구간을 찾는다.
+  - 구간이 SCAN_LIMIT 보다 넓은 (짧고 흔한) 접두어는 빌드 때 상위 CACHE_K 개를 미리 계산해 둔다
+    (전체 + 종류별 — types 필터로 의원이 상위를 다 차지한 목록에서 법안이 모자라지 않게)
+    → 어떤 접두어든 bisect + (미리 계산된 목록 | SCAN_LIMIT 이하 구간 훑기) 로 수십 µs 안에 끝난다.
+  - 순위: 의원 > 정당 > 위원회 > 법안, 같은 종류면 짧은 라벨 우선.
+
+검색어에 한글 자음(ㄱ~ㅎ)이 하나라도 있으면 초성 공간에서 찾는다 ("ㅇㄱㅈㄴ" → 인공지능, "인공ㅈ" 도 가능).
+
+사용
+    import suggest
+    suggest.suggest("ㅇㄱㅈㄴ", limit=10)          # [{"type": "bill", "id": ..., "label": ...}, ...]
+    suggest.suggest("김", types={"legislator"})
+"""
+import heapq
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+import search_index
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_SET = frozenset(CHOSEONG)
+_HANGUL_FIRST, _HANGUL_LAST = 0xAC00, 0xD7A3
+_MAX_CHAR = chr(0x10FFFF)
+
+TYPE_PRIORITY = {"legislator": 0, "party": 1, "committee": 2, "bill": 3}
+SCAN_LIMIT = 256
+CACHE_K = 20
+MAX_LIMIT = 20
+
+# 엔티티 → 라벨 필드 (search_index.ENTITIES 의 행을 그대로 사용)
+LABEL_FIELDS = {
+    "legislator": "name",
+    "party": "party_name",
+    "committee": "committee",
+    "bill": "bill_name",
+}
+
+
+# ======================================================================
+# 키 정규화
+# ======================================================================
+def normalize(text: str) -> str:
+    return "".join(str(text).lower().split())
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절 → 초성, 나머지 글자는 그대로."""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_FIRST <= code <= _HANGUL_LAST:
+            out.append(CHOSEONG[(code - _HANGUL_FIRST) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_choseong_query(q: str) -> bool:
+    return any(ch in _CHOSEONG_SET for ch in q)
+
+
+def label_keys(label: str) -> Set[str]:
+    """라벨 전체 + 단어 시작마다의 접미 키."""
+    words = str(label).split()
+    return {normalize("".join(words[i:])) for i in range(len(words))} - {""}
+
+
+# ======================================================================
+# 배열 기반 trie (정렬 키 배열 + 넓은 접두어의 상위 목록)
+# ======================================================================
+class _KeySpace:
+    def __init__(self, pairs: List[Tuple[str, int]], rank: array, kinds: List[str]):
+        pairs.sort()
+        self.keys = [k for k, _ in pairs]
+        self.eids = array("i", (e for _, e in pairs))
+        self._rank = rank
+        self._kinds = kinds
+        self.hot: Dict[str, Tuple[int, ...]] = {}
+        self.hot_by_type: Dict[Tuple[str, str], Tuple[int, ...]] = {}   # (종류, 접두어) → 상위 CACHE_K
+        self._build_hot()
+
+    def _top(self, lo: int, hi: int, k: int, types: Optional[Set[str]] = None) -> List[int]:
+        eids = set(self.eids[lo:hi])
+        if types:
+            eids = {e for e in eids if self._kinds[e] in types}
+        return heapq.nsmallest(k, eids, key=self._rank.__getitem__)
+
+    def _build_hot(self):
+        keys = self.keys
+        stack = [(0, len(keys), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            i = lo
+            while i < hi:
+                if len(keys[i]) <= depth:
+                    i += 1
+                    continue
+                prefix = keys[i][: depth + 1]
+                j = bisect_left(keys, prefix + _MAX_CHAR, i, hi)
+                if j - i > SCAN_LIMIT:
+                    eids = set(self.eids[i:j])
+                    self.hot[prefix] = tuple(heapq.nsmallest(CACHE_K, eids, key=self._rank.__getitem__))
+                    by_type: Dict[str, List[int]] = {}
+                    for e in eids:
+                        by_type.setdefault(self._kinds[e], []).append(e)
+                    for kind, es in by_type.items():
+                        self.hot_by_type[kind, prefix] = tuple(heapq.nsmallest(CACHE_K, es, key=self._rank.__getitem__))
+                    stack.append((i, j, depth + 1))
+                i = j
+
+    def range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self.keys, prefix)
+        return lo, bisect_left(self.keys, prefix + _MAX_CHAR, lo)
+
+    def lookup(self, prefix: str, k: int, types: Optional[Set[str]] = None) -> List[int]:
+        """접두어 구간의 상위 엔트리 번호 (넓은 구간은 미리 계산된 CACHE_K 개, types 면 종류별 목록을 합침)."""
+        lo, hi = self.range(prefix)
+        if hi - lo > SCAN_LIMIT:
+            if not types:
+                return list(self.hot[prefix])
+            lists = [self.hot_by_type.get((t, prefix), ()) for t in types]
+            return heapq.nsmallest(k, (e for l in lists for e in l), key=self._rank.__getitem__)
+        return self._top(lo, hi, k, types)
+
+
+class Suggester:
+    def __init__(self, entries: List[Tuple[str, object, str, dict]]):
+        """entries: [(종류, id, 라벨, 추가 필드), ...]"""
+        t0 = time.perf_counter()
+        self.entries = entries
+        order = sorted(
+            range(len(entries)),
+            key=lambda e: (TYPE_PRIORITY[entries[e][0]], len(entries[e][2]), entries[e][2], e),
+        )
+        rank = array("i", [0] * len(entries))
+        for r, e in enumerate(order):
+            rank[e] = r
+
+        text_pairs, cho_pairs = [], []
+        for eid, (_, _, label, _) in enumerate(entries):
+            keys = label_keys(label)
+            text_pairs.extend((k, eid) for k in keys)
+            cho_pairs.extend((c, eid) for c in {to_choseong(k) for k in keys})
+        kinds = [kind for kind, _, _, _ in entries]
+        self.text = _KeySpace(text_pairs, rank, kinds)
+        self.cho = _KeySpace(cho_pairs, rank, kinds)
+        self.build_seconds = time.perf_counter() - t0
+
+    def suggest(self, q: str, limit: int = 10, types: Optional[Set[str]] = None) -> List[dict]:
+        key = normalize(q)
+        if not key:
+            return []
+        space = self.cho if is_choseong_query(key) else self.text
+        if space is self.cho:
+            key = to_choseong(key)
+
+        eids = space.lookup(key, limit, types)
+        out = []
+        for e in eids[:limit]:
+            kind, ident, label, extra = self.entries[e]
+            out.append({"type": kind, "id": ident, "label": label, **extra})
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "keys": len(self.text.keys),
+            "choseong_keys": len(self.cho.keys),
+            "hot_prefixes": len(self.text.hot) + len(self.cho.hot),
+            "build_seconds": round(self.build_seconds, 3),
+        }
+
+
+# ======================================================================
+# search_index 행 → Suggester (인덱스가 바뀌면 다시 생성)
+# ======================================================================
+def entries_from_rows(rows: Dict[str, List[dict]]) -> List[Tuple[str, object, str, dict]]:
+    entries = []
+    for kind, field in LABEL_FIELDS.items():
+        key_col = search_index.ENTITIES[kind][1]
+        seen = set()
+        for r in rows.get(kind, []):
+            label = r.get(field)
+            if not label or (key_col, r.get(key_col), label) in seen:
+                continue
+            seen.add((key_col, r.get(key_col), label))
+            extra = {"party": r.get("party")} if kind == "legislator" else {}
+            entries.append((kind, r.get(key_col), str(label).strip(), extra))
+    return entries
+
+
+_cache: Tuple[Optional[object], Optional[Suggester]] = (None, None)
+_lock = threading.Lock()
+
+
+def get_suggester() -> Optional[Suggester]:
+    global _cache
+    idx = search_index.get_index()
+    if idx is None:
+        return None
+    if _cache[0] is idx:
+        return _cache[1]
+    with _lock:
+        if _cache[0] is not idx:
+            sg = Suggester(entries_from_rows(idx.rows))
+            log.info("자동완성 trie 생성: %s", sg.stats())
+            _cache = (idx, sg)
+    return _cache[1]
+
+
+def suggest(q: str, limit: int = 10, types: Optional[Set[str]] = None) -> List[dict]:
+    sg = get_suggester()
+    if sg is None:
+        return []
+    return sg.suggest(q, max(1, min(limit, MAX_LIMIT)), types)
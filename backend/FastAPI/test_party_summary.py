@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+/api/parties/summary, /api/parties/{party_id}/summary 폴백 테스트
+party_summary 테이블이 없거나 (조회 예외) 비어 있어도 랭킹 테이블에서 계산해 200 으로 응답하는지,
+저장된 요약과 같은 내용인지 확인 (인메모리 Supabase, 서버 / 네트워크 불필요)
+
+사용
+    cd backend/FastAPI && python test_party_summary.py      # 또는 python -m pytest test_party_summary.py
+"""
+
+import os
+
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("OPENAI_API_KEY", "test-offline")
+
+from fastapi.testclient import TestClient
+
+import bench_api
+import build_party_summary as party_summary
+import database
+import main
+from fake_supabase import FakeSupabase
+
+
+class _NoSummaryTable(FakeSupabase):
+    """party_summary 테이블이 아직 없는 프로젝트 (PostgREST 는 조회 시 오류)."""
+
+    def table(self, name):
+        if name == party_summary.SUMMARY_TABLE:
+            raise RuntimeError(f'relation "public.{name}" does not exist')
+        return super().table(name)
+
+
+def _fetch(client_cls, tables):
+    database.supabase._client = client_cls(tables)
+    with TestClient(main.app) as client:
+        all_res = client.get("/api/parties/summary")
+        party_id = all_res.json()["parties"][0]["party_id"] if all_res.status_code == 200 else 1
+        one_res = client.get(f"/api/parties/{party_id}/summary")
+        missing_res = client.get("/api/parties/999999/summary")
+    return all_res, one_res, missing_res
+
+
+def test_party_summary_fallback():
+    print("=" * 80)
+    print("테스트: party_summary 폴백")
+    print("=" * 80)
+
+    tables, _ = bench_api.build_dataset(1)
+    stored = _fetch(FakeSupabase, dict(tables))
+
+    no_rows = dict(tables)
+    no_rows[party_summary.SUMMARY_TABLE] = []
+    cases = {
+        "테이블 있음": stored,
+        "테이블 비어 있음": _fetch(FakeSupabase, no_rows),
+        "테이블 없음": _fetch(_NoSummaryTable, dict(tables)),
+    }
+
+    for name, (all_res, one_res, missing_res) in cases.items():
+        print(f"\n📋 {name}: 전체 {all_res.status_code}, 단건 {one_res.status_code}, 없는 정당 {missing_res.status_code}")
+        assert all_res.status_code == 200, all_res.text
+        assert one_res.status_code == 200, one_res.text
+        assert missing_res.status_code == 404, missing_res.text
+        # 저장된 요약과 같은 내용 (built_at 제외)
+        assert all_res.json() == stored[0].json()
+        assert one_res.json() == stored[1].json()
+    print("\n✅ 통과")
+
+
+if __name__ == "__main__":
+    test_party_summary_fallback()
@@ -15,16 +15,39 @@
 #  - 대표발의 정보 (홍석준 의원...) 자동 추출
 #  - 괄호 중첩/순서/유무에 관계없이 robust 파싱
 #  - 번호나 제안자가 없는 경우도 안전 처리
+#  - 정규식은 모듈 로드 시 1회 컴파일, 같은 문자열은 LRU 캐시로 재사용
+#    (같은 법안 문자열이 발언 수천 건에 반복되므로)
+#
+# 배치 API:
+#  - parse_many(values)        : 중복 제거 후 파싱 → (이름, 발의자, 의안번호) 배열 3개
+#  - filter_bill_lines(bills)  : 여러 줄 bills 중 의안번호가 있는 줄만 남김 (xlsx 변환기)
+#  - parse_agenda_lines(bills) : "48. ...법률안(...)(의안번호 ...)" → 의사일정 항 번호/원문/의안번호
 # ---------------------------------------------------------
 
 import re
+from functools import lru_cache
+
+
+# ---------------------------------------------------------
+# 미리 컴파일한 정규식
+# ---------------------------------------------------------
+_RE_PREFIX = re.compile(r"^\s*\d+\.\s*")
+_RE_PARENS = re.compile(r"\((.*?)\)")
+_RE_BILL_NUMBER = re.compile(r"(\d{6,})")
+_RE_AGENDA = re.compile(r"^\s*(\d+)\.\s*(.*)$")
+# "의안번호 2106445", "의 안 번 호: 2106445" 등 (xlsx 원본은 띄어쓰기가 제각각)
+_RE_BILLNO_LABEL = re.compile(r"의\s*안\s*번\s*호\s*[:\s\-]*(\d+)", re.IGNORECASE)
+_RE_NEWLINES = re.compile(r"\r\n?|\n")
+
+# 서로 다른 법안 문자열 수(수천 건) 보다 넉넉하게
+PARSE_CACHE_SIZE = 65536
 
 
 # ---------------------------------------------------------
 # 숫자 prefix "1. " 같은 부분 제거
 # ---------------------------------------------------------
 def _remove_prefix(s):
-    return re.sub(r"^\s*\d+\.\s*", "", s).strip()
+    return _RE_PREFIX.sub("", s).strip()
 
 
 # ---------------------------------------------------------
@@ -36,7 +59,7 @@ def _extract_parentheses_parts(s):
       "법률안(홍석준 의원 대표발의)(의안번호 2106445)"
         → ["홍석준 의원 대표발의", "의안번호 2106445"]
     """
-    return re.findall(r"\((.*?)\)", s)
+    return _RE_PARENS.findall(s)
 
 
 # ---------------------------------------------------------
@@ -48,7 +71,7 @@ def _extract_bill_number(parts):
     예: "의안번호 2106445" 또는 "의안번호:2106445"
     """
     for p in parts:
-        match = re.search(r"(\d{6,})", p)
+        match = _RE_BILL_NUMBER.search(p)
         if match:
             return match.group(1)
     return None
@@ -85,7 +108,11 @@ def parse_bill_string(raw_str):
     """
     if raw_str is None or not isinstance(raw_str, str):
         return None, None, None
+    return _parse_bill_string_cached(raw_str)
+
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_bill_string_cached(raw_str):
     s = raw_str.strip()
 
     # 1) 앞의 "5." 같은 prefix 제거
@@ -101,10 +128,97 @@ def parse_bill_string(raw_str):
     bill_proposer = _extract_proposer(parts, bill_number)
 
     # 5) 법안명만 남기기 (괄호 제거)
-    bill_name_clean = re.sub(r"\(.*?\)", "", s).strip()
+    bill_name_clean = _RE_PARENS.sub("", s).strip()
 
     # 6) 혹시 법안명이 완전히 비어버리면 raw 전체를 사용
     if bill_name_clean == "":
         bill_name_clean = s
 
     return bill_name_clean, bill_proposer, bill_number
+
+
+# ---------------------------------------------------------
+# 배치 파싱
+# ---------------------------------------------------------
+def parse_many(values):
+    """
+    법안 문자열 여러 개를 한 번에 파싱.
+    중복 문자열은 한 번만 파싱하고, 입력 순서대로 object 배열 3개를 돌려준다.
+
+    ex)
+      df["bill_name"], df["bill_proposer"], df["bill_number"] = parse_many(df["bill_review"])
+    """
+    # numpy 는 배치 API 에서만 필요 (trigger_deliber 등 numpy 없는 스크립트도 이 모듈을 import)
+    import numpy as np
+
+    index = {}
+    codes = np.empty(len(values), dtype=np.intp)
+    for i, v in enumerate(values):
+        key = v if isinstance(v, str) else None   # NaN/None/list 등은 모두 (None, None, None)
+        code = index.get(key)
+        if code is None:
+            code = index[key] = len(index)
+        codes[i] = code
+
+    table = np.empty((len(index), 3), dtype=object)
+    for key, code in index.items():
+        table[code] = parse_bill_string(key)
+
+    out = table[codes]
+    return out[:, 0], out[:, 1], out[:, 2]
+
+
+def parse_cache_info():
+    """LRU 캐시 적중률 확인용 (hits, misses, maxsize, currsize)."""
+    return _parse_bill_string_cached.cache_info()
+
+
+# ---------------------------------------------------------
+# 여러 줄 bills 문자열 처리 (xlsx 변환기 / trigger_deliber)
+# ---------------------------------------------------------
+def has_bill_number(text):
+    """'의안번호 ####'(4자리 이상) 표기가 있는지."""
+    if not text:
+        return False
+    m = _RE_BILLNO_LABEL.search(str(text))
+    return bool(m) and len(m.group(1)) >= 4
+
+
+def _split_lines(bills):
+    return [ln.strip() for ln in _RE_NEWLINES.split(str(bills)) if ln.strip()]
+
+
+def filter_bill_lines(bills):
+    """
+    여러 줄 bills 중 의안번호가 있는 줄만 남긴다.
+    남는 줄이 없으면 None (bills 를 기록하지 않음).
+    """
+    if not bills:
+        return None
+    kept = [ln for ln in _split_lines(bills) if has_bill_number(ln)]
+    return "\n".join(kept) if kept else None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_agenda_line(line):
+    m = _RE_AGENDA.match(line)
+    if not m:
+        return None
+    m_no = _RE_BILLNO_LABEL.search(line)
+    return int(m.group(1)), (m_no.group(1) if m_no else None)
+
+
+def parse_agenda_lines(bills):
+    """
+    "1. 서민의 금융생활 지원에 관한 법률 일부개정법률안(정부 제출)(의안번호 2104052)"
+    형태의 줄들을 [(의사일정 항 번호, 원문, 의안번호), ...] 로 변환.
+    번호로 시작하지 않는 줄은 건너뛴다.
+    """
+    if not bills:
+        return []
+    out = []
+    for line in _split_lines(bills):
+        parsed = _parse_agenda_line(line)
+        if parsed is not None:
+            out.append((parsed[0], line, parsed[1]))
+    return out
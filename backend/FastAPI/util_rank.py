@@ -0,0 +1,46 @@
+# util_rank.py
+# ---------------------------------------------------------
+# 랭킹 목록에서 상위/하위 k개만 뽑는 유틸리티.
+#
+# 전체 목록을 sorted() 한 뒤 [:5] 로 자르는 대신 heapq.nlargest / nsmallest 로
+# O(n log k) 에 뽑는다. 결과(동점 순서 포함)는 sorted(..., reverse=...)[:k] 와 같다.
+#
+#  - top_k(rows, k, key)                  : key 큰 순 k개
+#  - bottom_k(rows, k, key)               : key 작은 순 k개
+#  - distinct=True                        : 같은 점수는 처음 나온 행 하나만 포함
+#                                           (정당 요약의 법안 top/bottom 5 규칙)
+#
+# 결과 전체를 정렬해서 돌려주는 API(ex: /api/bills/analysis)는 자르지 않으므로
+# 여기 대상이 아니다.
+# ---------------------------------------------------------
+
+import heapq
+from typing import Any, Callable, Iterable, List, TypeVar
+
+T = TypeVar("T")
+
+
+def _first_per_key(rows: Iterable[T], key: Callable[[T], Any]) -> List[T]:
+    """key 값마다 처음 나온 행만 (입력 순서 유지)."""
+    first = {}
+    for row in rows:
+        first.setdefault(key(row), row)
+    return list(first.values())
+
+
+def top_k(rows: Iterable[T], k: int, key: Callable[[T], Any], distinct: bool = False) -> List[T]:
+    """key 큰 순으로 k개 (= sorted(rows, key=key, reverse=True)[:k])."""
+    if k <= 0:
+        return []
+    if distinct:
+        rows = _first_per_key(rows, key)
+    return heapq.nlargest(k, rows, key=key)
+
+
+def bottom_k(rows: Iterable[T], k: int, key: Callable[[T], Any], distinct: bool = False) -> List[T]:
+    """key 작은 순으로 k개 (= sorted(rows, key=key)[:k])."""
+    if k <= 0:
+        return []
+    if distinct:
+        rows = _first_per_key(rows, key)
+    return heapq.nsmallest(k, rows, key=key)
@@ -0,0 +1,208 @@
+"""
+write_behind.py
+----------------------------------------------------------
+요청 경로 밖에서 모아 쓰는 write-behind 버퍼 (user_logs).
+
+/api/log/activity, /register, /token 은 클릭 / 로그인마다 user_logs 에 insert 를 한 번씩
+동기로 보내서 사용자 응답 시간에 DB 쓰기 왕복이 그대로 들어갔다.
+WriteBehindBuffer 는 행을 메모리 큐에 넣고 바로 돌아가며, 백그라운드 스레드가
+  - max_batch 개가 모이거나 flush_interval 초가 지나면
+  - 같은 컬럼 구성끼리 묶어 insert(list) 한 번으로 보낸다.
+
+  - created_at 은 큐에 넣을 때 찍는다 (늦게 써져도 최근 활동 순서가 실제 순서대로)
+  - 쓰기 실패: 실패한 묶음의 행만 큐 앞에 되돌리고 지수 백오프로 재시도
+    (이미 들어간 묶음은 다시 보내지 않고 on_flush 훅에도 넘긴다), max_retries 번 실패한 행은 버리고 로그
+  - 큐가 max_pending 을 넘으면 (DB 장애 등) 그 행은 요청 안에서 바로 insert (overflow, 역압)
+    → 메모리가 무한히 늘지 않고, 밀린 만큼만 사용자 지연으로 나타난다
+  - stop() 은 남은 행을 모두 쓰고 끝낸다 → main.lifespan() 종료 시 호출
+    (백오프 대기 중이어도 바로 깨우고, join 이 timeout 을 넘기면 남은 큐를 호출한 스레드에서 직접 insert)
+
+지표 (/metrics, 이름 앞에 <table>_buffer_)
+  depth (gauge) / flush_rows / flush_seconds / overflow_total / retries_total / dropped_total
+
+설정 (환경변수)
+  WRITE_BEHIND=1  WRITE_BEHIND_BATCH=200  WRITE_BEHIND_INTERVAL=1.0  WRITE_BEHIND_MAX_PENDING=10000
+
+사용
+    user_logs = WriteBehindBuffer("user_logs", lambda: supabase)
+    user_logs.start()
+    user_logs.add({"user_id": ..., "activity_type": ..., ...})
+    user_logs.stop()        # 종료 시 비우기
+"""
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import metrics
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+ENABLED = os.getenv("WRITE_BEHIND", "1") != "0"
+MAX_BATCH = int(os.getenv("WRITE_BEHIND_BATCH", "200"))
+FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", "1.0"))
+MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "10000"))
+MAX_RETRIES = 5
+
+ROW_BUCKETS = (1, 5, 10, 25, 50, 100, 200, 500, 1000)
+
+
+class WriteBehindBuffer:
+    def __init__(self, table: str, client: Callable[[], object], max_batch: int = MAX_BATCH,
+                 flush_interval: float = FLUSH_INTERVAL, max_pending: int = MAX_PENDING,
+                 max_retries: int = MAX_RETRIES, enabled: bool = ENABLED):
+        self.table = table
+        self.client = client
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.enabled = enabled
+        self.on_flush: List[Callable[[List[dict]], None]] = []   # 저장된 행 목록을 받는 훅 (예: 통계 갱신)
+        self._queue = deque()           # (행, 실패 횟수, 들어온 시각)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        prefix = f"{table}_buffer"
+        self.depth = metrics.Gauge(f"{prefix}_depth", f"{table} 쓰기 대기 행 수")
+        self.flush_rows = metrics.Histogram(f"{prefix}_flush_rows", "한 번에 쓴 행 수", ROW_BUCKETS, ())
+        self.flush_seconds = metrics.Histogram(
+            f"{prefix}_flush_seconds", "일괄 insert 1회 시간(초)", metrics.LATENCY_BUCKETS, ())
+        self.overflow = metrics.Counter(f"{prefix}_overflow_total", "버퍼가 가득 차 요청 안에서 바로 쓴 행 수")
+        self.retries = metrics.Counter(f"{prefix}_retries_total", "일괄 insert 실패 후 재시도 횟수")
+        self.dropped = metrics.Counter(f"{prefix}_dropped_total", "재시도 한도를 넘어 버린 행 수")
+        metrics.register(self.depth, self.flush_rows, self.flush_seconds, self.overflow, self.retries, self.dropped)
+
+    # ------------------------------------------------------------------
+    def start(self):
+        if not self.enabled:
+            return
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name=f"{self.table}-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        """남은 행을 모두 쓰고 종료 (timeout 안에 못 끝내면 남은 큐를 이 스레드에서 한 번 더 쓴다)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._cond:
+            rows = [r for r, _, _ in self._queue]
+            self._queue.clear()
+            self.depth.set(0)
+        if not rows:
+            return
+        saved, failed, error = self._insert(rows)
+        self._after_flush(saved)
+        if failed:
+            self.dropped.inc(len(failed))
+            log.error("%s: 종료 시 쓰지 못한 행 %d개: %s", self.table, len(failed), error)
+
+    def add(self, row: dict):
+        """행을 큐에 넣는다 (버퍼를 안 쓰거나 가득 찼으면 바로 insert)."""
+        row = dict(row)
+        row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        with self._cond:
+            running = self._thread is not None and not self._closed
+            if running and len(self._queue) < self.max_pending:
+                self._queue.append((row, 0, time.monotonic()))
+                self.depth.set(len(self._queue))
+                self._cond.notify()
+                return
+        if running:
+            self.overflow.inc()
+        saved, _, error = self._insert([row])
+        self._after_flush(saved)
+        if error is not None:
+            raise error
+
+    # ------------------------------------------------------------------
+    def _insert(self, rows: List[dict]) -> Tuple[List[dict], List[dict], Optional[Exception]]:
+        """
+        컬럼 구성별 일괄 insert.
+        (저장된 행 (DB 가 채운 id 포함, 응답이 비면 보낸 행), 실패한 묶음의 보낸 행, 첫 오류)
+        """
+        # PostgREST 일괄 insert 는 모든 행의 키가 같아야 하므로 컬럼 구성별로 나눠 보낸다
+        groups: Dict[Tuple[str, ...], List[dict]] = {}
+        for r in rows:
+            groups.setdefault(tuple(sorted(r)), []).append(r)
+        saved, failed, error = [], [], None
+        for part in groups.values():
+            try:
+                res = self.client().table(self.table).insert(part).execute()
+            except Exception as e:
+                failed.extend(part)
+                error = error or e
+                continue
+            saved.extend(getattr(res, "data", None) or part)
+        return saved, failed, error
+
+    def _after_flush(self, rows: List[dict]):
+        for hook in self.on_flush:
+            try:
+                hook(rows)
+            except Exception as e:
+                log.warning("%s flush 훅 실패: %s", self.table, e)
+
+    def _take(self) -> Optional[List[Tuple[dict, int, float]]]:
+        """가장 오래된 행이 flush_interval 을 채우거나 max_batch 가 찰 때까지 모은 묶음 (종료 + 빈 큐면 None)."""
+        with self._cond:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            deadline = self._queue[0][2] + self.flush_interval
+            while len(self._queue) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            n = min(self.max_batch, len(self._queue))
+            batch = [self._queue.popleft() for _ in range(n)]
+            self.depth.set(len(self._queue))
+        return batch
+
+    def _run(self):
+        backoff = 0.0
+        while True:
+            batch = self._take()
+            if batch is None:
+                return
+            t0 = time.perf_counter()
+            saved, failed, error = self._insert([r for r, _, _ in batch])
+            self.flush_seconds.observe(time.perf_counter() - t0)
+            if saved:
+                self.flush_rows.observe(len(saved))
+                self._after_flush(saved)
+            if error is None:
+                backoff = 0.0
+                continue
+
+            # 실패한 묶음의 행만 다시 큐 앞으로 (이미 들어간 묶음을 또 보내면 중복 행)
+            self.retries.inc()
+            failed_ids = {id(r) for r in failed}
+            retry = [(r, n + 1, t) for r, n, t in batch if id(r) in failed_ids]
+            keep = [item for item in retry if item[1] < self.max_retries]
+            if len(keep) < len(retry):
+                self.dropped.inc(len(retry) - len(keep))
+                log.error("%s: %d행 쓰기 %d회 실패로 버림: %s", self.table, len(retry) - len(keep), self.max_retries, error)
+            else:
+                log.warning("%s: %d행 쓰기 실패, 재시도 예정: %s", self.table, len(retry), error)
+            with self._cond:
+                self._queue.extendleft(reversed(keep))
+                self.depth.set(len(self._queue))
+                closed = self._closed
+            backoff = min(max(backoff * 2, 0.5), 30.0)
+            if not closed:
+                # stop() 이 notify 하면 바로 깨어나 남은 행을 쓴다
+                with self._cond:
+                    self._cond.wait_for(lambda: self._closed, backoff)
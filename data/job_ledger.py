@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+job_ledger.py
+-----------------
+trigger_deliber.py 의 회의(meeting_id) 단위 처리 상태를 SQLite 에 기록하는 작업 원장.
+
+상태 흐름
+  pending → llm_done → segmented → written
+  (실패 시) failed   : 예외 / LLM 호출 오류 / 타임아웃
+           invalid  : LLM 응답은 왔지만 JSON 배열이 없거나 트리거를 만들지 못함
+           skipped  : 입력 데이터 자체 문제 (bill_pool 비어 있음, 소위원장 발언 없음 등)
+
+- attempts      : 처리 시도 횟수
+- llm_response  : LLM 원문 응답 (llm_done 이후 재시도 시 LLM 재호출 없이 재사용)
+- duration_*    : LLM 호출 / 전체 처리 소요 시간(초)
+- last_error    : 마지막 실패 사유
+
+--resume 실행 시 written/skipped 는 건너뛰고, 나머지 상태만 다시 처리한다.
+"""
+
+import sqlite3
+from datetime import datetime
+
+STATE_PENDING = "pending"
+STATE_LLM_DONE = "llm_done"
+STATE_SEGMENTED = "segmented"
+STATE_WRITTEN = "written"
+STATE_FAILED = "failed"
+STATE_INVALID = "invalid"
+STATE_SKIPPED = "skipped"
+
+# --resume 에서 다시 처리하지 않는 상태
+DONE_STATES = {STATE_WRITTEN, STATE_SKIPPED}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    meeting_id      INTEGER PRIMARY KEY,
+    state           TEXT    NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    last_error      TEXT,
+    llm_response    TEXT,
+    n_speeches      INTEGER,
+    n_segments      INTEGER,
+    duration_llm    REAL,
+    duration_total  REAL,
+    input_file      TEXT,
+    output_file     TEXT,
+    started_at      TEXT,
+    finished_at     TEXT,
+    updated_at      TEXT
+)
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class JobLedger:
+    """meeting_id 별 처리 상태를 저장하는 SQLite 원장."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------------------------
+    # 조회
+    # -----------------------------------------
+    def get(self, meeting_id: int):
+        row = self.conn.execute(
+            "SELECT * FROM jobs WHERE meeting_id = ?", (meeting_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def should_skip(self, meeting_id: int, max_attempts: int = None) -> bool:
+        """--resume 시 건너뛸 회의인지 판단 (완료 or 재시도 한도 초과)."""
+        job = self.get(meeting_id)
+        if not job:
+            return False
+        if job["state"] in DONE_STATES:
+            return True
+        if max_attempts and job["attempts"] >= max_attempts:
+            return True
+        return False
+
+    def cached_llm_response(self, meeting_id: int):
+        """
+        llm_done 이후 단계에서 멈춘 회의의 LLM 응답을 반환.
+        (invalid 로 끝난 응답은 fail() 시점에 지워지므로 여기서 나오지 않는다)
+        """
+        job = self.get(meeting_id)
+        if job and job["llm_response"]:
+            return job["llm_response"]
+        return None
+
+    def summary(self) -> dict:
+        rows = self.conn.execute(
+            "SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"
+        ).fetchall()
+        return {r["state"]: r["n"] for r in rows}
+
+    # -----------------------------------------
+    # 상태 변경
+    # -----------------------------------------
+    def start(self, meeting_id: int, input_file: str, output_file: str):
+        """처리 시작: 없으면 pending 으로 생성, attempts += 1."""
+        now = _now()
+        self.conn.execute(
+            """
+            INSERT INTO jobs (meeting_id, state, attempts, input_file, output_file,
+                              started_at, updated_at)
+            VALUES (?, ?, 1, ?, ?, ?, ?)
+            ON CONFLICT(meeting_id) DO UPDATE SET
+                attempts    = attempts + 1,
+                last_error  = NULL,
+                input_file  = excluded.input_file,
+                output_file = excluded.output_file,
+                started_at  = excluded.started_at,
+                finished_at = NULL,
+                updated_at  = excluded.updated_at
+            """,
+            (meeting_id, STATE_PENDING, input_file, output_file, now, now),
+        )
+        self.conn.commit()
+
+    def reset(self, meeting_id: int):
+        """--resume 없이 다시 돌릴 때: 캐시된 LLM 응답을 버리고 pending 으로 되돌림."""
+        self.conn.execute(
+            "UPDATE jobs SET state = ?, llm_response = NULL, updated_at = ? WHERE meeting_id = ?",
+            (STATE_PENDING, _now(), meeting_id),
+        )
+        self.conn.commit()
+
+    def mark(self, meeting_id: int, state: str, **fields):
+        """상태 전이 + 부가 필드(n_speeches, duration_llm 등) 갱신."""
+        fields["state"] = state
+        fields["updated_at"] = _now()
+        if state in DONE_STATES | {STATE_FAILED, STATE_INVALID}:
+            fields["finished_at"] = fields["updated_at"]
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        self.conn.execute(
+            f"UPDATE jobs SET {cols} WHERE meeting_id = ?",
+            (*fields.values(), meeting_id),
+        )
+        self.conn.commit()
+
+    def fail(self, meeting_id: int, error: str, state: str = STATE_FAILED, **fields):
+        self.mark(meeting_id, state, last_error=error, **fields)
@@ -17,14 +17,35 @@ trigger_deliber.py
 - 입력:  ./out/speeches_meeting_<MEETING_ID>.json
 - 출력:  ./division_out/speeches_triggerdeliber_<MEETING_ID>.json
 - 로그:  ./logs/trigger_deliber_<MEETING_ID>.log
+- 작업 원장: ./logs/trigger_deliber_jobs.sqlite  (회의별 상태/시도 횟수/소요 시간/에러)
+
+사용
+    export PYTHONPATH=../backend/FastAPI               # util_bill (법안 문자열 파서)
+    python trigger_deliber.py                          # MEETING_ID 한 건
+    python trigger_deliber.py --meeting-ids 50825 50242
+    python trigger_deliber.py --all --resume           # 완료된 회의는 건너뛰고 실패분만 재시도
 """
 
 import os
 import re
 import json
+import time
+import argparse
 import requests
 from datetime import datetime
 
+from job_ledger import (
+    JobLedger,
+    STATE_LLM_DONE,
+    STATE_SEGMENTED,
+    STATE_WRITTEN,
+    STATE_INVALID,
+    STATE_SKIPPED,
+)
+
+# 법안 문자열 파서는 backend/FastAPI/util_bill.py 하나로 통일 (PYTHONPATH 에 backend/FastAPI 필요)
+from util_bill import parse_agenda_lines
+
 # =========================================
 # 설정
 # =========================================
@@ -33,7 +54,9 @@ MODEL = "gpt-oss:120b-cloud"
 TEMPERATURE = 0.1
 TIMEOUT = 300
 
-MEETING_ID = 50825  # 회의 번호만 바꿔가며 사용
+MEETING_ID = 50825  # --meeting-ids 를 주지 않았을 때 기본 회의 번호
+
+LEDGER_FILE = "./logs/trigger_deliber_jobs.sqlite"
 
 
 # =========================================
@@ -118,28 +141,17 @@ def build_bill_pool_from_all(speeches):
 
     bill_pool = {}  # key = agenda_idx (의사일정 항 번호), value = dict(raw=원본 문자열, bill_no=의안번호)
 
+    # 같은 bills 문자열이 발언마다 반복되므로 한 번만 파싱
+    seen = set()
     for s in speeches:
         bills_text = s.get("bills")
-        if not bills_text:
+        if not bills_text or bills_text in seen:
             continue
+        seen.add(bills_text)
 
-        for line in bills_text.split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-
-            # 맨 앞 번호 추출: "  48. ..." → idx=48, 나머지는 그대로 raw로 둔다
-            m = re.match(r"^\s*(\d+)\.\s*(.*)$", line)
-            if not m:
-                continue
-
-            agenda_idx = int(m.group(1))
-            raw = line  # 원문 그대로
-
+        # 맨 앞 번호 추출: "  48. ..." → idx=48, 원문은 그대로 raw 로 둔다 (의안번호는 참고용)
+        for agenda_idx, raw, bill_no in parse_agenda_lines(bills_text):
             if agenda_idx not in bill_pool:
-                # 의안번호도 참고용으로 뽑아둔다 (필수는 아님)
-                m_no = re.search(r"의안번호\s*(\d+)", raw)
-                bill_no = m_no.group(1) if m_no else None
                 bill_pool[agenda_idx] = {
                     "idx": agenda_idx,
                     "raw": raw,
@@ -618,17 +630,23 @@ def apply_segments_to_speeches(speeches, segments):
 
 
 # =========================================
-# main
+# 회의 1건 처리 (작업 원장에 단계별 상태 기록)
 # =========================================
-def main():
-    meeting_id = MEETING_ID
+class MeetingSkipped(Exception):
+    """입력 데이터 문제로 처리할 수 없는 회의 (재시도해도 결과가 같음)."""
+
+
+class InvalidLLMResponse(Exception):
+    """LLM 응답이 비었거나 JSON 배열/트리거를 만들지 못한 경우 (재시도 대상)."""
 
+
+def process_meeting(meeting_id, ledger, reuse_llm=False):
     input_file = f"./out/speeches_meeting_{meeting_id}.json"
     output_file = f"./division_out/speeches_triggerdeliber_{meeting_id}.json"
     log_file = f"./logs/trigger_deliber_{meeting_id}.log"
 
-    os.makedirs("./logs", exist_ok=True)
-    os.makedirs("./division_out", exist_ok=True)
+    t_start = time.perf_counter()
+    ledger.start(meeting_id, input_file, output_file)
 
     with open(input_file, "r", encoding="utf-8") as f:
         speeches = json.load(f)
@@ -650,7 +668,7 @@ def main():
         if not bill_pool:
             log.write("⚠️ bill_pool이 비어 있습니다. 종료.\n")
             print("⚠️ bill_pool 비어 있음. 로그 확인 후 입력 데이터를 점검하세요.")
-            return
+            raise MeetingSkipped("bill_pool 비어 있음")
 
         # 소위원장 발언 추출
         chair_speeches = [
@@ -662,12 +680,20 @@ def main():
         if not chair_speeches:
             log.write("⚠️ 소위원장 발언이 없습니다. 종료.\n")
             print("⚠️ 소위원장 발언이 없습니다. member_name 필드를 다시 확인해 주세요.")
-            return
-
-        # 프롬프트 구성 및 LLM 호출
-        print("▶ LLM 호출 시작 (소위원장 발언 분석 중)...")
-        prompt = build_prompt_for_chair_triggers(chair_speeches, bill_pool)
-        resp = call_llm(prompt)
+            raise MeetingSkipped("소위원장 발언 없음")
+
+        # 프롬프트 구성 및 LLM 호출 (이전 실행에서 받은 응답이 있으면 재사용)
+        resp = ledger.cached_llm_response(meeting_id) if reuse_llm else None
+        duration_llm = None
+        if resp:
+            print("♻️ 작업 원장에 저장된 LLM 응답 재사용")
+            log.write("♻️ 작업 원장에 저장된 LLM 응답 재사용\n")
+        else:
+            print("▶ LLM 호출 시작 (소위원장 발언 분석 중)...")
+            prompt = build_prompt_for_chair_triggers(chair_speeches, bill_pool)
+            t_llm = time.perf_counter()
+            resp = call_llm(prompt)
+            duration_llm = time.perf_counter() - t_llm
 
         # 디버깅용: 응답 길이 출력
         print(f"LLM raw response length: {len(resp) if resp else 0}")
@@ -678,7 +704,10 @@ def main():
             log.write(str(resp) + "\n")
             log.write("=== Raw LLM Response End ===\n")
             print("⚠️ LLM 응답이 유효하지 않음. 로그 파일에서 원본 응답을 확인하세요.")
-            return
+            # call_llm 이 돌려준 "⚠️ LLM 호출 오류" 는 타임아웃/네트워크 실패
+            if resp and "⚠️" in resp:
+                raise RuntimeError(resp)
+            raise InvalidLLMResponse("LLM 응답이 유효하지 않음")
 
         raw_results = extract_json_array(resp)
         if not raw_results:
@@ -686,10 +715,13 @@ def main():
             log.write("=== Raw LLM Response (for parsing error) ===\n")
             log.write(str(resp) + "\n")
             print("⚠️ LLM 응답에서 JSON 배열을 찾지 못했습니다. 로그의 원문 응답을 확인하고 프롬프트를 점검하세요.")
-            return
-
+            raise InvalidLLMResponse("JSON 배열 파싱 결과 없음")
 
         print(f"✅ LLM 응답 수신 및 JSON 파싱 완료 (항목 수: {len(raw_results)})")
+        llm_fields = {"llm_response": resp, "n_speeches": len(speeches)}
+        if duration_llm is not None:
+            llm_fields["duration_llm"] = duration_llm
+        ledger.mark(meeting_id, STATE_LLM_DONE, **llm_fields)
 
         # 결과 정규화
         chair_results = normalize_chair_results(chair_speeches, raw_results, log)
@@ -711,21 +743,94 @@ def main():
         segments = build_segments(speeches, chair_results, bill_pool, log)
         if not segments:
             print("⚠️ 트리거/심사구간이 생성되지 않았습니다. 로그를 확인하세요.")
-            return
+            raise InvalidLLMResponse("트리거/심사구간 없음")
 
         print(f"🎯 생성된 심사구간 수: {len(segments)}")
+        ledger.mark(meeting_id, STATE_SEGMENTED, n_segments=len(segments))
 
         # 원본 JSON에 반영
         print("📌 심사구간 정보를 원본 발언에 적용 중...")
         new_speeches = apply_segments_to_speeches(speeches, segments)
 
-    # 결과 저장
-    with open(output_file, "w", encoding="utf-8") as f:
+    # 결과 저장 (임시 파일에 쓴 뒤 교체 → 중간에 죽어도 반쯤 쓴 파일이 남지 않음)
+    tmp_file = output_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
         json.dump(new_speeches, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, output_file)
+
+    ledger.mark(
+        meeting_id,
+        STATE_WRITTEN,
+        duration_total=time.perf_counter() - t_start,
+    )
 
     print(f"✅ trigger_deliber 처리 완료 → {output_file}")
     print(f"🪵 로그 파일 → {log_file}")
 
 
+# =========================================
+# main
+# =========================================
+def discover_meeting_ids(input_dir="./out"):
+    """./out/speeches_meeting_<ID>.json 파일들에서 회의 번호 목록을 만든다."""
+    ids = []
+    for name in os.listdir(input_dir):
+        m = re.match(r"^speeches_meeting_(\d+)\.json$", name)
+        if m:
+            ids.append(int(m.group(1)))
+    return sorted(ids)
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="소위원장 트리거 기반 심사구간 분할 (회의 단위 작업 원장 지원)")
+    ap.add_argument("--meeting-ids", type=int, nargs="*", default=None,
+                    help=f"처리할 회의 번호들 (기본: {MEETING_ID})")
+    ap.add_argument("--all", action="store_true",
+                    help="./out/speeches_meeting_*.json 전체 처리")
+    ap.add_argument("--resume", action="store_true",
+                    help="완료(written/skipped)된 회의는 건너뛰고 실패한 회의만 재시도")
+    ap.add_argument("--max-attempts", type=int, default=None,
+                    help="--resume 시 이 횟수 이상 시도한 회의는 포기")
+    ap.add_argument("--ledger", type=str, default=LEDGER_FILE, help="작업 원장 SQLite 경로")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    os.makedirs("./logs", exist_ok=True)
+    os.makedirs("./division_out", exist_ok=True)
+
+    if args.all:
+        meeting_ids = discover_meeting_ids()
+    else:
+        meeting_ids = args.meeting_ids or [MEETING_ID]
+
+    with JobLedger(args.ledger) as ledger:
+        for meeting_id in meeting_ids:
+            if args.resume and ledger.should_skip(meeting_id, args.max_attempts):
+                print(f"⏭️ meeting_id={meeting_id} 건너뜀 (원장 상태: {ledger.get(meeting_id)['state']})")
+                continue
+            if not args.resume and ledger.get(meeting_id):
+                ledger.reset(meeting_id)
+
+            print(f"\n===== meeting_id={meeting_id} =====")
+            try:
+                process_meeting(meeting_id, ledger, reuse_llm=args.resume)
+            except MeetingSkipped as e:
+                ledger.fail(meeting_id, str(e), state=STATE_SKIPPED)
+            except InvalidLLMResponse as e:
+                # 쓸모없는 응답은 재사용하지 않도록 버린다
+                ledger.fail(meeting_id, str(e), state=STATE_INVALID, llm_response=None)
+            except KeyboardInterrupt:
+                ledger.fail(meeting_id, "KeyboardInterrupt")
+                raise
+            except Exception as e:
+                print(f"❌ meeting_id={meeting_id} 처리 실패: {type(e).__name__}: {e}")
+                ledger.fail(meeting_id, f"{type(e).__name__}: {e}")
+
+        print(f"\n📒 작업 원장 요약 ({args.ledger}): {ledger.summary()}")
+
+
 if __name__ == "__main__":
     main()